@@ -0,0 +1,64 @@
+import re
+from typing import FrozenSet, NamedTuple
+
+from hospital_keys import extract_pincode
+from pincode_index import named_states, pincode_states, states_compatible
+
+# Candidates matching fewer than this percentage of the input's address words are rejected
+MATCH_THRESHOLD = 40.0
+# Words too generic to tell two addresses apart
+IGNORE_WORDS = frozenset({"hospital", "clinic", "road", "street", "st", "dr", "doctor", "lane", "opp", "near",
+                          "beside", "andhra", "pradesh", "india"})
+MIN_TOKEN_LENGTH = 4
+
+_PINCODE_RE = re.compile(r"\b\d{6}\b")
+_SPLIT_RE = re.compile(r"\W+")
+
+
+def address_tokens(text: str) -> FrozenSet[str]:
+    """Lowercase words of an address (all lengths, for looking input words up in)."""
+    return frozenset(w for w in _SPLIT_RE.split(str(text or "").lower()) if w)
+
+
+class AddressMatch(NamedTuple):
+    is_match: bool
+    confidence: float
+    matched: int = 0
+    total: int = 0
+    reason: str = ""
+
+
+class AddressMatcher:
+    """
+    Scores geocoding candidates against one input address.
+
+    The input's significant words (longer than 3 characters, not in
+    IGNORE_WORDS), its PIN code and the states that PIN code can belong to are
+    computed once; each candidate is then scored with set operations on whole
+    words, so "nagar" no longer matches inside "tatanagar".
+    """
+
+    def __init__(self, user_input: str):
+        self.user_input = str(user_input or "")
+        lowered = self.user_input.lower()
+        self.tokens = frozenset(w for w in _SPLIT_RE.split(lowered)
+                                if len(w) >= MIN_TOKEN_LENGTH and w not in IGNORE_WORDS)
+        self.pincode = extract_pincode(lowered)
+        self.pincode_states = (pincode_states(self.pincode) or frozenset()) if self.pincode else frozenset()
+
+    def match(self, result_name: str, result_address: str) -> AddressMatch:
+        result_full = f"{result_name} {result_address}".lower()
+        if self.pincode:
+            result_pincodes = _PINCODE_RE.findall(result_full)
+            if result_pincodes:
+                if self.pincode not in result_pincodes:
+                    return AddressMatch(False, 0.0, reason=f"Pincode Mismatch! Input: {self.pincode} vs Found: {result_pincodes[-1]}")
+            elif not states_compatible(named_states(result_address), self.pincode_states):
+                return AddressMatch(False, 0.0, reason=f"State Mismatch! Input pincode {self.pincode} is not in {result_address}")
+
+        total = len(self.tokens)
+        if total == 0:
+            return AddressMatch(True, 100.0)
+        matched = len(self.tokens & address_tokens(result_full))
+        confidence = matched / total * 100
+        return AddressMatch(confidence >= MATCH_THRESHOLD, confidence, matched, total)
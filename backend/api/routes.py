@@ -8,7 +8,7 @@ import sys
 import re
 import os
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 import uuid
 import threading
 import io
@@ -16,17 +16,31 @@ from pydantic import BaseModel
 import asyncio
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
-from vallidation_agent import validate_hospital_doctors, group_doctors_by_hospital, validate_and_write_incremental
+from vallidation_agent import validate_hospital_doctors, group_doctors_by_hospital, scrape_target, validate_and_write_incremental, count_hospitals
+from checkpoint import CheckpointJournal
+from hospital_schedule import SCHEDULE_POLICIES
 
 router = APIRouter(prefix="/api", tags=["validation"])
 
 
 class StartValidationRequest(BaseModel):
     upload_id: int
+    max_workers: Optional[int] = None
+    streaming: Optional[bool] = None  # None = decide from file size
+    force_refresh: bool = False  # Ignore cached scrape results
+    schedule: Optional[str] = None  # insertion | largest_first | smallest_first | historical
+    geocode_prepass: Optional[bool] = None  # Verify all hospital locations before scraping (None = env default)
 
 _validation_sessions = {}
 _sessions_lock = threading.Lock()
 
+OUTPUTS_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'outputs')
+
+
+def _checkpoint_path(session_id: str) -> str:
+    """Journal of completed hospitals for a validation session (used to resume after a crash)"""
+    return os.path.join(OUTPUTS_DIR, 'checkpoints', f"{session_id}.jsonl")
+
 @router.post("/upload/csv")
 async def upload_csv(file: UploadFile = File(...), db: Session = Depends(get_db)):
     """Upload CSV file with provider data"""
@@ -89,7 +103,7 @@ async def start_validation(upload_id: int, db: Session = Depends(get_db)):
         
         all_results = []
         for hospital_key, csv_doctors in hospitals.items():
-            hospital_name, address = hospital_key.split("||")
+            hospital_name, address = scrape_target(csv_doctors)
             
             try:
                 results = validate_hospital_doctors(hospital_name, address, csv_doctors)
@@ -136,7 +150,8 @@ async def start_validation(upload_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-def run_incremental_validation(session_id: str, csv_path: str, output_csv: str):
+def run_incremental_validation(session_id: str, csv_path: str, output_csv: str, max_workers: Optional[int] = None, streaming: Optional[bool] = None, resume: bool = False, force_refresh: bool = False, schedule: Optional[str] = None,
+                               geocode_prepass: Optional[bool] = None):
     """Background task to run incremental validation"""
     from database import SessionLocal
     db = SessionLocal()
@@ -153,6 +168,7 @@ def run_incremental_validation(session_id: str, csv_path: str, output_csv: str):
         # Progress callback
         def progress_callback(hospital_idx, total_hospitals, hospital_name, status, results, stats, status_message=""):
             session.completed_hospitals = hospital_idx
+            session.total_hospitals = total_hospitals
             session.current_hospital = hospital_name
             session.status_message = status_message
             session.total_records = stats.get("total_processed", 0)
@@ -185,9 +201,20 @@ def run_incremental_validation(session_id: str, csv_path: str, output_csv: str):
             input_csv=csv_path,
             output_csv=output_csv,
             progress_callback=progress_callback,
-            db_callback=db_callback
+            db_callback=db_callback,
+            max_workers=max_workers,
+            streaming=streaming,
+            resume=resume,
+            checkpoint_path=_checkpoint_path(session_id),
+            force_refresh=force_refresh,
+            session_id=session_id,
+            schedule=schedule,
+            geocode_prepass=geocode_prepass
         )
         
+        if "error" in stats:
+            raise RuntimeError(stats["error"])
+        
         # Update session as completed
         session.status = "completed"
         session.completed_at = datetime.utcnow()
@@ -229,20 +256,22 @@ async def start_incremental_validation(
     if not upload.file_path or not os.path.exists(upload.file_path):
         raise HTTPException(status_code=404, detail="Uploaded file not found on disk")
     
+    if request.schedule and request.schedule not in SCHEDULE_POLICIES:
+        raise HTTPException(status_code=400, detail=f"Unknown schedule '{request.schedule}'")
+    
     try:
         # Generate unique session ID
         session_id = str(uuid.uuid4())
         
-        # Load CSV from stored file path to get hospital count
+        # Count hospitals chunk by chunk (the validator groups the file itself)
         csv_path = upload.file_path
-        df = pd.read_csv(csv_path, on_bad_lines='skip')
-        hospitals = group_doctors_by_hospital(df)
+        total_hospitals = count_hospitals(csv_path)
         
         # Create validation session
         validation_session = ValidationSession(
             upload_id=request.upload_id,
             session_id=session_id,
-            total_hospitals=len(hospitals),
+            total_hospitals=total_hospitals,
             completed_hospitals=0,
             status="in_progress",
             status_message="Initializing..."
@@ -252,20 +281,23 @@ async def start_incremental_validation(
         db.refresh(validation_session)
         
         # Create outputs directory if it doesn't exist
-        outputs_dir = os.path.join(os.path.dirname(__file__), '..', '..', 'outputs')
-        os.makedirs(outputs_dir, exist_ok=True)
+        os.makedirs(OUTPUTS_DIR, exist_ok=True)
         
         # Output CSV path with unique name
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_csv = os.path.join(outputs_dir, f"validation_results_{timestamp}.csv")
+        output_csv = os.path.join(OUTPUTS_DIR, f"validation_results_{timestamp}.csv")
         
         # Start background validation
-        background_tasks.add_task(run_incremental_validation, session_id, csv_path, output_csv)
+        background_tasks.add_task(
+            run_incremental_validation, session_id, csv_path, output_csv,
+            request.max_workers, request.streaming, False, request.force_refresh, request.schedule,
+            request.geocode_prepass
+        )
         
         return {
             "message": "Incremental validation started",
             "session_id": session_id,
-            "total_hospitals": len(hospitals)
+            "total_hospitals": total_hospitals
         }
         
     except Exception as e:
@@ -275,6 +307,51 @@ async def start_incremental_validation(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/validate/resume/{session_id}")
+async def resume_incremental_validation(
+    session_id: str,
+    background_tasks: BackgroundTasks,
+    max_workers: Optional[int] = None,
+    db: Session = Depends(get_db)
+):
+    """Resume an interrupted incremental validation, skipping hospitals already completed"""
+    session = db.query(ValidationSession).filter(ValidationSession.session_id == session_id).first()
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+    
+    if session.status == "completed":
+        raise HTTPException(status_code=400, detail="Session already completed")
+    
+    upload = db.query(UploadHistory).filter(UploadHistory.id == session.upload_id).first()
+    if not upload or not upload.file_path or not os.path.exists(upload.file_path):
+        raise HTTPException(status_code=404, detail="Uploaded file not found on disk")
+    
+    checkpoint_path = _checkpoint_path(session_id)
+    meta = CheckpointJournal.read_meta(checkpoint_path)
+    output_csv = meta.get("output_csv")
+    if not output_csv:
+        raise HTTPException(status_code=404, detail="No checkpoint found for this session")
+    
+    session.status = "in_progress"
+    session.status_message = "Resuming..."
+    session.completed_at = None
+    db.commit()
+    
+    # Continue with the settings the session was started with
+    settings = meta.get("settings", {})
+    background_tasks.add_task(
+        run_incremental_validation, session_id, upload.file_path, output_csv,
+        max_workers, settings.get("streaming"), True, bool(settings.get("force_refresh")),
+        settings.get("schedule"), settings.get("geocode_prepass")
+    )
+    
+    return {
+        "message": "Incremental validation resumed",
+        "session_id": session_id,
+        "total_hospitals": session.total_hospitals
+    }
+
+
 @router.get("/validation/progress/{session_id}")
 async def get_validation_progress(session_id: str, db: Session = Depends(get_db)):
     """Get real-time validation progress for a session"""
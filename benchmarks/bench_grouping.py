@@ -0,0 +1,89 @@
+"""
+Benchmark group_doctors_by_hospital against the previous row-wise (iterrows) implementation.
+
+Usage:
+    python benchmarks/bench_grouping.py --rows 1000000 --hospitals 2000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from vallidation_agent import group_doctors_by_hospital
+
+
+def legacy_group_doctors_by_hospital(df: pd.DataFrame):
+    """Row-wise implementation kept here as the baseline."""
+    hospitals = {}
+    for idx, row in df.iterrows():
+        hospital_name = str(row.get("hospital_name", "")).strip()
+        address = str(row.get("address", "")).strip()
+        hospital_key = f"{hospital_name}||{address}"
+        if hospital_key not in hospitals:
+            hospitals[hospital_key] = []
+        hospitals[hospital_key].append({
+            "hospital_name": hospital_name,
+            "address": address,
+            "doctor_name": str(row.get("doctor_name", "")).strip(),
+            "specialization": str(row.get("specialization", "") or row.get("specialty", "") or row.get("speciality", "")).strip(),
+            "qualification": str(row.get("qualification", "")).strip(),
+            "phone_number": str(row.get("phone_number", "") or row.get("phone", "")).strip(),
+            "license_number": str(row.get("license_number", "") or row.get("license", "")).strip()
+        })
+    return hospitals
+
+
+def make_frame(rows: int, hospitals: int, seed: int = 42) -> pd.DataFrame:
+    """Synthetic provider directory with `rows` doctors spread over `hospitals` hospitals."""
+    rng = random.Random(seed)
+    hospital_ids = [rng.randrange(hospitals) for _ in range(rows)]
+    return pd.DataFrame({
+        "hospital_name": [f" Hospital {h} " for h in hospital_ids],
+        "address": [f"Road {h}, City {h % 50}, 5{h % 100000:05d}" for h in hospital_ids],
+        "doctor_name": [f"Dr. Doctor {i}" for i in range(rows)],
+        "specialty": [rng.choice(["Cardiology", "Neurology", "Orthopedics", None]) for _ in range(rows)],
+        "qualification": [rng.choice(["MBBS", "MBBS, MD", None]) for _ in range(rows)],
+        "phone": [f"+91 98{rng.randrange(10**8):08d}" for _ in range(rows)],
+        "license_number": [f"LIC{i}" for i in range(rows)],
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--hospitals", type=int, default=2000)
+    parser.add_argument("--legacy-rows", type=int, default=None,
+                        help="Rows used for the iterrows baseline (defaults to --rows; it is slow)")
+    args = parser.parse_args()
+
+    df = make_frame(args.rows, args.hospitals)
+
+    start = time.perf_counter()
+    grouped = group_doctors_by_hospital(df)
+    new_time = time.perf_counter() - start
+    print(f"groupby:  {args.rows:>9} rows -> {len(grouped)} hospitals in {new_time:.2f}s "
+          f"({args.rows / new_time:,.0f} rows/s)")
+
+    legacy_rows = args.legacy_rows or args.rows
+    legacy_df = df.iloc[:legacy_rows]
+    start = time.perf_counter()
+    legacy = legacy_group_doctors_by_hospital(legacy_df)
+    legacy_time = time.perf_counter() - start
+    print(f"iterrows: {legacy_rows:>9} rows -> {len(legacy)} hospitals in {legacy_time:.2f}s "
+          f"({legacy_rows / legacy_time:,.0f} rows/s)")
+
+    if legacy_rows == args.rows:
+        # Keys differ (canonical vs raw), so compare the grouped records themselves
+        def flatten(groups):
+            return sorted((dict(r) for records in groups.values() for r in records), key=lambda r: r["license_number"])
+        assert flatten(legacy) == flatten(grouped), "groupby output differs from the iterrows baseline"
+    speedup = (legacy_time / legacy_rows) / (new_time / args.rows)
+    print(f"speedup:  {speedup:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+"""
+Local fake of the Mappls and Google Places endpoints used by scraping.py.
+
+Serves the Mappls OAuth token, text search and place detail endpoints and the
+Google Places text search and place details endpoints from fixture data, with configurable latency, injected
+5xx errors and 429 throttling, so the geocoding stage (token caching, retries,
+geocode cache, pre-pass rate limits) can be load-tested without credentials
+or network. A place matches a query when its name appears in the query.
+
+Point the validator at it through the base URL settings:
+
+    python benchmarks/fake_geocoder.py --synthetic 500 --latency-ms 80 --throttle-rate 0.05
+    export MAPPLS_AUTH_BASE_URL=http://127.0.0.1:8765 MAPPLS_API_BASE_URL=http://127.0.0.1:8765 \\
+           GOOGLE_MAPS_BASE_URL=http://127.0.0.1:8765
+
+Fixture files hold a JSON list of places ({"name", "address"} plus optional
+"website", Mappls "keywords" and Google "types"). GET /_stats returns request and status
+counts.
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, os.path.dirname(__file__))
+from synthetic import make_hospitals
+
+MAPPLS_TOKEN_PATH = "/api/security/oauth/token"
+MAPPLS_SEARCH_PATH = "/api/places/textsearch/json"
+GOOGLE_SEARCH_PATH = "/maps/api/place/textsearch/json"
+MAPPLS_DETAILS_PATH = "/api/places/place_detail/json"
+GOOGLE_DETAILS_PATH = "/maps/api/place/details/json"
+MAX_RESULTS = 5
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r"\s+", " ", re.sub(r"[^\w\s]", " ", str(text or "").lower())).strip()
+
+
+def load_places(path: str) -> List[Dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return data["places"] if isinstance(data, dict) else data
+
+
+def synthetic_places(count: int, seed: int = 42) -> List[Dict]:
+    """The hospitals of synthetic.make_directory(..., count, seed), so a synthetic upload geocodes."""
+    return [{"name": h["hospital_name"], "address": h["address"],
+             "website": f"https://{_normalize(h['hospital_name']).replace(' ', '-')}.example.in/"}
+            for h in make_hospitals(count, random.Random(seed))]
+
+
+def _eloc(place: Dict) -> str:
+    return hashlib.sha1(place["_key"].encode("utf-8")).hexdigest()[:6].upper()
+
+
+def _place_id(place: Dict) -> str:
+    return "fake-" + hashlib.sha1(place["_key"].encode("utf-8")).hexdigest()[:20]
+
+
+class FakeGeocoder:
+    """Fixture-backed responses plus fault injection, shared by all request handler threads."""
+
+    def __init__(self, places: List[Dict], latency_ms: float = 0, jitter_ms: float = 0, error_rate: float = 0,
+                 throttle_rate: float = 0, retry_after: int = 0, token_ttl: int = 3600, seed: int = None):
+        self.places = [dict(place, _key=_normalize(place["name"])) for place in places]
+        self.by_id = {}
+        for place in self.places:
+            self.by_id[_eloc(place)] = self.by_id[_place_id(place)] = place
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.token_ttl = token_ttl
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.tokens = {}  # token -> expiry (time.monotonic)
+        self.requests = Counter()
+        self.statuses = Counter()
+
+    def search(self, query: str) -> List[Dict]:
+        query = _normalize(query)
+        return [place for place in self.places if place["_key"] and place["_key"] in query][:MAX_RESULTS]
+
+    def issue_token(self) -> str:
+        with self.lock:
+            token = f"fake-{len(self.tokens) + 1}-{self.rng.getrandbits(32):08x}"
+            self.tokens[token] = time.monotonic() + self.token_ttl
+        return token
+
+    def token_valid(self, authorization: str) -> bool:
+        token = authorization[len("Bearer "):] if authorization.startswith("Bearer ") else ""
+        with self.lock:
+            return time.monotonic() < self.tokens.get(token, 0)
+
+    def fault(self):
+        """Sleep for the configured latency, then pick an injected (status, headers) or None."""
+        with self.lock:
+            delay = max(0.0, self.latency_ms + self.rng.uniform(-self.jitter_ms, self.jitter_ms)) / 1000
+            roll = self.rng.random()
+        time.sleep(delay)
+        if roll < self.throttle_rate:
+            return 429, {"Retry-After": str(self.retry_after)}
+        if roll < self.throttle_rate + self.error_rate:
+            return 500, {}
+        return None
+
+    def stats(self) -> Dict:
+        with self.lock:
+            return {"requests": dict(self.requests), "statuses": {str(k): v for k, v in self.statuses.items()},
+                    "tokens_issued": len(self.tokens)}
+
+
+class FakeGeocoderHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def geocoder(self) -> FakeGeocoder:
+        return self.server.geocoder
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status: int, payload: Dict, headers: Dict = None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+        with self.geocoder.lock:
+            self.geocoder.statuses[status] += 1
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if url.path != MAPPLS_TOKEN_PATH:
+            return self.send_json(404, {"error": "not found"})
+        with self.geocoder.lock:
+            self.geocoder.requests["mappls_token"] += 1
+        fault = self.geocoder.fault()
+        if fault:
+            return self.send_json(fault[0], {"error": "injected"}, fault[1])
+        self.send_json(200, {"access_token": self.geocoder.issue_token(), "token_type": "bearer",
+                             "expires_in": self.geocoder.token_ttl})
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        if url.path == "/_stats":
+            return self.send_json(200, self.geocoder.stats())
+        endpoints = {MAPPLS_SEARCH_PATH: "mappls_search", GOOGLE_SEARCH_PATH: "google_search",
+                     MAPPLS_DETAILS_PATH: "mappls_details", GOOGLE_DETAILS_PATH: "google_details"}
+        endpoint = endpoints.get(url.path)
+        if endpoint is None:
+            return self.send_json(404, {"error": "not found"})
+
+        with self.geocoder.lock:
+            self.geocoder.requests[endpoint] += 1
+        fault = self.geocoder.fault()
+        if fault:
+            return self.send_json(fault[0], {"error": "injected"}, fault[1])
+
+        if endpoint.startswith("mappls"):
+            if not self.geocoder.token_valid(self.headers.get("Authorization", "")):
+                return self.send_json(401, {"error": "invalid_token"})
+            if endpoint == "mappls_details":
+                place = self.geocoder.by_id.get(params.get("eloc", ""))
+                if place is None:
+                    return self.send_json(404, {"error": "unknown eloc"})
+                return self.send_json(200, {"eLoc": _eloc(place), "placeName": place["name"],
+                                            "address": place["address"], "website": place.get("website", "")})
+            return self.send_json(200, {"suggestedLocations": [{
+                "placeName": place["name"],
+                "placeAddress": place["address"],
+                "keywords": place.get("keywords", ["HSPGEN"]),
+                "eLoc": _eloc(place),
+            } for place in self.geocoder.search(params.get("query", ""))]})
+
+        if not params.get("key"):
+            return self.send_json(200, {"status": "REQUEST_DENIED", "results": [],
+                                        "error_message": "You must use an API key to authenticate each request."})
+        if endpoint == "google_details":
+            place = self.geocoder.by_id.get(params.get("place_id", ""))
+            if place is None:
+                return self.send_json(200, {"status": "NOT_FOUND"})
+            result = {"website": place["website"]} if place.get("website") else {}
+            return self.send_json(200, {"status": "OK", "result": result})
+        matches = self.geocoder.search(params.get("query", ""))
+        self.send_json(200, {"status": "OK" if matches else "ZERO_RESULTS", "results": [{
+            "name": place["name"],
+            "formatted_address": place["address"],
+            "types": place.get("types", ["hospital", "health", "point_of_interest"]),
+            "place_id": _place_id(place),
+        } for place in matches]})
+
+
+class FakeGeocoderServer:
+    """A FakeGeocoder served from a background thread (for use inside benchmarks and load tests)."""
+
+    def __init__(self, geocoder: FakeGeocoder, host: str = "127.0.0.1", port: int = 0):
+        self.geocoder = geocoder
+        self.httpd = ThreadingHTTPServer((host, port), FakeGeocoderHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.geocoder = geocoder
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name="fake-geocoder", daemon=True)
+        self.thread.start()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def env(self) -> Dict[str, str]:
+        """Settings that point scraping.py at this server (set them before importing scraping)."""
+        return {"MAPPLS_AUTH_BASE_URL": self.base_url, "MAPPLS_API_BASE_URL": self.base_url,
+                "GOOGLE_MAPS_BASE_URL": self.base_url}
+
+    def stats(self) -> Dict:
+        return self.geocoder.stats()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def start_fake_geocoder(places: List[Dict], host: str = "127.0.0.1", port: int = 0, **settings) -> FakeGeocoderServer:
+    """Start a fake geocoder on a background thread; settings are FakeGeocoder's fault options."""
+    return FakeGeocoderServer(FakeGeocoder(places, **settings), host=host, port=port)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--fixtures", help="JSON file with the places to serve")
+    source.add_argument("--synthetic", type=int, metavar="N", help="Serve the N hospitals of a synthetic directory")
+    parser.add_argument("--seed", type=int, default=42, help="Seed of the synthetic directory")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0, help="Fraction of requests answered with HTTP 500")
+    parser.add_argument("--throttle-rate", type=float, default=0, help="Fraction of requests answered with HTTP 429")
+    parser.add_argument("--retry-after", type=int, default=0, help="Retry-After seconds sent with 429s")
+    parser.add_argument("--token-ttl", type=int, default=3600, help="expires_in of issued Mappls tokens")
+    args = parser.parse_args()
+
+    places = load_places(args.fixtures) if args.fixtures else synthetic_places(args.synthetic, args.seed)
+    server = start_fake_geocoder(places, host=args.host, port=args.port, latency_ms=args.latency_ms,
+                                 jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+                                 throttle_rate=args.throttle_rate, retry_after=args.retry_after,
+                                 token_ttl=args.token_ttl)
+    print(f"✓ Fake geocoder serving {len(places)} places at {server.base_url}")
+    for name, value in server.env().items():
+        print(f"export {name}={value}")
+    try:
+        server.thread.join()
+    except KeyboardInterrupt:
+        print(f"\n{json.dumps(server.stats(), indent=2)}")
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
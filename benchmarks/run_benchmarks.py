@@ -0,0 +1,227 @@
+"""
+Throughput benchmarks for the validator's hot loops.
+
+Covers _normalize_text, _normalize_phone, _fuzzy_name_match, AddressMatcher,
+compare_doctor_data (against rosters of different sizes) and
+group_doctors_by_hospital (over inputs of different sizes) on synthetic
+Indian provider data, plus the geocoding pre-pass against the local fake
+geocoder (cold and warm geocode cache). Each case reports the best of --repeat runs; results
+can be written as JSON to track throughput across versions.
+
+Usage:
+    python benchmarks/run_benchmarks.py --quick
+    python benchmarks/run_benchmarks.py --rows 1000,100000,1000000 --rosters 10,500,5000 --output bench.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from address_matcher import AddressMatcher
+from fake_geocoder import start_fake_geocoder, synthetic_places
+from synthetic import make_directory, make_doctor_name, make_hospitals, make_phone, make_roster, name_variant
+from vallidation_agent import (
+    DoctorRecord, RosterIndex, _fuzzy_name_match, _normalize_phone, _normalize_text,
+    compare_doctor_data, group_doctors_by_hospital
+)
+
+DEFAULT_ROWS = [1_000, 10_000, 100_000, 1_000_000]
+DEFAULT_ROSTERS = [10, 100, 1_000, 5_000]
+QUICK_ROWS = [1_000, 10_000]
+QUICK_ROSTERS = [10, 100, 1_000]
+DEFAULT_GEOCODE_HOSPITALS = [500]
+QUICK_GEOCODE_HOSPITALS = [100]
+GEOCODE_LATENCY_MS = 20
+KERNEL_OPS = 100_000
+# Geocoding candidates scored per input address (Mappls returns up to a few dozen)
+ADDRESS_CANDIDATES = 25
+CSV_DOCTORS_PER_HOSPITAL = 1_000
+
+
+def time_best(fn: Callable, repeat: int) -> float:
+    """Best wall-clock time of `repeat` calls."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def result(benchmark: str, params: Dict, ops: int, seconds: float) -> Dict:
+    entry = {
+        "benchmark": benchmark,
+        "params": params,
+        "ops": ops,
+        "seconds": round(seconds, 6),
+        "ops_per_sec": round(ops / seconds, 1) if seconds else None,
+    }
+    label = ", ".join(f"{k}={v}" for k, v in params.items())
+    print(f"{benchmark:<28} {label:<28} {ops:>9} ops {seconds:>9.4f}s {entry['ops_per_sec'] or 0:>14,.0f} ops/s")
+    return entry
+
+
+def bench_kernels(repeat: int, seed: int) -> List[Dict]:
+    rng = random.Random(seed)
+    texts = [f"{rng.choice(['MBBS, MD', 'M.B.B.S.', 'Cardiology'])} ({make_doctor_name(rng)})" for _ in range(KERNEL_OPS)]
+    phones = [make_phone(rng) for _ in range(KERNEL_OPS)]
+    names = [make_doctor_name(rng) for _ in range(KERNEL_OPS)]
+    pairs = [(n, name_variant(n, rng) if rng.random() < 0.5 else rng.choice(names)) for n in names]
+    sites = make_hospitals(KERNEL_OPS // ADDRESS_CANDIDATES, rng)
+    queries = [(f"{site['hospital_name']}, {site['address']}", rng.sample(sites, ADDRESS_CANDIDATES)) for site in sites]
+
+    def match_addresses():
+        for query, candidates in queries:
+            matcher = AddressMatcher(query)
+            for candidate in candidates:
+                matcher.match(candidate["hospital_name"], candidate["address"])
+
+    return [
+        result("normalize_text", {}, KERNEL_OPS,
+               time_best(lambda: [_normalize_text(t) for t in texts], repeat)),
+        result("normalize_phone", {}, KERNEL_OPS,
+               time_best(lambda: [_normalize_phone(p) for p in phones], repeat)),
+        result("fuzzy_name_match", {}, KERNEL_OPS,
+               time_best(lambda: [_fuzzy_name_match(a, b) for a, b in pairs], repeat)),
+        result("address_match", {"candidates": ADDRESS_CANDIDATES}, len(queries) * ADDRESS_CANDIDATES,
+               time_best(match_addresses, repeat)),
+    ]
+
+
+def bench_compare(rosters: List[int], repeat: int, seed: int) -> List[Dict]:
+    frame = make_directory(CSV_DOCTORS_PER_HOSPITAL, 1, seed=seed)
+    csv_rows = frame.to_dict("records")
+    entries = []
+    for size in rosters:
+        roster = make_roster(csv_rows, size, seed=seed)
+
+        def run():
+            # Fresh records each run so cached normalizations do not carry over
+            records = [DoctorRecord.coerce(row) for row in csv_rows]
+            index = RosterIndex(roster)
+            for record in records:
+                compare_doctor_data(record, roster, roster_index=index)
+
+        entries.append(result("compare_doctor_data", {"csv": len(csv_rows), "roster": size},
+                              len(csv_rows), time_best(run, repeat)))
+    return entries
+
+
+def bench_grouping(rows: List[int], repeat: int, seed: int) -> List[Dict]:
+    entries = []
+    for count in rows:
+        frame = make_directory(count, max(1, count // 500), seed=seed)
+        # A million-row group takes seconds; one run is enough there
+        runs = repeat if count <= 100_000 else 1
+        entries.append(result("group_doctors_by_hospital", {"rows": count},
+                              count, time_best(lambda: group_doctors_by_hospital(frame), runs)))
+    return entries
+
+
+def bench_geocode(hospital_counts: List[int], seed: int) -> List[Dict]:
+    """
+    Geocoding pre-pass over synthetic hospitals served by the fake geocoder (bounded by GEOCODE_*_RPS).
+
+    Skipped (no entries) when scraping cannot be imported, i.e. without the browser agent's dependencies.
+    """
+    server = start_fake_geocoder(synthetic_places(max(hospital_counts), seed), latency_ms=GEOCODE_LATENCY_MS,
+                                 jitter_ms=GEOCODE_LATENCY_MS / 2, seed=seed)
+    # scraping reads these at import time, so it is imported only now
+    os.environ.update(server.env(), mappls_client_id="bench", mappls_client_secret="bench")
+    try:
+        import scraping  # exits when the browser agent stack is missing
+    except (ImportError, SystemExit):
+        server.close()
+        print("⚠️ Skipping geocode benchmarks: scraping could not be imported (browser agent dependencies missing)")
+        return []
+    import geocode_cache
+    from geocode_prepass import run_geocode_prepass
+
+    entries = []
+    try:
+        for count in hospital_counts:
+            targets = {str(i): (h["name"], h["address"]) for i, h in enumerate(synthetic_places(count, seed))}
+            with tempfile.TemporaryDirectory() as tmp:
+                geocode_cache._geocode_cache = geocode_cache.GeocodeCache(path=os.path.join(tmp, "geocode.sqlite3"))
+                for phase in ("cold", "warm"):
+                    requests_before = sum(server.stats()["requests"].values())
+                    start = time.perf_counter()
+                    run_geocode_prepass(targets)
+                    seconds = time.perf_counter() - start
+                    entry = result("geocode_prepass", {"hospitals": count, "cache": phase}, count, seconds)
+                    entry["provider_requests"] = sum(server.stats()["requests"].values()) - requests_before
+                    entries.append(entry)
+                geocode_cache._geocode_cache = None
+    finally:
+        server.close()
+    return entries
+
+
+def environment() -> Dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def parse_sizes(text: str) -> List[int]:
+    return [int(part) for part in text.split(",") if part.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=parse_sizes, default=None, help="Comma-separated input sizes for grouping")
+    parser.add_argument("--rosters", type=parse_sizes, default=None, help="Comma-separated scraped roster sizes")
+    parser.add_argument("--geocode-hospitals", type=parse_sizes, default=None,
+                        help="Comma-separated hospital counts for the geocoding pre-pass")
+    parser.add_argument("--only", choices=["kernels", "compare", "grouping", "geocode"], action="append",
+                        help="Run only these benchmark groups (repeatable)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--quick", action="store_true", help="Small sizes for a fast smoke run")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    rows = args.rows or (QUICK_ROWS if args.quick else DEFAULT_ROWS)
+    rosters = args.rosters or (QUICK_ROSTERS if args.quick else DEFAULT_ROSTERS)
+    geocode_hospitals = args.geocode_hospitals or (QUICK_GEOCODE_HOSPITALS if args.quick else DEFAULT_GEOCODE_HOSPITALS)
+    groups = args.only or ["kernels", "compare", "grouping", "geocode"]
+
+    results = []
+    if "kernels" in groups:
+        results += bench_kernels(args.repeat, args.seed)
+    if "compare" in groups:
+        results += bench_compare(rosters, args.repeat, args.seed)
+    if "grouping" in groups:
+        results += bench_grouping(rows, args.repeat, args.seed)
+    if "geocode" in groups:
+        results += bench_geocode(geocode_hospitals, args.seed)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"environment": environment(), "results": results}, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Synthetic Indian provider directories for benchmarks.
+
+Generates doctor names with initials and "Dr." prefixes in the styles seen in
+real hospital listings, Indian phone numbers in mixed formats, and scraped
+rosters that contain spelling variants of the CSV doctors, so the matching
+code takes its realistic (not just best- or worst-case) paths.
+
+Usage:
+    python benchmarks/synthetic.py providers.csv --rows 100000 --hospitals 500
+"""
+import argparse
+import random
+import string
+from typing import Dict, List
+
+import pandas as pd
+
+FIRST_NAMES = [
+    "Ramesh", "Suresh", "Lakshmi", "Priya", "Venkata", "Srinivas", "Anil", "Sunita", "Rajesh", "Kavitha",
+    "Mohammed", "Abdul", "Fatima", "Arjun", "Deepa", "Sanjay", "Meena", "Harish", "Anjali", "Naveen",
+    "Gurpreet", "Manoj", "Swati", "Pradeep", "Divya", "Karthik", "Shalini", "Vijay", "Neha", "Rahul",
+]
+SURNAMES = [
+    "Sharma", "Reddy", "Rao", "Kumar", "Iyer", "Nair", "Gupta", "Patel", "Singh", "Menon",
+    "Chowdary", "Naidu", "Pillai", "Mehta", "Banerjee", "Das", "Khan", "Joshi", "Kulkarni", "Verma",
+]
+SPECIALIZATIONS = [
+    "Cardiology", "Neurology", "Orthopaedics", "General Medicine", "Paediatrics", "Dermatology",
+    "Obstetrics & Gynaecology", "ENT", "Nephrology", "Gastroenterology", "Oncology", "Psychiatry",
+]
+QUALIFICATIONS = ["MBBS", "MBBS, MD", "MBBS, MS", "MBBS, MD, DM", "MBBS, DNB", "MBBS, MS, MCh", "BDS"]
+HOSPITAL_WORDS = ["Apollo", "Care", "Yashoda", "KIMS", "Sunshine", "Medicover", "Rainbow", "Star", "Aster", "Global"]
+HOSPITAL_SUFFIXES = ["Hospital", "Hospitals", "Multi Speciality Hospital", "Clinic", "Medical Centre"]
+CITIES = [
+    ("Hyderabad", "500"), ("Chennai", "600"), ("Bengaluru", "560"), ("Mumbai", "400"), ("Delhi", "110"),
+    ("Kolkata", "700"), ("Visakhapatnam", "530"), ("Pune", "411"), ("Kochi", "682"), ("Jaipur", "302"),
+]
+
+
+def make_doctor_name(rng: random.Random) -> str:
+    """A doctor name in one of the common listing styles."""
+    first, surname = rng.choice(FIRST_NAMES), rng.choice(SURNAMES)
+    initials = " ".join(f"{c}." for c in rng.sample(string.ascii_uppercase, rng.randint(1, 2)))
+    style = rng.randrange(6)
+    if style == 0:
+        return f"Dr. {first} {surname}"
+    if style == 1:
+        return f"Dr {initials} {surname}"
+    if style == 2:
+        return f"Dr. {initials} {first} {surname}"
+    if style == 3:
+        return f"{surname.upper()} {initials.replace('.', '')}"
+    if style == 4:
+        return f"Dr.{first} {initials[0]} {surname}"
+    return f"{first} {surname}"
+
+
+def name_variant(name: str, rng: random.Random) -> str:
+    """How a website might list the same doctor: prefix, case and initials punctuation change."""
+    bare = name.replace("Dr.", "").replace("Dr ", "").strip()
+    style = rng.randrange(4)
+    if style == 0:
+        return f"Dr. {bare}"
+    if style == 1:
+        return bare.replace(".", "")
+    if style == 2:
+        return f"DR {bare.upper()}"
+    return name
+
+
+def make_phone(rng: random.Random) -> str:
+    """Indian mobile or landline number in a mix of formats."""
+    mobile = f"{rng.choice('6789')}{rng.randrange(10**9):09d}"
+    style = rng.randrange(6)
+    if style == 0:
+        return mobile
+    if style == 1:
+        return f"+91 {mobile}"
+    if style == 2:
+        return f"+91-{mobile[:5]}-{mobile[5:]}"
+    if style == 3:
+        return f"0{mobile}"
+    if style == 4:
+        return f"{mobile[:5]} {mobile[5:]}"
+    return f"0{rng.choice(['40', '44', '80', '22'])}-{rng.randrange(10**8):08d}"
+
+
+def make_hospitals(count: int, rng: random.Random) -> List[Dict]:
+    hospitals = []
+    for h in range(count):
+        city, pin_prefix = rng.choice(CITIES)
+        hospitals.append({
+            "hospital_name": f"{rng.choice(HOSPITAL_WORDS)} {rng.choice(HOSPITAL_SUFFIXES)} {h}",
+            "address": f"Plot {rng.randint(1, 999)}, Road No. {rng.randint(1, 90)}, {city} - {pin_prefix}{rng.randrange(1000):03d}",
+        })
+    return hospitals
+
+
+def make_directory(rows: int, hospitals: int, seed: int = 42) -> pd.DataFrame:
+    """Input CSV frame with `rows` doctors spread over `hospitals` hospitals (with blanks, like real uploads)."""
+    rng = random.Random(seed)
+    sites = make_hospitals(hospitals, rng)
+    site_ids = [rng.randrange(hospitals) for _ in range(rows)]
+    return pd.DataFrame({
+        "hospital_name": [sites[h]["hospital_name"] for h in site_ids],
+        "address": [sites[h]["address"] for h in site_ids],
+        "doctor_name": [make_doctor_name(rng) for _ in range(rows)],
+        "specialization": [rng.choice(SPECIALIZATIONS + [None]) for _ in range(rows)],
+        "qualification": [rng.choice(QUALIFICATIONS + [None]) for _ in range(rows)],
+        "phone_number": [make_phone(rng) if rng.random() < 0.8 else None for _ in range(rows)],
+        "license_number": [f"APMC/{rng.randint(1990, 2024)}/{i:06d}" for i in range(rows)],
+    })
+
+
+def make_roster(csv_doctors: List[Dict], size: int, seed: int = 42, overlap: float = 0.7) -> List[Dict]:
+    """
+    Scraped roster of `size` doctors in scraping.main's format.
+
+    About `overlap` of the CSV doctors appear (as name variants, sometimes with
+    a different phone or specialization); the rest of the roster is filler.
+    """
+    rng = random.Random(seed)
+    roster = []
+    for doctor in csv_doctors:
+        if len(roster) >= size:
+            break
+        if rng.random() >= overlap:
+            continue
+        roster.append({
+            "full_name": name_variant(doctor["doctor_name"], rng),
+            "specialization": doctor["specialization"] if rng.random() < 0.8 else rng.choice(SPECIALIZATIONS),
+            "qualification": doctor["qualification"] or "",
+            "phone_number": doctor["phone_number"] if rng.random() < 0.7 else make_phone(rng),
+        })
+    while len(roster) < size:
+        roster.append({
+            "full_name": make_doctor_name(rng),
+            "specialization": rng.choice(SPECIALIZATIONS),
+            "qualification": rng.choice(QUALIFICATIONS),
+            "phone_number": make_phone(rng),
+        })
+    rng.shuffle(roster)
+    return roster
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("output_csv")
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--hospitals", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    make_directory(args.rows, args.hospitals, seed=args.seed).to_csv(args.output_csv, index=False)
+    print(f"Wrote {args.rows} doctors across {args.hospitals} hospitals to {args.output_csv}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,15 +3,34 @@ from typing import Optional
 import os
 import asyncio
 import sys
+import threading
+from hospital_budget import budget_timeout_ms
+from site_trail import record_visit
+
+
+def _thread_local_attr(name):
+    """Property stored per thread, so concurrent hospital workers each drive their own browser."""
+    def getter(self):
+        return getattr(self._local, name, None)
+
+    def setter(self, value):
+        setattr(self._local, name, value)
+
+    return property(getter, setter)
+
 
 class BrowserManager:
-    """Singleton class to manage browser and page instances globally."""
+    """Singleton class to manage browser and page instances (one browser per thread)."""
     
     _instance = None
-    _playwright = None
-    _browser: Optional[BrowserContext] = None 
-    _page: Optional[Page] = None
-    _current_site_name: Optional[str] = None
+    _local = threading.local()
+    _profiles_lock = threading.Lock()
+    _profiles_in_use = set()
+    _playwright = _thread_local_attr("playwright")
+    _browser: Optional[BrowserContext] = _thread_local_attr("browser")
+    _page: Optional[Page] = _thread_local_attr("page")
+    _current_site_name: Optional[str] = _thread_local_attr("current_site_name")
+    _profile_dir: Optional[str] = _thread_local_attr("profile_dir")
     
     def __new__(cls):
         if cls._instance is None:
@@ -35,12 +54,13 @@ class BrowserManager:
             if self._page and not self._page.is_closed():
                 print(f">>> Navigating existing {safe_site_name} session to {url}")
                 try:
-                    self._page.goto(url, wait_until="domcontentloaded", timeout=60000)
+                    self._page.goto(url, wait_until="domcontentloaded", timeout=budget_timeout_ms(60000))
+                    record_visit(self._page.url)
                     return f"Navigated to {url}"
                 except Exception as e:
                     print(f"Navigation failed ({e}), restarting browser...")
                     self.close_browser()
-            user_data_dir = os.path.abspath(f"./profiles/{safe_site_name}_profile")
+            user_data_dir = self._claim_profile_dir(safe_site_name)
             if not os.path.exists(user_data_dir):
                 os.makedirs(user_data_dir)
 
@@ -65,7 +85,8 @@ class BrowserManager:
             
             self._current_site_name = safe_site_name
             self._page = self._browser.pages[0]
-            self._page.goto(url, wait_until="domcontentloaded", timeout=60000)
+            self._page.goto(url, wait_until="domcontentloaded", timeout=budget_timeout_ms(60000))
+            record_visit(self._page.url)
             
             return f"Browser started for {safe_site_name}"
 
@@ -73,6 +94,22 @@ class BrowserManager:
             self.close_browser()
             return f"Error opening browser: {str(e)}"
     
+    def _claim_profile_dir(self, safe_site_name: str) -> str:
+        """
+        Reserve a persistent profile directory for this thread.
+        Chromium locks its user data dir, so a second worker on the same site gets a numbered copy.
+        """
+        with self._profiles_lock:
+            base_dir = os.path.abspath(f"./profiles/{safe_site_name}_profile")
+            user_data_dir = base_dir
+            n = 1
+            while user_data_dir in self._profiles_in_use:
+                n += 1
+                user_data_dir = f"{base_dir}_{n}"
+            self._profiles_in_use.add(user_data_dir)
+            self._profile_dir = user_data_dir
+            return user_data_dir
+
     def close_browser(self) -> str:
         """Safe cleanup."""
         try:
@@ -90,6 +127,10 @@ class BrowserManager:
             self._browser = None
             self._playwright = None
             self._current_site_name = None
+            if self._profile_dir:
+                with self._profiles_lock:
+                    self._profiles_in_use.discard(self._profile_dir)
+                self._profile_dir = None
             return "Browser closed"
         except Exception as e:
             return f"Error closing: {e}"
@@ -6,6 +6,8 @@ import json
 import asyncio
 import re
 import browser_manager
+from hospital_budget import budget_exhausted, budget_timeout_ms
+from site_trail import record_listing
 
 from crawl4ai import AsyncWebCrawler, CrawlerRunConfig, CacheMode
 from crawl4ai.extraction_strategy import LLMExtractionStrategy
@@ -104,6 +106,9 @@ async def extract_doctor_profile_urls(listing_urls):
     """
 
     for i, url in enumerate(listing_urls):
+        if budget_exhausted():
+            print(f"   ⏱️ {budget_exhausted()} - keeping the {len(doctor_profile_links)} profile links found so far")
+            break
         
         print(f"   ⚡ Scanning: {url}")
         page_success = False
@@ -143,7 +148,7 @@ async def extract_doctor_profile_urls(listing_urls):
                     extraction_strategy=llm_strategy,
                     cache_mode=CacheMode.BYPASS,
                     wait_for="css:body",
-                    page_timeout=300000  
+                    page_timeout=budget_timeout_ms(300000)
                 )
 
                 
@@ -169,6 +174,8 @@ async def extract_doctor_profile_urls(listing_urls):
                                     count += 1
                             
                             print(f"      ✅ Success with {key_name}: Found {count} profiles.")
+                            if count:
+                                record_listing(url)
                             page_success = True 
                             
                         except json.JSONDecodeError:
@@ -196,6 +203,9 @@ async def scrape_doctor_details(profile_urls):
     instruction = "Extract the doctor's name, specialty, qualifications, phone number (if available else search for the hospital number even that not found then give null), and experience from this profile page."
 
     for i, url in enumerate(profile_urls):
+        if budget_exhausted():
+            print(f"   ⏱️ {budget_exhausted()} - returning the {len(all_doctors)} doctors scraped so far")
+            break
         print(f"   ⚡ Analyzing: {url}")
         
         page_success = False
@@ -232,7 +242,7 @@ async def scrape_doctor_details(profile_urls):
                     extraction_strategy=llm_strategy,
                     cache_mode=CacheMode.BYPASS,
                     wait_for="css:body",
-                    page_timeout=300000  
+                    page_timeout=budget_timeout_ms(300000)
                 )
 
                 async with AsyncWebCrawler() as crawler:
@@ -248,6 +258,8 @@ async def scrape_doctor_details(profile_urls):
                                 print(f"     ✅ Found: {item.get('name')} (via {key_name})")
                             
                             all_doctors.extend(data)
+                            if len(data) > 1:
+                                record_listing(url)
                             page_success = True
                         except json.JSONDecodeError:
                             print(f"     ⚠️ JSON Error with {key_name}.")
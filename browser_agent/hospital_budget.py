@@ -0,0 +1,107 @@
+import contextvars
+import os
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+import dotenv
+
+# Imported before the other agent modules load config/.env, so load it here for the settings below
+dotenv.load_dotenv(os.path.join(os.path.dirname(__file__), '../config/.env'))
+
+# Wall-clock and planner/executor step limits for scraping one hospital (0 disables a limit; both are off by default)
+HOSPITAL_BUDGET_SECONDS = float(os.getenv("HOSPITAL_BUDGET_SECONDS", "0"))
+HOSPITAL_BUDGET_STEPS = int(os.getenv("HOSPITAL_BUDGET_STEPS", "0"))
+
+# Never hand a page load less than this, or it fails before the server can answer
+MIN_TIMEOUT_MS = 5000
+
+
+class HospitalBudget:
+    """
+    Time and step allowance for scraping a single hospital.
+
+    The budget is cooperative: scraping.main, the agent graph and the crawler
+    check it between steps and wrap up with whatever they have gathered once
+    it is exhausted, instead of being killed mid-way.
+    """
+
+    def __init__(self, seconds: float = None, steps: int = None):
+        self.seconds = HOSPITAL_BUDGET_SECONDS if seconds is None else seconds
+        self.steps = HOSPITAL_BUDGET_STEPS if steps is None else steps
+        self.started = time.monotonic()
+        self.steps_used = 0
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    def remaining_seconds(self) -> Optional[float]:
+        """Seconds left, or None when there is no time limit."""
+        if self.seconds <= 0:
+            return None
+        return max(0.0, self.seconds - self.elapsed())
+
+    def use_step(self):
+        """Count one planner/executor step."""
+        self.steps_used += 1
+
+    @property
+    def exhausted(self) -> bool:
+        return self.reason is not None
+
+    @property
+    def reason(self) -> Optional[str]:
+        """Why the budget ran out, or None while there is some left."""
+        remaining = self.remaining_seconds()
+        if remaining is not None and remaining <= 0:
+            return f"time budget of {self.seconds:g}s exhausted"
+        if self.steps > 0 and self.steps_used >= self.steps:
+            return f"step budget of {self.steps} steps exhausted"
+        return None
+
+    def timeout_ms(self, default_ms: int) -> int:
+        """Cap a page/network timeout so it cannot outlive the budget."""
+        remaining = self.remaining_seconds()
+        if remaining is None:
+            return default_ms
+        return int(max(MIN_TIMEOUT_MS, min(default_ms, remaining * 1000)))
+
+
+_current_budget: contextvars.ContextVar = contextvars.ContextVar("hospital_budget", default=None)
+
+
+def current_budget() -> Optional[HospitalBudget]:
+    """Budget of the hospital being scraped in this thread/task, if any."""
+    return _current_budget.get()
+
+
+@contextmanager
+def hospital_budget(seconds: float = None, steps: int = None):
+    """
+    Make a budget current for the enclosed scrape.
+
+    If a budget is already active (e.g. set by a caller with custom limits)
+    it is reused, so nested calls share one allowance.
+    """
+    active = _current_budget.get()
+    if active is not None:
+        yield active
+        return
+    budget = HospitalBudget(seconds=seconds, steps=steps)
+    token = _current_budget.set(budget)
+    try:
+        yield budget
+    finally:
+        _current_budget.reset(token)
+
+
+def budget_exhausted() -> Optional[str]:
+    """Reason the current budget ran out, or None (also None when no budget is active)."""
+    budget = _current_budget.get()
+    return budget.reason if budget else None
+
+
+def budget_timeout_ms(default_ms: int) -> int:
+    """default_ms capped by the current budget (unchanged when no budget is active)."""
+    budget = _current_budget.get()
+    return budget.timeout_ms(default_ms) if budget else default_ms
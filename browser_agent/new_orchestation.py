@@ -3,6 +3,7 @@ import time
 import re
 import asyncio
 import sys
+import json
 from urllib.parse import urlparse
 from typing import Literal, List, Annotated
 import operator
@@ -18,9 +19,12 @@ from langchain.agents import AgentExecutor, create_tool_calling_agent
 from langchain_core.output_parsers import JsonOutputParser
 from langchain_community.tools.tavily_search import TavilySearchResults
 from langgraph.graph import StateGraph, START, END, MessagesState
+from langgraph.errors import GraphRecursionError
 from langgraph.types import Command
 from pydantic import BaseModel, Field
 from browser_manager import browser_manager
+from hospital_budget import hospital_budget, current_budget, budget_exhausted
+from site_trail import site_trail, record_visit
 from browser_tools import (
     click_id, fill_id, scan_page_with_som,hover_id,get_all_page_links,
     scroll_one_screen, press_key, get_page_text, hover_element,
@@ -107,11 +111,54 @@ class AgentState(MessagesState):
     final_output: str
     planner_api_key_index: int
     executor_api_key_index: int
+    budget_exhausted: bool
+
+
+def wrap_up_on_budget(state: AgentState, reason: str):
+    """Once the hospital budget is spent, format the doctors gathered so far instead of planning more steps."""
+    gathered = any(isinstance(m, AIMessage) for m in state["messages"])
+    if state.get("budget_exhausted") or not gathered:
+        print(f"⏱️  {reason} - stopping")
+        return Command(update={"budget_exhausted": True}, goto=END)
+    
+    print(f"⏱️  {reason} - formatting the data gathered so far")
+    return Command(
+        update={
+            "messages": [HumanMessage(content=f"[Planner]: {reason}, formatting partial results")],
+            "output_agent_messages": [HumanMessage(content=(
+                "The search was stopped early. Output every doctor found so far as JSON "
+                "(name, qualification, specialty, phone number)."
+            ))],
+            "budget_exhausted": True
+        },
+        goto="output_formatting_agent"
+    )
+
+
+def wrap_up_after_recursion_limit(state: AgentState, reason: str) -> dict:
+    """
+    Format the doctors gathered so far once the graph hit its recursion limit.
+
+    The graph cannot route to the output agent any more, so the wrap-up that
+    wrap_up_on_budget would have scheduled is run directly on the last state.
+    """
+    command = wrap_up_on_budget(dict(state, budget_exhausted=False), reason)
+    wrapped = dict(state, budget_exhausted=True)
+    if command.goto == END:
+        return wrapped
+    wrapped["messages"] = state["messages"] + command.update["messages"]
+    wrapped["output_agent_messages"] = state["output_agent_messages"] + command.update["output_agent_messages"]
+    formatted = output_agent(wrapped)
+    wrapped["final_output"] = (formatted.update or {}).get("final_output", state.get("final_output", ""))
+    return wrapped
 
 
 def planner_agent(state: AgentState):
     user_input = state["input_str"]
     step_index = state.get("step_index", 0)
+    reason = budget_exhausted()
+    if reason:
+        return wrap_up_on_budget(state, reason)
     if step_index == 0:
         system_message = get_planning_agent_initial_prompt(user_input)
         human_msg = "Please generate the initial plan."
@@ -121,6 +168,7 @@ def planner_agent(state: AgentState):
                 interactive_map = scan_page_with_som.invoke({"query": None})
                 if len(interactive_map) > 2000: 
                     interactive_map = interactive_map[:2000] + "...(truncated)"
+                record_visit(browser_manager.get_page().url)
                 current_page_state = f"""URL: {browser_manager.get_page().url}INTERACTIVE ELEMENTS AVAILABLE:{interactive_map}"""
             except Exception as e:
                 current_page_state = f"Page Open, but scan failed: {e}"
@@ -231,6 +279,11 @@ def planner_agent(state: AgentState):
     
 
 def executor_agent(state: AgentState):
+    budget = current_budget()
+    if budget:
+        if budget.exhausted:
+            return Command(goto="planner_agent")
+        budget.use_step()
     task_msg = state["execution_messages"][-1]
     task = task_msg.content
     task=task.replace("{","{{")
@@ -286,7 +339,8 @@ def executor_agent(state: AgentState):
             agent = create_tool_calling_agent(sambanova_llm, tools, prompt)
             agent_executor = AgentExecutor(
                 agent=agent, tools=tools, verbose=True,
-                max_iterations=15, handle_parsing_errors=True
+                max_iterations=15, handle_parsing_errors=True,
+                max_execution_time=budget.remaining_seconds() if budget else None
             )
             
             print(f"--- EXECUTOR: {task} ---")
@@ -445,9 +499,43 @@ def create_agent():
     
     return workflow.compile()
 
-def run_agent(hospital_name,hospital_location):
+def build_seeded_prompt(hospital_name, hospital_location, start_urls):
+    """Task for a hospital whose official website (first URL) and doctor listing pages are already known."""
+    website, listing_urls = start_urls[0], start_urls[1:]
+    if listing_urls:
+        steps = f"""
+                1. Do NOT search for the website. Call batch_scrape_doctors with urls_json={json.dumps(listing_urls)} and is_department_page=True to find the doctor profiles.
+                2. If that finds no profiles, open these pages with open_browser and scrape the doctors listed on them directly."""
+    else:
+        steps = f"""
+                1. Do NOT search for the website. Open {website} with open_browser and navigate to the doctors or specialties section.
+                2. If you see a list of departments/specialties, extract their links and use batch processing to find doctor profiles."""
+    return f"""
+                The official website of '{hospital_name}' located at '{hospital_location}' is {website}.
+                {steps}
+                3. Scrape the details (Name, Qualification, Specialty, Phone Number, url of the doctor page if seperate page is present) for all doctors found.
+                4. Output the final data as JSON.
+                """
+
+def run_agent(hospital_name,hospital_location,start_urls=None):
+    """
+    Find and scrape the doctors of one hospital.
+
+    Args:
+        hospital_name: Name of the hospital
+        hospital_location: Its address
+        start_urls: Optional known official website followed by doctor listing URLs;
+                    the agent starts there instead of searching for the website
+
+    Returns:
+        {"output": ..., "site": {"domain", "website", "listing_urls"}} plus
+        "partial"/"budget_reason" when the budget ran out, or {"error": ...}
+    """
     try:
-        prompt =f"""
+        if start_urls:
+            prompt = build_seeded_prompt(hospital_name, hospital_location, start_urls)
+        else:
+            prompt =f"""
                 Find the official website for '{hospital_name}' located at '{hospital_location}'.
                 
                 Once found:
@@ -465,16 +553,32 @@ def run_agent(hospital_name,hospital_location):
             "output_agent_messages": [],
             "messages": [],
             "planner_api_key_index": 1,
-            "executor_api_key_index": 6
+            "executor_api_key_index": 6,
+            "budget_exhausted": False
         }
         
         print(f"Starting Task: {prompt}")
-        result = app.invoke(initial_state)
+        stop_reason = None
+        with hospital_budget() as budget, site_trail() as trail:
+            # Leave the step budget, not the graph's recursion limit, to stop long runs: each step is a
+            # planner and an executor turn, plus room for output formatting retries after the wrap-up
+            config = {"recursion_limit": max(25, 4 * budget.steps + 10)}
+            result = initial_state
+            try:
+                for result in app.stream(initial_state, config=config, stream_mode="values"):
+                    pass
+            except GraphRecursionError:
+                stop_reason = f"recursion limit of {config['recursion_limit']} reached"
+                result = wrap_up_after_recursion_limit(result, stop_reason)
         for key, item in result.items():
             print("="*60)
             print(f">>>{key}")
             print(item)
-        return {"output": result.get("final_output", "No output generated.")}
+        output = {"output": result.get("final_output", "No output generated."), "site": trail.summary()}
+        if result.get("budget_exhausted"):
+            output["partial"] = True
+            output["budget_reason"] = budget.reason or stop_reason or "budget exhausted"
+        return output
     except Exception as e:
         print(f"An error occurred during execution: {e}")
         return {"error": f"Error during agent running: {e}"}
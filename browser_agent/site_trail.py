@@ -0,0 +1,87 @@
+import contextvars
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+# Listing URLs kept per hospital (department pages of big hospitals can run into the dozens)
+MAX_LISTING_URLS = 50
+
+
+def site_domain(url: str) -> str:
+    """Host of a URL without a leading "www." ("" for anything that is not an http(s) URL)."""
+    parsed = urlparse(str(url or ""))
+    if parsed.scheme not in ("http", "https"):
+        return ""
+    host = parsed.netloc.lower().split("@")[-1].split(":")[0]
+    return host[4:] if host.startswith("www.") else host
+
+
+class SiteTrail:
+    """
+    Where the agent went while scraping one hospital.
+
+    Records the pages it navigated to and the listing pages that actually
+    yielded doctors (department pages with profile links, or pages with
+    several doctors on them), so the next run can start from there.
+    """
+
+    def __init__(self):
+        self.visited: List[str] = []
+        self.listing_urls: List[str] = []
+
+    def visit(self, url: str):
+        if site_domain(url) and url not in self.visited:
+            self.visited.append(url)
+
+    def listing(self, url: str):
+        if site_domain(url) and url not in self.listing_urls and len(self.listing_urls) < MAX_LISTING_URLS:
+            self.listing_urls.append(url)
+
+    @property
+    def domain(self) -> str:
+        """Domain the doctors came from (else the first site visited)."""
+        for url in self.listing_urls + self.visited:
+            domain = site_domain(url)
+            if domain:
+                return domain
+        return ""
+
+    def summary(self) -> Dict:
+        domain = self.domain
+        website = next((url for url in self.visited if site_domain(url) == domain), "")
+        if not website and domain:
+            website = f"https://{domain}/"
+        return {"domain": domain, "website": website, "listing_urls": list(self.listing_urls)}
+
+
+_current_trail: contextvars.ContextVar = contextvars.ContextVar("site_trail", default=None)
+
+
+def current_trail() -> Optional[SiteTrail]:
+    """Trail of the hospital being scraped in this thread/task, if any."""
+    return _current_trail.get()
+
+
+@contextmanager
+def site_trail():
+    """Make a fresh SiteTrail current for the enclosed agent run."""
+    trail = SiteTrail()
+    token = _current_trail.set(trail)
+    try:
+        yield trail
+    finally:
+        _current_trail.reset(token)
+
+
+def record_visit(url: str):
+    """Note a page the agent navigated to (no-op outside site_trail())."""
+    trail = _current_trail.get()
+    if trail is not None:
+        trail.visit(url)
+
+
+def record_listing(url: str):
+    """Note a page that listed doctors (no-op outside site_trail())."""
+    trail = _current_trail.get()
+    if trail is not None:
+        trail.listing(url)
@@ -0,0 +1,117 @@
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict, Iterator, List, Set
+
+
+class CheckpointJournal:
+    """
+    Durable per-session journal of completed hospitals.
+
+    The journal is an append-only JSON-lines file. The first line holds the
+    session metadata (input/output paths), every following line one finished
+    hospital with its results. Each entry is flushed and fsynced before the
+    next hospital is recorded, so after a crash a restarted run can skip
+    every hospital that made it into the journal.
+
+    Only the keys of completed hospitals are held in memory; their results
+    are streamed back from the file with iter_results() when the output is
+    rebuilt. Hospitals that failed with an error are not journaled, so a
+    resumed run retries them.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.meta: Dict = {}
+        self.completed: Set[str] = set()
+        self._file = None
+
+    @staticmethod
+    def default_path(output_csv: str) -> str:
+        return f"{output_csv}.journal.jsonl"
+
+    @staticmethod
+    def read_meta(path: str) -> Dict:
+        """Return the session metadata stored in a journal, or {} if there is none."""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                first = json.loads(f.readline())
+            return first.get("meta", {}) if first.get("type") == "session" else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _entries(self) -> Iterator[Dict]:
+        """Journal entries in file order. A torn last line from a crash is ignored."""
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line_no, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    logging.warning(f"Ignoring unreadable checkpoint entry at {self.path}:{line_no}")
+
+    @staticmethod
+    def _is_completed(entry: Dict) -> bool:
+        # Journals written before errors were skipped may still hold "error" entries
+        return entry.get("type") == "hospital" and entry.get("status") != "error"
+
+    def load(self) -> Set[str]:
+        """Read the keys of completed hospitals from disk."""
+        self.meta = {}
+        self.completed = set()
+        if not self.path.exists():
+            return self.completed
+
+        for entry in self._entries():
+            if entry.get("type") == "session":
+                self.meta = entry.get("meta", {})
+            elif self._is_completed(entry):
+                self.completed.add(entry["key"])
+        return self.completed
+
+    def iter_results(self) -> Iterator[List[Dict]]:
+        """Stream the results of each completed hospital from disk, one hospital at a time."""
+        if not self.path.exists():
+            return
+        seen = set()
+        for entry in self._entries():
+            if self._is_completed(entry) and entry["key"] not in seen:
+                seen.add(entry["key"])
+                yield entry.get("results", [])
+
+    def start(self, meta: Dict, resume: bool = False):
+        """
+        Open the journal for writing.
+
+        With resume=True existing entries are kept (call load() first);
+        otherwise the journal is truncated and a new session header is written.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if resume and self.path.exists():
+            self._file = open(self.path, "a", encoding="utf-8")
+            return
+        self.meta = meta
+        self.completed = set()
+        self._file = open(self.path, "w", encoding="utf-8")
+        self._append({"type": "session", "meta": meta})
+
+    def record(self, hospital_key: str, status: str, results: List[Dict]):
+        """Durably mark a hospital as finished (hospitals with status "error" are left for a resume to retry)."""
+        if status == "error":
+            return
+        self.completed.add(hospital_key)
+        self._append({"type": "hospital", "key": hospital_key, "status": status, "results": [dict(r) for r in results]})
+
+    def _append(self, entry: Dict):
+        self._file.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self, remove: bool = False):
+        if self._file:
+            self._file.close()
+            self._file = None
+        if remove and self.path.exists():
+            self.path.unlink()
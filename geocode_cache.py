@@ -0,0 +1,74 @@
+import logging
+import os
+import re
+from typing import Dict, Optional
+
+import settings  # loads config/.env before the settings below are read
+from ttl_cache import CACHE_DIR, SQLiteTTLCache
+
+# Verified locations are reused for this long; "not found" verdicts for a shorter time (0 disables either)
+GEOCODE_CACHE_TTL_HOURS = float(os.getenv("GEOCODE_CACHE_TTL_HOURS", "720"))
+GEOCODE_NEGATIVE_TTL_HOURS = float(os.getenv("GEOCODE_NEGATIVE_TTL_HOURS", "24"))
+GEOCODE_CACHE_PATH = os.getenv("GEOCODE_CACHE_PATH", os.path.join(CACHE_DIR, "geocode_cache.sqlite3"))
+
+
+def normalize_address_query(full_address: str) -> str:
+    """Case/punctuation/whitespace-insensitive form of a geocoding query."""
+    text = re.sub(r"[^\w\s]", " ", str(full_address or "").lower())
+    return re.sub(r"\s+", " ", text).strip()
+
+
+class GeocodeCache:
+    """
+    Disk-backed cache of location verification results, keyed by provider and normalised query.
+
+    Entries hold the verification outcome together with the raw provider
+    response ("raw_response"). Only results that carry a provider response
+    are cached; auth failures, timeouts and quota errors are retried next time.
+    """
+
+    def __init__(self, path: str = GEOCODE_CACHE_PATH, ttl_hours: float = GEOCODE_CACHE_TTL_HOURS,
+                 negative_ttl_hours: float = GEOCODE_NEGATIVE_TTL_HOURS):
+        self.ttl_seconds = ttl_hours * 3600
+        self.negative_ttl_seconds = negative_ttl_hours * 3600
+        self.store = SQLiteTTLCache(path, table="geocode_results") if self.enabled else None
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 or self.negative_ttl_seconds > 0
+
+    @staticmethod
+    def key(provider: str, full_address: str) -> str:
+        return f"{provider}:{normalize_address_query(full_address)}"
+
+    def get(self, provider: str, full_address: str) -> Optional[Dict]:
+        if not self.enabled:
+            return None
+        try:
+            return self.store.get(self.key(provider, full_address))
+        except Exception as e:
+            logging.warning(f"Geocode cache read failed: {e}")
+            return None
+
+    def put(self, provider: str, full_address: str, location_data: Dict):
+        """Cache a verification result with the positive or negative TTL."""
+        if not self.enabled or "raw_response" not in location_data:
+            return
+        ttl = self.ttl_seconds if location_data.get("verified") else self.negative_ttl_seconds
+        if ttl <= 0:
+            return
+        try:
+            self.store.set(self.key(provider, full_address), location_data, ttl=ttl)
+        except Exception as e:
+            logging.warning(f"Geocode cache write failed: {e}")
+
+
+_geocode_cache = None
+
+
+def get_geocode_cache() -> GeocodeCache:
+    """Process-wide GeocodeCache (created on first use)."""
+    global _geocode_cache
+    if _geocode_cache is None:
+        _geocode_cache = GeocodeCache()
+    return _geocode_cache
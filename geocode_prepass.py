@@ -0,0 +1,126 @@
+import asyncio
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+import settings  # loads config/.env before the settings below are read
+from http_client import async_http_client
+
+# Verify every hospital of an upload up front instead of just before its scrape
+GEOCODE_PREPASS = os.getenv("VALIDATION_GEOCODE_PREPASS", "0").lower() in ("1", "true", "yes")
+# Geocoding lookups in flight at once during the pre-pass
+GEOCODE_CONCURRENCY = int(os.getenv("GEOCODE_CONCURRENCY", "16"))
+# Requests per second sent to each provider (0 = unlimited)
+PROVIDER_RATE_LIMITS = {
+    "mappls": float(os.getenv("GEOCODE_MAPPLS_RPS", "5")),
+    "google": float(os.getenv("GEOCODE_GOOGLE_RPS", "10")),
+}
+
+
+class RateLimiter:
+    """
+    Async context manager that spaces request starts to at most `rate` per second.
+
+    Must be created and used inside one event loop.
+    """
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._lock = asyncio.Lock()
+        self._next_start = 0.0
+
+    async def __aenter__(self):
+        if not self.interval:
+            return self
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            now = loop.time()
+            delay = self._next_start - now
+            self._next_start = max(now, self._next_start) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+def is_definitive(location_data: Optional[Dict]) -> bool:
+    """
+    True for verdicts the pre-pass may act on: a verified location, a provider
+    answer ("raw_response") or a local PIN code rejection. Auth failures,
+    quota errors and 5xx responses after retries are not.
+    """
+    if not location_data:
+        return False
+    return (bool(location_data.get("verified")) or "raw_response" in location_data
+            or location_data.get("source") == "PincodeIndex")
+
+
+async def _verify_all(targets: Dict[str, Tuple[str, str]], concurrency: int) -> Dict[str, Optional[Dict]]:
+    from scraping import async_verify_hospital_location
+
+    limiters = {provider: RateLimiter(rate) for provider, rate in PROVIDER_RATE_LIMITS.items()}
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def verify(client, key, hospital_name, address):
+        async with semaphore:
+            try:
+                location_data = await async_verify_hospital_location(client, f"{hospital_name}, {address}", limiters,
+                                                                     address=address)
+                return key, location_data if is_definitive(location_data) else None
+            except Exception as e:
+                logging.warning(f"Geocoding pre-pass failed for {hospital_name}: {e}")
+                return key, None
+
+    async def verify_with(client):
+        pairs = await asyncio.gather(*(verify(client, key, name, address) for key, (name, address) in targets.items()))
+        return dict(pairs)
+
+    try:
+        client = async_http_client()
+    except ImportError:
+        # Without httpx the sync lookups run in worker threads under the same limits
+        logging.info("httpx not installed, geocoding pre-pass uses threads")
+        return await verify_with(None)
+    async with client:
+        return await verify_with(client)
+
+
+def run_geocode_prepass(targets: Dict[str, Tuple[str, str]], concurrency: int = None) -> Dict[str, Optional[Dict]]:
+    """
+    Verify many hospital locations concurrently before any scraping starts.
+
+    Lookups go through the geocode cache first, so verdicts from earlier runs
+    are reused and new ones are stored for later runs and for the scrape stage.
+
+    Args:
+        targets: {hospital_key: (hospital_name, address)}
+        concurrency: Lookups in flight at once (defaults to GEOCODE_CONCURRENCY)
+
+    Returns:
+        {hospital_key: location_data}, with None where the lookup failed or gave no
+        definitive answer (see is_definitive); those hospitals are verified again
+        during their scrape
+    """
+    if not targets:
+        return {}
+    concurrency = concurrency or GEOCODE_CONCURRENCY
+    started = time.monotonic()
+    coro = _verify_all(targets, concurrency)
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        locations = asyncio.run(coro)
+    else:
+        # Called from inside an event loop: run the pre-pass on its own loop in a helper thread
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            locations = pool.submit(asyncio.run, coro).result()
+
+    verified = sum(1 for loc in locations.values() if loc and loc.get("verified"))
+    failed = sum(1 for loc in locations.values() if loc and not loc.get("verified"))
+    print(f"✓ Geocoding pre-pass: {verified} verified, {failed} not found, "
+          f"{len(locations) - verified - failed} deferred ({time.monotonic() - started:.1f}s)")
+    return locations
@@ -0,0 +1,120 @@
+import re
+
+# Indian PIN codes: six digits, sometimes written as "500 033"
+PINCODE_RE = re.compile(r"(?<!\d)[1-9]\d{5}(?!\d)")
+SPACED_PINCODE_RE = re.compile(r"(?<!\d)([1-9]\d{2})\s(\d{3})(?!\d)")
+
+# Words that only vary in spelling/number between listings of the same hospital
+NAME_REPLACEMENTS = {
+    "hospitals": "hospital",
+    "hosp": "hospital",
+    "clinics": "clinic",
+    "centres": "centre",
+    "center": "centre",
+    "centers": "centre",
+    "speciality": "specialty",
+    "specialities": "specialty",
+    "specialties": "specialty",
+    "multispeciality": "multi specialty",
+    "multispecialty": "multi specialty",
+    "superspeciality": "super specialty",
+    "superspecialty": "super specialty",
+    "&": "and",
+}
+# Corporate and filler words that do not identify a hospital
+NAME_STOPWORDS = {"the", "pvt", "private", "ltd", "limited", "llp", "inc"}
+
+ADDRESS_REPLACEMENTS = {
+    "rd": "road",
+    "st": "street",
+    "nr": "near",
+    "opp": "opposite",
+    "ngr": "nagar",
+    "&": "and",
+}
+ADDRESS_STOPWORDS = {"india", "and"}
+# Street furniture that does not tell one locality from another
+LOCALITY_STOPWORDS = ADDRESS_STOPWORDS | {
+    "road", "street", "lane", "cross", "main", "near", "opposite", "behind", "beside", "no", "plot",
+    "door", "house", "floor", "building", "post", "po", "dist", "district", "city", "state", "pin", "pincode",
+}
+
+
+def _tokens(text: str, replacements: dict, stopwords: set) -> list:
+    text = str(text or "").lower().replace("&", " & ")
+    text = re.sub(r"['’]", "", text)
+    text = re.sub(r"[^\w\s&]", " ", text)
+    tokens = []
+    for token in text.split():
+        tokens.extend(replacements.get(token, token).split())
+    return [t for t in tokens if t not in stopwords]
+
+
+def pincode_candidates(address: str) -> list:
+    """
+    PIN-shaped numbers in an address, most likely PIN code first.
+
+    The PIN code ends an address while plot and door numbers ("Plot No 101 102")
+    come early, so later numbers rank before earlier ones, and contiguous
+    six-digit numbers before "500 033"-style pairs.
+    """
+    text = str(address or "")
+    contiguous = PINCODE_RE.findall(text)[::-1]
+    spaced = ["".join(m) for m in SPACED_PINCODE_RE.findall(text)][::-1]
+    return contiguous + [p for p in spaced if p not in contiguous]
+
+
+def extract_pincode(address: str) -> str:
+    """Return the 6-digit PIN code in an address, or "" if there is none."""
+    candidates = pincode_candidates(address)
+    return candidates[0] if candidates else ""
+
+
+def canonical_hospital_name(hospital_name: str) -> str:
+    """Lowercase, punctuation-free hospital name with plural/spelling/corporate suffix variants folded."""
+    return " ".join(_tokens(hospital_name, NAME_REPLACEMENTS, NAME_STOPWORDS))
+
+
+def locality(address: str) -> str:
+    """
+    Locality of an address: the words of its last comma-separated part
+    once the PIN code, numbers, street words and state/city names are removed
+    ("Road No 72, Jubilee Hills, Hyderabad, Telangana 500033" -> "hills jubilee").
+
+    Returns "" when no part has such words.
+    """
+    # pincode_index imports this module, so it is imported here
+    from pincode_index import strip_place_names
+
+    text = SPACED_PINCODE_RE.sub(" ", PINCODE_RE.sub(" ", str(address or "")))
+    for part in reversed(re.split(r"[,;\n]", text)):
+        words = {t for t in _tokens(strip_place_names(part), ADDRESS_REPLACEMENTS, LOCALITY_STOPWORDS) if not t.isdigit()}
+        if words:
+            return " ".join(sorted(words))
+    return ""
+
+
+def canonical_address(address: str) -> str:
+    """
+    Canonical form of an address.
+
+    When the address has a PIN code it is the PIN code followed by the
+    locality, so listings that differ in street details or city/state
+    spelling merge while different branches sharing a PIN code do not;
+    otherwise the de-duplicated, sorted address words are used so word
+    order and repeated city names do not matter.
+    """
+    pincode = extract_pincode(address)
+    if pincode:
+        return f"{pincode} {locality(address)}".strip()
+    return " ".join(sorted(set(_tokens(address, ADDRESS_REPLACEMENTS, ADDRESS_STOPWORDS))))
+
+
+def canonical_hospital_key(hospital_name: str, address: str) -> str:
+    """
+    Key shared by every spelling of the same hospital/address pair.
+
+    Rows whose keys are equal are validated with a single scrape, e.g.
+    "Apollo Hospital, Jubilee Hills" and "apollo hospitals  jubilee hills".
+    """
+    return f"{canonical_hospital_name(hospital_name)}||{canonical_address(address)}"
@@ -0,0 +1,135 @@
+import logging
+import os
+import sqlite3
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import settings  # loads config/.env before the settings below are read
+from ttl_cache import CACHE_DIR
+
+# Order in which the incremental validator processes hospitals:
+#   insertion       - input order
+#   largest_first   - most CSV doctors first (shortest overall run when workers > 1)
+#   smallest_first  - fewest CSV doctors first (fastest first results)
+#   historical      - slowest hospitals of previous runs first, using recorded timings
+SCHEDULE_POLICIES = ("insertion", "largest_first", "smallest_first", "historical")
+DEFAULT_SCHEDULE = os.getenv("VALIDATION_SCHEDULE", "insertion")
+TIMINGS_PATH = os.getenv("VALIDATION_TIMINGS_PATH", os.path.join(CACHE_DIR, "hospital_timings.sqlite3"))
+
+# Runs faster than this were served from cache or failed early and say nothing about the site
+MIN_TIMING_SECONDS = 1.0
+# Weight of the newest run in the moving average
+TIMING_SMOOTHING = 0.5
+
+# (hospital_key, csv_doctors) pairs as grouped by the validator
+ScheduledHospital = Tuple[str, list]
+
+
+class HospitalTimings:
+    """
+    Wall-clock validation time per hospital, kept across runs in SQLite.
+
+    Timings are stored per canonical hospital key and per group (the
+    canonical hospital name, which stands in for the website: branches of a
+    chain usually share one site), so a hospital that was never validated
+    can still be estimated from its siblings.
+    """
+
+    def __init__(self, path: str = TIMINGS_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS hospital_timings ("
+                "key TEXT PRIMARY KEY, grp TEXT, seconds REAL NOT NULL, runs INTEGER NOT NULL, updated_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS hospital_timings_grp ON hospital_timings (grp)")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    def record(self, hospital_key: str, seconds: float, group: str = None):
+        """Fold one run's duration into the hospital's moving average."""
+        if seconds < MIN_TIMING_SECONDS:
+            return
+        with self._connect() as conn:
+            row = conn.execute("SELECT seconds, runs FROM hospital_timings WHERE key = ?", (hospital_key,)).fetchone()
+            if row:
+                seconds = TIMING_SMOOTHING * seconds + (1 - TIMING_SMOOTHING) * row[0]
+            runs = row[1] + 1 if row else 1
+            conn.execute(
+                "INSERT OR REPLACE INTO hospital_timings (key, grp, seconds, runs, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (hospital_key, group, seconds, runs, time.time())
+            )
+
+    def load(self) -> Tuple[Dict[str, float], Dict[str, float]]:
+        """Return ({key: seconds}, {group: mean seconds}) for every recorded hospital."""
+        with self._connect() as conn:
+            by_key = dict(conn.execute("SELECT key, seconds FROM hospital_timings"))
+            by_group = dict(conn.execute(
+                "SELECT grp, AVG(seconds) FROM hospital_timings WHERE grp IS NOT NULL GROUP BY grp"
+            ))
+        return by_key, by_group
+
+
+def timing_group(hospital_key: str) -> str:
+    """Group used to share timings between hospitals (the canonical hospital name)."""
+    return hospital_key.split("||", 1)[0]
+
+
+class HospitalScheduler:
+    """
+    Orders hospitals for the incremental validator according to a scheduling policy.
+
+    Timings are recorded whatever the policy, so "historical" has data to
+    work with once a few runs have finished.
+    """
+
+    def __init__(self, policy: str = None, timings: Optional[HospitalTimings] = None):
+        policy = policy or DEFAULT_SCHEDULE
+        if policy not in SCHEDULE_POLICIES:
+            raise ValueError(f"Unknown scheduling policy '{policy}' (choose from {', '.join(SCHEDULE_POLICIES)})")
+        self.policy = policy
+        self._estimates = None
+        if timings is None:
+            try:
+                timings = HospitalTimings()
+            except Exception as e:
+                logging.warning(f"Hospital timings disabled: {e}")
+        self.timings = timings
+
+    def _estimate(self, hospital_key: str, default: float) -> float:
+        by_key, by_group = self._estimates
+        if hospital_key in by_key:
+            return by_key[hospital_key]
+        return by_group.get(timing_group(hospital_key), default)
+
+    def order(self, hospitals: Iterable[ScheduledHospital]) -> List[ScheduledHospital]:
+        """Return the hospitals in processing order (sorting is stable, so ties keep input order)."""
+        hospitals = list(hospitals)
+        if self.policy == "largest_first":
+            hospitals.sort(key=lambda h: len(h[1]), reverse=True)
+        elif self.policy == "smallest_first":
+            hospitals.sort(key=lambda h: len(h[1]))
+        elif self.policy == "historical":
+            if self._estimates is None:
+                try:
+                    self._estimates = self.timings.load() if self.timings else ({}, {})
+                except Exception as e:
+                    logging.warning(f"Could not load hospital timings: {e}")
+                    self._estimates = ({}, {})
+            # Hospitals never seen before are assumed to take an average amount of time
+            known = list(self._estimates[0].values())
+            default = sum(known) / len(known) if known else 0.0
+            hospitals.sort(key=lambda h: (self._estimate(h[0], default), len(h[1])), reverse=True)
+        return hospitals
+
+    def record(self, hospital_key: str, seconds: float):
+        """Remember how long a hospital took (only kept when a timings store is configured)."""
+        if self.timings is None:
+            return
+        try:
+            self.timings.record(hospital_key, seconds, group=timing_group(hospital_key))
+        except Exception as e:
+            logging.warning(f"Could not record timing for {hospital_key}: {e}")
@@ -0,0 +1,94 @@
+import json
+import math
+import os
+import shutil
+import tempfile
+import zlib
+from typing import Callable, Dict, Iterator, List, Tuple
+
+import settings  # loads config/.env before the settings below are read
+
+# Roughly how much input CSV ends up in one bucket; one bucket is held in memory at a time
+BUCKET_TARGET_BYTES = int(os.getenv("VALIDATION_SPOOL_BUCKET_MB", "16")) * 1024 * 1024
+MAX_BUCKETS = 4096
+
+
+class HospitalSpool:
+    """
+    On-disk spool of doctor records grouped by hospital key.
+
+    Records are appended to hash-partitioned JSON-lines bucket files while the
+    input is read in chunks, then replayed one bucket at a time. Only one
+    bucket (plus a per-hospital counter) is ever held in memory, so memory
+    stays bounded however many rows the input has.
+
+    encode/decode convert records to and from JSON-serialisable values
+    (records are stored as-is when they are omitted).
+    """
+
+    def __init__(self, num_buckets: int = 64, spool_dir: str = None,
+                 encode: Callable = None, decode: Callable = None):
+        self.num_buckets = max(1, min(num_buckets, MAX_BUCKETS))
+        self.encode = encode
+        self.decode = decode
+        self.dir = tempfile.mkdtemp(prefix="hospital_spool_", dir=spool_dir)
+        self.hospital_counts: Dict[str, int] = {}
+        self.record_count = 0
+
+    @classmethod
+    def for_file(cls, input_path: str, spool_dir: str = None, **kwargs) -> "HospitalSpool":
+        """Size the number of buckets from the input file so each bucket stays near BUCKET_TARGET_BYTES."""
+        size = os.path.getsize(input_path)
+        return cls(num_buckets=math.ceil(size / BUCKET_TARGET_BYTES), spool_dir=spool_dir, **kwargs)
+
+    def _bucket_path(self, bucket: int) -> str:
+        return os.path.join(self.dir, f"bucket_{bucket:04d}.jsonl")
+
+    def add(self, hospitals: Dict[str, List[Dict]]):
+        """Append a grouped chunk ({hospital_key: [records]}) to the bucket files."""
+        by_bucket: Dict[int, List[str]] = {}
+        for hospital_key, records in hospitals.items():
+            bucket = zlib.crc32(hospital_key.encode("utf-8")) % self.num_buckets
+            encoded = [self.encode(r) for r in records] if self.encode else records
+            by_bucket.setdefault(bucket, []).append(json.dumps([hospital_key, encoded], ensure_ascii=False))
+            self.hospital_counts[hospital_key] = self.hospital_counts.get(hospital_key, 0) + len(records)
+            self.record_count += len(records)
+
+        for bucket, lines in by_bucket.items():
+            with open(self._bucket_path(bucket), "a", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+
+    def iter_buckets(self) -> Iterator[Dict[str, List[Dict]]]:
+        """Yield one {hospital_key: [records]} dict per bucket, hospitals in first-seen order."""
+        for bucket in range(self.num_buckets):
+            path = self._bucket_path(bucket)
+            if not os.path.exists(path):
+                continue
+            hospitals: Dict[str, List[Dict]] = {}
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    hospital_key, records = json.loads(line)
+                    if self.decode:
+                        records = [self.decode(r) for r in records]
+                    hospitals.setdefault(hospital_key, []).extend(records)
+            yield hospitals
+
+    def items(self) -> Iterator[Tuple[str, List[Dict]]]:
+        """Iterate (hospital_key, records) pairs like dict.items(), loading one bucket at a time."""
+        for hospitals in self.iter_buckets():
+            yield from hospitals.items()
+
+    def __len__(self) -> int:
+        return len(self.hospital_counts)
+
+    def close(self):
+        """Delete the spool directory."""
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,134 @@
+import asyncio
+import os
+import random
+import threading
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import settings  # loads config/.env before the settings below are read
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+# Timeouts (seconds) for geocoding providers; a hung provider fails instead of freezing a worker
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "20"))
+# Retries for connection errors and throttled/5xx responses, with jittered exponential backoff
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "3"))
+HTTP_BACKOFF_SECONDS = float(os.getenv("HTTP_BACKOFF_SECONDS", "0.5"))
+HTTP_BACKOFF_MAX_SECONDS = 10.0
+# Keep-alive connections kept per provider host
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "20"))
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+DEFAULT_TIMEOUT = (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)
+
+
+def backoff_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff for the given retry attempt (0-based)."""
+    return random.uniform(0, min(HTTP_BACKOFF_MAX_SECONDS, HTTP_BACKOFF_SECONDS * (2 ** attempt)))
+
+
+class CappedRetry(Retry):
+    """Retry that honours Retry-After headers but never sleeps longer than HTTP_BACKOFF_MAX_SECONDS."""
+
+    def get_retry_after(self, response) -> Optional[float]:
+        retry_after = super().get_retry_after(response)
+        return None if retry_after is None else min(retry_after, HTTP_BACKOFF_MAX_SECONDS)
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """
+    Process-wide requests session with keep-alive pooling and retries.
+
+    Shared by all hospital workers so repeated Mappls/Google calls reuse
+    TCP+TLS connections instead of handshaking on every request.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            retry = CappedRetry(
+                total=HTTP_MAX_RETRIES,
+                connect=HTTP_MAX_RETRIES,
+                read=HTTP_MAX_RETRIES,
+                status=HTTP_MAX_RETRIES,
+                backoff_factor=HTTP_BACKOFF_SECONDS,
+                backoff_max=HTTP_BACKOFF_MAX_SECONDS,
+                backoff_jitter=HTTP_BACKOFF_SECONDS,
+                status_forcelist=RETRY_STATUSES,
+                allowed_methods=frozenset({"GET", "POST"}),
+                respect_retry_after_header=True,
+                raise_on_status=False,
+            )
+            adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE, max_retries=retry)
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+def http_get(url: str, **kwargs) -> requests.Response:
+    """GET through the shared session (default connect/read timeouts applied)."""
+    kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+    return get_session().get(url, **kwargs)
+
+
+def http_post(url: str, **kwargs) -> requests.Response:
+    """POST through the shared session (default connect/read timeouts applied)."""
+    kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+    return get_session().post(url, **kwargs)
+
+
+def http_probe(url: str, timeout: float = HTTP_CONNECT_TIMEOUT) -> requests.Response:
+    """Single GET without retries, for checking that a URL still answers (the body is not read)."""
+    response = requests.get(url, timeout=timeout, allow_redirects=True, stream=True)
+    response.close()
+    return response
+
+
+def async_http_client(**kwargs) -> "httpx.AsyncClient":
+    """
+    Pooled httpx.AsyncClient with the same timeouts as the sync session.
+
+    Use it as an async context manager (one client per event loop) together
+    with async_request() for retries.
+    """
+    if httpx is None:
+        raise ImportError("httpx is required for async HTTP (pip install httpx)")
+    kwargs.setdefault("timeout", httpx.Timeout(HTTP_READ_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT))
+    kwargs.setdefault("limits", httpx.Limits(max_connections=HTTP_POOL_SIZE, max_keepalive_connections=HTTP_POOL_SIZE))
+    return httpx.AsyncClient(**kwargs)
+
+
+async def async_request(client: "httpx.AsyncClient", method: str, url: str,
+                        max_retries: Optional[int] = None, **kwargs) -> "httpx.Response":
+    """
+    Send a request with bounded, jittered retries on transport errors and RETRY_STATUSES.
+
+    The last response is returned once retries run out; the last transport
+    error is raised if no response was ever received.
+    """
+    max_retries = HTTP_MAX_RETRIES if max_retries is None else max_retries
+    for attempt in range(max_retries + 1):
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.TransportError:
+            if attempt == max_retries:
+                raise
+        else:
+            if response.status_code not in RETRY_STATUSES or attempt == max_retries:
+                return response
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                await asyncio.sleep(min(float(retry_after), HTTP_BACKOFF_MAX_SECONDS))
+                continue
+        await asyncio.sleep(backoff_delay(attempt))
@@ -0,0 +1,391 @@
+"""
+Local PIN code checks for Indian addresses.
+
+Two levels of detail are available:
+- PREFIX_STATES, a built-in table of the states served by each 2-digit PIN
+  prefix (always available);
+- an optional binary index of every PIN code with its district and state,
+  built from the India Post all-India pincode directory CSV and read through
+  mmap, so lookups need no parsing or per-process copy of the data:
+
+    python pincode_index.py all_india_pincode.csv data/pincodes.idx
+
+prescreen_address() uses whichever is available to reject addresses whose
+PIN code cannot exist or belongs to a different state than the address names,
+before any geocoding API call is made.
+"""
+import argparse
+import json
+import logging
+import mmap
+import os
+import re
+import struct
+import threading
+from typing import Dict, FrozenSet, Optional, Tuple
+
+import pandas as pd
+
+import settings  # loads config/.env before the settings below are read
+from hospital_keys import extract_pincode, pincode_candidates
+
+PINCODE_INDEX_PATH = os.getenv("PINCODE_INDEX_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "pincodes.idx"))
+
+# States/UTs served by each 2-digit PIN prefix (90-99 are Army Postal Service PINs)
+PREFIX_STATES = {
+    "11": {"delhi"},
+    "12": {"haryana"},
+    "13": {"haryana", "punjab"},
+    "14": {"punjab"},
+    "15": {"punjab"},
+    "16": {"chandigarh", "punjab", "haryana"},
+    "17": {"himachal pradesh"},
+    "18": {"jammu and kashmir"},
+    "19": {"jammu and kashmir", "ladakh"},
+    "20": {"uttar pradesh"},
+    "21": {"uttar pradesh"},
+    "22": {"uttar pradesh"},
+    "23": {"uttar pradesh"},
+    "24": {"uttar pradesh", "uttarakhand"},
+    "25": {"uttar pradesh"},
+    "26": {"uttar pradesh", "uttarakhand"},
+    "27": {"uttar pradesh"},
+    "28": {"uttar pradesh"},
+    "30": {"rajasthan"},
+    "31": {"rajasthan"},
+    "32": {"rajasthan"},
+    "33": {"rajasthan"},
+    "34": {"rajasthan"},
+    "36": {"gujarat"},
+    "37": {"gujarat"},
+    "38": {"gujarat"},
+    "39": {"gujarat", "dadra and nagar haveli and daman and diu"},
+    "40": {"maharashtra", "goa"},
+    "41": {"maharashtra"},
+    "42": {"maharashtra"},
+    "43": {"maharashtra"},
+    "44": {"maharashtra"},
+    "45": {"madhya pradesh"},
+    "46": {"madhya pradesh"},
+    "47": {"madhya pradesh"},
+    "48": {"madhya pradesh"},
+    "49": {"chhattisgarh"},
+    "50": {"telangana"},
+    "51": {"andhra pradesh"},
+    "52": {"andhra pradesh"},
+    "53": {"andhra pradesh", "puducherry"},
+    "56": {"karnataka"},
+    "57": {"karnataka"},
+    "58": {"karnataka"},
+    "59": {"karnataka"},
+    "60": {"tamil nadu", "puducherry"},
+    "61": {"tamil nadu"},
+    "62": {"tamil nadu"},
+    "63": {"tamil nadu"},
+    "64": {"tamil nadu"},
+    "67": {"kerala", "puducherry"},
+    "68": {"kerala", "lakshadweep"},
+    "69": {"kerala"},
+    "70": {"west bengal"},
+    "71": {"west bengal"},
+    "72": {"west bengal"},
+    "73": {"west bengal", "sikkim"},
+    "74": {"west bengal", "andaman and nicobar islands"},
+    "75": {"odisha"},
+    "76": {"odisha"},
+    "77": {"odisha"},
+    "78": {"assam"},
+    "79": {"arunachal pradesh", "assam", "manipur", "meghalaya", "mizoram", "nagaland", "tripura"},
+    "80": {"bihar"},
+    "81": {"bihar", "jharkhand"},
+    "82": {"bihar", "jharkhand"},
+    "83": {"jharkhand"},
+    "84": {"bihar"},
+    "85": {"bihar"},
+}
+ARMY_POSTAL_PREFIX = "9"
+
+# Alternative spellings of state names (as seen in addresses and in the India Post directory)
+STATE_ALIASES = {
+    "orissa": "odisha",
+    "pondicherry": "puducherry",
+    "uttaranchal": "uttarakhand",
+    "chattisgarh": "chhattisgarh",
+    "jammu kashmir": "jammu and kashmir",
+    "new delhi": "delhi",
+    "nct of delhi": "delhi",
+    "andaman nicobar islands": "andaman and nicobar islands",
+    "dadra and nagar haveli": "dadra and nagar haveli and daman and diu",
+    "daman and diu": "dadra and nagar haveli and daman and diu",
+}
+# Cities that unambiguously name their state
+CITY_STATES = {
+    "hyderabad": "telangana", "secunderabad": "telangana", "warangal": "telangana",
+    "visakhapatnam": "andhra pradesh", "vijayawada": "andhra pradesh", "guntur": "andhra pradesh",
+    "kurnool": "andhra pradesh", "tirupati": "andhra pradesh", "nellore": "andhra pradesh",
+    "chennai": "tamil nadu", "coimbatore": "tamil nadu", "madurai": "tamil nadu",
+    "bengaluru": "karnataka", "bangalore": "karnataka", "mysuru": "karnataka", "mysore": "karnataka",
+    "mumbai": "maharashtra", "pune": "maharashtra", "nagpur": "maharashtra", "nashik": "maharashtra",
+    "kolkata": "west bengal", "kochi": "kerala", "thiruvananthapuram": "kerala", "kozhikode": "kerala",
+    "ahmedabad": "gujarat", "surat": "gujarat", "vadodara": "gujarat", "jaipur": "rajasthan",
+    "lucknow": "uttar pradesh", "kanpur": "uttar pradesh", "noida": "uttar pradesh", "gurugram": "haryana",
+    "gurgaon": "haryana", "bhopal": "madhya pradesh", "indore": "madhya pradesh", "patna": "bihar",
+    "ranchi": "jharkhand", "bhubaneswar": "odisha", "guwahati": "assam", "raipur": "chhattisgarh",
+    "ludhiana": "punjab", "amritsar": "punjab", "dehradun": "uttarakhand", "srinagar": "jammu and kashmir",
+}
+# States split off since PIN codes were assigned; legacy addresses may still name the parent state
+STATE_SUCCESSORS = {
+    "andhra pradesh": {"telangana"},
+    "bihar": {"jharkhand"},
+    "madhya pradesh": {"chhattisgarh"},
+    "uttar pradesh": {"uttarakhand"},
+    "jammu and kashmir": {"ladakh"},
+}
+INDIA_KEYWORDS = {"india", "bharat"}
+# Countries that also use 6-digit postcodes, so a bare 6-digit number does not mean India
+SIX_DIGIT_POSTCODE_COUNTRIES = {"singapore", "china", "russia", "kazakhstan", "belarus", "vietnam", "colombia",
+                                "ecuador", "kyrgyzstan", "tajikistan", "turkmenistan", "uzbekistan", "romania"}
+
+ALL_STATES = frozenset(state for states in PREFIX_STATES.values() for state in states)
+
+# PIN codes never start with 0; pincode_candidates() skips such numbers
+ZERO_PINCODE_RE = re.compile(r"(?<!\d)0\d{2}\s?\d{3}(?!\d)")
+
+INDEX_MAGIC = b"PINIDX1\0"
+INDEX_HEADER = struct.Struct("<8sII")   # magic, record count, names block offset
+INDEX_RECORD = struct.Struct("<IHH")    # pincode, district name id, state name id
+
+
+def normalize_place(text: str) -> str:
+    """Lowercase, punctuation-free place name ("&" read as "and") with state aliases resolved."""
+    text = re.sub(r"[^\w\s]", " ", str(text or "").lower().replace("&", " and "))
+    text = re.sub(r"\s+", " ", text).strip()
+    return STATE_ALIASES.get(text, text)
+
+
+_STATE_PATTERN = re.compile(r"\b(" + "|".join(sorted(
+    (re.escape(name) for name in list(ALL_STATES) + list(STATE_ALIASES) + list(CITY_STATES)),
+    key=len, reverse=True)) + r")\b")
+
+
+def named_states(address: str) -> FrozenSet[str]:
+    """States an address names, directly, by an alias, or through a well-known city."""
+    found = set()
+    for match in _STATE_PATTERN.finditer(normalize_place(address)):
+        name = match.group(1)
+        found.add(CITY_STATES.get(name) or STATE_ALIASES.get(name, name))
+    return frozenset(found)
+
+
+def strip_place_names(address: str) -> str:
+    """normalize_place(address) with states, their aliases and well-known cities removed."""
+    return re.sub(r"\s+", " ", _STATE_PATTERN.sub(" ", normalize_place(address))).strip()
+
+
+class PincodeIndex:
+    """
+    Read-only pincode -> (district, state) index stored as sorted fixed-size records.
+
+    The file is memory-mapped and binary searched in place, so opening it is
+    instant and every worker (thread or process) shares the OS page cache.
+    Build one with build_pincode_index().
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count, names_offset = INDEX_HEADER.unpack_from(self._mmap, 0)
+        if magic != INDEX_MAGIC:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a pincode index")
+        self.names = json.loads(self._mmap[names_offset:].decode("utf-8"))
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _pincode_at(self, i: int) -> int:
+        return INDEX_RECORD.unpack_from(self._mmap, INDEX_HEADER.size + i * INDEX_RECORD.size)[0]
+
+    def lookup(self, pincode: str) -> Optional[Tuple[str, str]]:
+        """(district, state) of a 6-digit PIN code, or None if it does not exist."""
+        if not pincode or not pincode.isdigit():
+            return None
+        target = int(pincode)
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._pincode_at(mid) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo == self.count:
+            return None
+        code, district_id, state_id = INDEX_RECORD.unpack_from(self._mmap, INDEX_HEADER.size + lo * INDEX_RECORD.size)
+        if code != target:
+            return None
+        return self.names[district_id], self.names[state_id]
+
+    def close(self):
+        self._mmap.close()
+
+
+def build_pincode_index(csv_path: str, output_path: str) -> int:
+    """
+    Build a PincodeIndex file from the India Post all-India pincode directory CSV.
+
+    The CSV needs pincode, district ("district"/"districtname") and state
+    ("statename"/"state") columns; the first row of each PIN code is kept.
+
+    Returns:
+        Number of PIN codes written
+    """
+    df = pd.read_csv(csv_path, dtype=str)
+    columns = {c.lower().replace(" ", "").replace("_", ""): c for c in df.columns}
+    try:
+        pin_col = columns["pincode"]
+        district_col = columns.get("districtname") or columns["district"]
+        state_col = columns.get("statename") or columns["state"]
+    except KeyError as e:
+        raise ValueError(f"{csv_path} has no {e} column") from e
+
+    df = df[[pin_col, district_col, state_col]].dropna(subset=[pin_col])
+    df[pin_col] = df[pin_col].str.strip()
+    df = df[df[pin_col].str.fullmatch(r"[1-9]\d{5}")].drop_duplicates(subset=[pin_col])
+    df = df.sort_values(pin_col)
+
+    names, name_ids = [], {}
+
+    def name_id(text):
+        text = normalize_place(text)
+        if text not in name_ids:
+            name_ids[text] = len(names)
+            names.append(text)
+        return name_ids[text]
+
+    records = [INDEX_RECORD.pack(int(pin), name_id(district), name_id(state))
+               for pin, district, state in df.itertuples(index=False)]
+    names_offset = INDEX_HEADER.size + len(records) * INDEX_RECORD.size
+
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    tmp_path = f"{output_path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(INDEX_HEADER.pack(INDEX_MAGIC, len(records), names_offset))
+        f.write(b"".join(records))
+        f.write(json.dumps(names, ensure_ascii=False).encode("utf-8"))
+    os.replace(tmp_path, output_path)
+    return len(records)
+
+
+_pincode_index = None
+_pincode_index_loaded = False
+_pincode_index_lock = threading.Lock()
+
+
+def get_pincode_index() -> Optional[PincodeIndex]:
+    """Process-wide PincodeIndex from PINCODE_INDEX_PATH, or None if no index is installed."""
+    global _pincode_index, _pincode_index_loaded
+    with _pincode_index_lock:
+        if not _pincode_index_loaded:
+            _pincode_index_loaded = True
+            if os.path.exists(PINCODE_INDEX_PATH):
+                try:
+                    _pincode_index = PincodeIndex(PINCODE_INDEX_PATH)
+                    logging.info(f"Loaded pincode index with {len(_pincode_index)} PIN codes")
+                except Exception as e:
+                    logging.warning(f"Pincode index {PINCODE_INDEX_PATH} unusable: {e}")
+        return _pincode_index
+
+
+def pincode_states(pincode: str) -> Optional[FrozenSet[str]]:
+    """
+    States a PIN code can belong to: empty for Army Postal Service PINs,
+    None if the PIN code does not exist.
+    """
+    if not pincode:
+        return None
+    if pincode.startswith(ARMY_POSTAL_PREFIX):
+        return frozenset()
+    index = get_pincode_index()
+    if index is not None:
+        entry = index.lookup(pincode)
+        return frozenset({entry[1]}) if entry else None
+    states = PREFIX_STATES.get(pincode[:2])
+    return frozenset(states) if states else None
+
+
+def states_compatible(named: FrozenSet[str], states: FrozenSet[str]) -> bool:
+    """True if any state an address names can hold a PIN code in `states`."""
+    if not named or not states:
+        return True
+    return any(state in states or STATE_SUCCESSORS.get(state, set()) & states for state in named)
+
+
+def is_indian_address(address: str) -> bool:
+    """
+    True if the address names India, an Indian state/UT or a major Indian city,
+    or carries a valid Indian PIN code and names no other 6-digit-postcode country.
+    """
+    text = normalize_place(address)
+    words = set(text.split())
+    if words & INDIA_KEYWORDS or named_states(address):
+        return True
+    if words & SIX_DIGIT_POSTCODE_COUNTRIES:
+        return False
+    return any(pincode_states(pincode) is not None for pincode in pincode_candidates(address))
+
+
+def prescreen_address(address: str) -> Dict:
+    """
+    Check an Indian address's PIN code locally, before any geocoding call.
+
+    Returns:
+        Dictionary with:
+        - plausible: False only when the address certainly cannot be verified
+        - pincode, district, state: what the index knows about the PIN code ("" if unknown)
+        - reason: Why the address was rejected (empty when plausible)
+    """
+    candidates = pincode_candidates(address)
+    check = {"plausible": True, "pincode": candidates[0] if candidates else "", "district": "", "state": "", "reason": ""}
+    if not candidates:
+        zero_pincode = ZERO_PINCODE_RE.search(str(address or ""))
+        if zero_pincode and is_indian_address(address):
+            check.update(plausible=False, reason=f"PIN code {zero_pincode.group()} does not exist")
+        return check
+    if not is_indian_address(address):
+        return check
+
+    # Plot/door numbers can look like PIN codes: only reject when no candidate is a real PIN code
+    known = [(pincode, pincode_states(pincode)) for pincode in candidates]
+    known = [(pincode, states) for pincode, states in known if states is not None]
+    if not known:
+        check.update(plausible=False, reason=f"PIN code {candidates[0]} does not exist")
+        return check
+
+    named = named_states(address)
+    pincode, states = next(((p, s) for p, s in known if states_compatible(named, s)), known[0])
+    check["pincode"] = pincode
+    index = get_pincode_index()
+    if index is not None and not pincode.startswith(ARMY_POSTAL_PREFIX):
+        entry = index.lookup(pincode)
+        if entry:
+            check["district"], check["state"] = entry
+    if not states_compatible(named, states):
+        check.update(plausible=False, reason=(
+            f"PIN code {pincode} belongs to {' / '.join(sorted(states)).title()}, "
+            f"not {' / '.join(sorted(named)).title()}"))
+    return check
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input_csv", help="India Post all-India pincode directory CSV")
+    parser.add_argument("output", nargs="?", default=PINCODE_INDEX_PATH, help="Index file to write")
+    args = parser.parse_args()
+
+    count = build_pincode_index(args.input_csv, args.output)
+    print(f"✓ Wrote {count} PIN codes to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
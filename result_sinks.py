@@ -0,0 +1,196 @@
+import csv
+import glob
+import os
+import time
+from typing import Dict, List
+
+import settings  # loads config/.env before the settings below are read
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+# Flush the output file after this many hospitals, fsync at most every N seconds (0 = on every flush)
+DEFAULT_FLUSH_EVERY = int(os.getenv("VALIDATION_FLUSH_EVERY", "1"))
+DEFAULT_FSYNC_SECONDS = float(os.getenv("VALIDATION_FSYNC_SECONDS", "5"))
+# Parquet layout: rows per row group, and rows per part file before a new file is started
+PARQUET_ROW_GROUP_ROWS = int(os.getenv("VALIDATION_PARQUET_ROW_GROUP_ROWS", "10000"))
+PARQUET_ROWS_PER_FILE = int(os.getenv("VALIDATION_PARQUET_ROWS_PER_FILE", "500000"))
+# A part file only becomes readable once closed: on flush, parts open longer than this are closed
+PARQUET_ROLL_SECONDS = float(os.getenv("VALIDATION_PARQUET_ROLL_SECONDS", "60"))
+
+
+class CSVResultSink:
+    """
+    Long-lived CSV writer for validation results.
+
+    Keeps the output file open for the whole run and writes rows with a plain
+    csv.DictWriter instead of building a DataFrame per hospital. Missing
+    columns are written as "" and extra keys are ignored.
+    """
+
+    def __init__(self, path: str, columns: List[str], append: bool = False,
+                 flush_every: int = None, fsync_seconds: float = None):
+        self.path = path
+        self.columns = list(columns)
+        self.flush_every = max(1, flush_every or DEFAULT_FLUSH_EVERY)
+        self.fsync_seconds = DEFAULT_FSYNC_SECONDS if fsync_seconds is None else fsync_seconds
+        self.rows_written = 0
+        self._batches_since_flush = 0
+        self._last_fsync = time.monotonic()
+
+        write_header = not append or not os.path.exists(path) or os.path.getsize(path) == 0
+        self._file = open(path, "a" if append else "w", newline="", encoding="utf-8")
+        self._writer = csv.DictWriter(self._file, fieldnames=self.columns, restval="", extrasaction="ignore")
+        if write_header:
+            self._writer.writeheader()
+            self.flush(force_sync=True)
+
+    def write_rows(self, rows: List[Dict]):
+        """Write one hospital's results; flushes/fsyncs according to the configured cadence."""
+        self._writer.writerows(rows)
+        self.rows_written += len(rows)
+        self._batches_since_flush += 1
+        if self._batches_since_flush >= self.flush_every:
+            self.flush()
+
+    def flush(self, force_sync: bool = False):
+        self._file.flush()
+        self._batches_since_flush = 0
+        now = time.monotonic()
+        if force_sync or now - self._last_fsync >= self.fsync_seconds:
+            os.fsync(self._file.fileno())
+            self._last_fsync = now
+
+    def close(self):
+        if self._file and not self._file.closed:
+            self.flush(force_sync=True)
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class ParquetResultSink:
+    """
+    Columnar (Arrow/Parquet) sink for validation results.
+
+    Results are written under <root_dir>/session=<session_id>/ as part files.
+    Rows are buffered and written as a row group every row_group_rows rows
+    (and on flush/close). A part file can only be read once it is closed, so
+    a part is closed after rows_per_file rows, and on the first flush after
+    it has been open roll_seconds. Results therefore become readable within
+    about roll_seconds of their hospital finishing, while a long session is
+    still running. All columns are stored as strings, matching the CSV output.
+    """
+
+    def __init__(self, root_dir: str, session_id: str, columns: List[str],
+                 row_group_rows: int = None, rows_per_file: int = None, roll_seconds: float = None):
+        if pa is None:
+            raise ImportError("pyarrow is required for Parquet output (pip install pyarrow)")
+        self.columns = list(columns)
+        self.schema = pa.schema([(c, pa.string()) for c in self.columns])
+        self.row_group_rows = row_group_rows or PARQUET_ROW_GROUP_ROWS
+        self.rows_per_file = rows_per_file or PARQUET_ROWS_PER_FILE
+        self.roll_seconds = PARQUET_ROLL_SECONDS if roll_seconds is None else roll_seconds
+        self.dir = os.path.join(root_dir, f"session={session_id}")
+        self.rows_written = 0
+
+        # A session's parts are always rewritten from scratch (on resume they are rebuilt from the journal);
+        # only our own part files are removed, anything else in the directory is left alone
+        os.makedirs(self.dir, exist_ok=True)
+        for path in glob.glob(os.path.join(self.dir, "part-*.parquet")):
+            os.remove(path)
+
+        self._buffer: List[Dict] = []
+        self._writer = None
+        self._part = 0
+        self._rows_in_part = 0
+        self._part_opened = 0.0
+
+    def write_rows(self, rows: List[Dict]):
+        self._buffer.extend(rows)
+        if len(self._buffer) >= self.row_group_rows:
+            self._write_buffer()
+
+    def _write_buffer(self):
+        if not self._buffer:
+            return
+        if self._writer is None:
+            path = os.path.join(self.dir, f"part-{self._part:05d}.parquet")
+            self._writer = pq.ParquetWriter(path, self.schema)
+            self._part_opened = time.monotonic()
+        data = {
+            c: [None if r.get(c) is None else str(r.get(c)) for r in self._buffer]
+            for c in self.columns
+        }
+        self._writer.write_table(pa.table(data, schema=self.schema))
+        self.rows_written += len(self._buffer)
+        self._rows_in_part += len(self._buffer)
+        self._buffer = []
+        if self._rows_in_part >= self.rows_per_file:
+            self._close_part()
+
+    def _close_part(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+            self._part += 1
+            self._rows_in_part = 0
+
+    def flush(self, force_sync: bool = False):
+        """Write buffered rows as a row group, closing the part file if it has been open roll_seconds."""
+        self._write_buffer()
+        if self._writer is not None and time.monotonic() - self._part_opened >= self.roll_seconds:
+            self._close_part()
+
+    def close(self):
+        self._write_buffer()
+        self._close_part()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class MultiSink:
+    """Fan result rows out to several sinks (e.g. CSV + Parquet)."""
+
+    def __init__(self, sinks: List):
+        self.sinks = sinks
+
+    def write_rows(self, rows: List[Dict]):
+        for sink in self.sinks:
+            sink.write_rows(rows)
+
+    def flush(self, force_sync: bool = False):
+        for sink in self.sinks:
+            sink.flush(force_sync=force_sync)
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
+
+
+def read_parquet_results(root_dir: str, session_id: str = None, columns: List[str] = None):
+    """
+    Load Parquet results as a DataFrame, optionally for one session and a subset of columns.
+    Only the requested columns are read from disk.
+    """
+    import pandas as pd
+    if pq is None:
+        raise ImportError("pyarrow is required for Parquet output (pip install pyarrow)")
+    pattern = f"session={session_id}" if session_id else "session=*"
+    files = sorted(glob.glob(os.path.join(root_dir, pattern, "part-*.parquet")))
+    if not files:
+        return pd.DataFrame(columns=columns or [])
+    tables = [pq.read_table(f, columns=columns) for f in files]
+    return pa.concat_tables(tables).to_pandas()
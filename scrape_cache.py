@@ -0,0 +1,56 @@
+import logging
+import os
+from typing import Dict, Optional
+
+import settings  # loads config/.env before the settings below are read
+from hospital_keys import canonical_hospital_key
+from ttl_cache import CACHE_DIR, SQLiteTTLCache
+
+# How long a scraped doctor roster is reused before the hospital is scraped again (0 disables the cache)
+SCRAPE_CACHE_TTL_HOURS = float(os.getenv("SCRAPE_CACHE_TTL_HOURS", "168"))
+SCRAPE_CACHE_PATH = os.getenv("SCRAPE_CACHE_PATH", os.path.join(CACHE_DIR, "scrape_cache.sqlite3"))
+
+
+class ScrapeCache:
+    """Disk-backed cache of successful scraping.main results, keyed by canonical hospital name + address."""
+
+    def __init__(self, path: str = SCRAPE_CACHE_PATH, ttl_hours: float = SCRAPE_CACHE_TTL_HOURS):
+        self.ttl_seconds = ttl_hours * 3600
+        self.store = SQLiteTTLCache(path, table="scrape_results") if self.enabled else None
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def get(self, hospital_name: str, address: str) -> Optional[Dict]:
+        if not self.enabled:
+            return None
+        try:
+            return self.store.get(canonical_hospital_key(hospital_name, address), max_age=self.ttl_seconds)
+        except Exception as e:
+            logging.warning(f"Scrape cache read failed: {e}")
+            return None
+
+    def put(self, hospital_name: str, address: str, scrape_result: Dict):
+        """Cache a scrape result; only complete, verified, error-free results with doctors are kept."""
+        if not self.enabled:
+            return
+        if not scrape_result.get("verified") or scrape_result.get("error") or not scrape_result.get("doctors"):
+            return
+        if scrape_result.get("partial"):
+            return
+        try:
+            self.store.set(canonical_hospital_key(hospital_name, address), scrape_result, ttl=self.ttl_seconds)
+        except Exception as e:
+            logging.warning(f"Scrape cache write failed: {e}")
+
+
+_scrape_cache = None
+
+
+def get_scrape_cache() -> ScrapeCache:
+    """Process-wide ScrapeCache (created on first use)."""
+    global _scrape_cache
+    if _scrape_cache is None:
+        _scrape_cache = ScrapeCache()
+    return _scrape_cache
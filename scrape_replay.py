@@ -0,0 +1,115 @@
+import hashlib
+import json
+import logging
+import os
+import re
+from typing import Callable, Dict, Optional
+
+import settings  # loads config/.env before the settings below are read
+from hospital_keys import canonical_hospital_key
+
+# Replay recorded scraping.main results from this directory instead of scraping live
+REPLAY_DIR = os.getenv("VALIDATION_REPLAY_DIR") or None
+# Save every live scraping.main result to this directory (to replay later)
+RECORD_DIR = os.getenv("VALIDATION_RECORD_DIR") or None
+
+# Used for hospitals without their own fixture, so one file can drive a large synthetic run
+DEFAULT_FIXTURE = "_default.json"
+
+
+def fixture_name(hospital_name: str, address: str) -> str:
+    """File name of the fixture for a hospital: readable slug plus a hash of the canonical key."""
+    key = canonical_hospital_key(hospital_name, address)
+    slug = re.sub(r"[^a-z0-9]+", "-", key.split("||", 1)[0])[:60].strip("-") or "hospital"
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:12]
+    return f"{slug}-{digest}.json"
+
+
+class ScrapeFixtures:
+    """
+    Directory of recorded scraping.main results, one JSON file per hospital.
+
+    Each file holds {"hospital_name", "address", "key", "result"}, where
+    result is exactly what scraping.main returned.
+    """
+
+    def __init__(self, fixture_dir: str):
+        self.dir = fixture_dir
+
+    def path_for(self, hospital_name: str, address: str) -> str:
+        return os.path.join(self.dir, fixture_name(hospital_name, address))
+
+    def load(self, hospital_name: str, address: str) -> Optional[Dict]:
+        """Recorded result for a hospital (falling back to DEFAULT_FIXTURE), or None."""
+        for path in (self.path_for(hospital_name, address), os.path.join(self.dir, DEFAULT_FIXTURE)):
+            if os.path.exists(path):
+                with open(path, "r", encoding="utf-8") as f:
+                    return json.load(f)["result"]
+        return None
+
+    def save(self, hospital_name: str, address: str, result: Dict):
+        os.makedirs(self.dir, exist_ok=True)
+        path = self.path_for(hospital_name, address)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "hospital_name": hospital_name,
+                "address": address,
+                "key": canonical_hospital_key(hospital_name, address),
+                "result": result
+            }, f, ensure_ascii=False, indent=2, default=str)
+        os.replace(tmp_path, path)
+
+
+class ReplayScraper:
+    """Drop-in for scraping.main that returns recorded results and never touches the network."""
+
+    def __init__(self, fixture_dir: str):
+        self.fixtures = ScrapeFixtures(fixture_dir)
+
+    def __call__(self, hospital_name: str, address: str, **kwargs) -> Dict:
+        result = self.fixtures.load(hospital_name, address)
+        if result is None:
+            return {
+                "verified": False,
+                "hospital_name": hospital_name,
+                "hospital_address": address,
+                "doctors": [],
+                "address_confidence_score": 0.0,
+                "error": "No recorded scrape for this hospital"
+            }
+        return result
+
+
+class RecordingScraper:
+    """Wraps a live scraper and saves each result as a fixture for later replay."""
+
+    def __init__(self, scraper: Callable, fixture_dir: str):
+        self.scraper = scraper
+        self.fixtures = ScrapeFixtures(fixture_dir)
+
+    def __call__(self, hospital_name: str, address: str, **kwargs) -> Dict:
+        result = self.scraper(hospital_name, address, **kwargs)
+        try:
+            self.fixtures.save(hospital_name, address, result)
+        except Exception as e:
+            logging.warning(f"Could not record scrape fixture for {hospital_name}: {e}")
+        return result
+
+
+def get_scraper(live_scraper: Callable, replay_dir: str = None, record_dir: str = None) -> Optional[Callable]:
+    """
+    Scraper to use instead of the live one, or None to scrape live (with the scrape cache).
+
+    Args:
+        live_scraper: The live scraping.main entry point (only called when recording)
+        replay_dir: Fixture directory to replay from (defaults to VALIDATION_REPLAY_DIR)
+        record_dir: Fixture directory to record into (defaults to VALIDATION_RECORD_DIR)
+    """
+    replay_dir = replay_dir or REPLAY_DIR
+    record_dir = record_dir or RECORD_DIR
+    if replay_dir:
+        return ReplayScraper(replay_dir)
+    if record_dir:
+        return RecordingScraper(live_scraper, record_dir)
+    return None
@@ -1,10 +1,19 @@
-import requests
+import asyncio
+import contextlib
 import json
 import sys
 import os
 import re
+import threading
+import time
 import dotenv
 from difflib import SequenceMatcher
+import settings  # loads config/.env before the settings below are read
+from http_client import http_get, http_post, http_probe, async_request
+from geocode_cache import get_geocode_cache
+from pincode_index import is_indian_address, prescreen_address
+from address_matcher import AddressMatcher
+from site_cache import get_site_cache
 dotenv.load_dotenv(os.path.join(os.path.dirname(__file__), '../config/.env'))
 
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -14,6 +23,7 @@ if browser_agent_path not in sys.path:
 
 try:
     from new_orchestation import run_agent
+    from hospital_budget import hospital_budget, budget_exhausted, budget_timeout_ms
 except ImportError:
     print(f"Error: Could not import 'run_agent' from {browser_agent_path}")
     sys.exit(1)
@@ -21,111 +31,212 @@ except ImportError:
 
 def is_address_in_india(address):
     keywords = ["india", "andhra", "pradesh", "telangana", "delhi", "mumbai", "karnataka", "tamil", "nadu", "kerala", "bengaluru", "chennai", "hyderabad", "kurnool"]
-    return any(k in address.lower() for k in keywords)
-
-
-def get_mappls_token(client_id, client_secret):
-    url = "https://outpost.mapmyindia.com/api/security/oauth/token"
+    return any(k in address.lower() for k in keywords) or is_indian_address(address)
+
+
+# Provider base URLs (point them at benchmarks/fake_geocoder.py to test the geocoding stage offline)
+MAPPLS_AUTH_BASE_URL = os.getenv("MAPPLS_AUTH_BASE_URL", "https://outpost.mapmyindia.com").rstrip("/")
+MAPPLS_API_BASE_URL = os.getenv("MAPPLS_API_BASE_URL", "https://atlas.mappls.com").rstrip("/")
+GOOGLE_MAPS_BASE_URL = os.getenv("GOOGLE_MAPS_BASE_URL", "https://maps.googleapis.com").rstrip("/")
+
+MAPPLS_TOKEN_URL = f"{MAPPLS_AUTH_BASE_URL}/api/security/oauth/token"
+MAPPLS_SEARCH_URL = f"{MAPPLS_API_BASE_URL}/api/places/textsearch/json"
+GOOGLE_TEXTSEARCH_URL = f"{GOOGLE_MAPS_BASE_URL}/maps/api/place/textsearch/json"
+GOOGLE_PLACE_DETAILS_URL = f"{GOOGLE_MAPS_BASE_URL}/maps/api/place/details/json"
+# Mappls place detail endpoint (queried with ?eloc=...); the path depends on the account's API plan
+MAPPLS_PLACE_DETAILS_URL = os.getenv("MAPPLS_PLACE_DETAILS_URL", f"{MAPPLS_API_BASE_URL}/api/places/place_detail/json")
+# Look up verified places' official websites (one extra billed call per new hospital) to seed the agent
+GEOCODE_PLACE_DETAILS = os.getenv("GEOCODE_PLACE_DETAILS", "0").lower() in ("1", "true", "yes")
+
+# Mappls tokens are refreshed this many seconds before they expire
+MAPPLS_TOKEN_REFRESH_MARGIN = int(os.getenv("MAPPLS_TOKEN_REFRESH_MARGIN", "60"))
+# Lifetime assumed when the token response has no expires_in
+MAPPLS_DEFAULT_TOKEN_TTL = 3600
+# Responses that mean a cached website/listing URL is gone (anything else, even 403, is treated as still there)
+SITE_DEAD_STATUSES = frozenset({404, 410})
+# Seconds allowed for checking that a remembered website still answers (one try, no retries)
+SITE_PROBE_TIMEOUT = float(os.getenv("SITE_PROBE_TIMEOUT", "5"))
+
+
+def request_mappls_token(client_id, client_secret):
+    """Fetch a new OAuth token; returns (access_token, expires_in seconds) or (None, 0)."""
     data = {"grant_type": "client_credentials", "client_id": client_id, "client_secret": client_secret}
     try:
-        response = requests.post(url, data=data)
+        response = http_post(MAPPLS_TOKEN_URL, data=data)
         response.raise_for_status()
-        return response.json().get("access_token")
+        payload = response.json()
+        return payload.get("access_token"), int(payload.get("expires_in") or MAPPLS_DEFAULT_TOKEN_TTL)
     except Exception as e:
         print(f"   [Mappls Auth Error]: {e}")
-        return None
+        return None, 0
 
-def strict_verify_address(user_input, result_name, result_address):
-    user_input = user_input.lower()
-    result_full = f"{result_name} {result_address}".lower()
-    user_pincode = re.search(r'\b\d{6}\b', user_input)
-    result_pincode = re.search(r'\b\d{6}\b', result_full)
-    
-    if user_pincode and result_pincode:
-        if user_pincode.group() != result_pincode.group():
-            print(f"   Pincode Mismatch! Input: {user_pincode.group()} vs Found: {result_pincode.group()}")
-            return False, 0.0
 
-    ignore_words = {"hospital", "clinic", "road", "street", "st", "dr", "doctor", "lane", "opp", "near", "beside", "andhra", "pradesh", "india"}
-    user_tokens = [w for w in re.split(r'\W+', user_input) if len(w) > 3 and w not in ignore_words]
+def get_mappls_token(client_id, client_secret):
+    return request_mappls_token(client_id, client_secret)[0]
+
+
+class MapplsTokenCache:
+    """
+    Process-wide cache of Mappls OAuth tokens, one per client id.
+
+    A token is reused until MAPPLS_TOKEN_REFRESH_MARGIN seconds before its
+    expires_in runs out. Fetching happens under a lock, so concurrent
+    hospital workers share one refresh instead of each requesting a token.
+    """
+
+    def __init__(self, refresh_margin: int = MAPPLS_TOKEN_REFRESH_MARGIN):
+        self.refresh_margin = refresh_margin
+        self._lock = threading.Lock()
+        self._tokens = {}  # client_id -> (token, expires_at on the monotonic clock)
+
+    def get(self, client_id, client_secret):
+        with self._lock:
+            token, expires_at = self._tokens.get(client_id, (None, 0))
+            if token and time.monotonic() < expires_at - self.refresh_margin:
+                return token
+            token, expires_in = request_mappls_token(client_id, client_secret)
+            if token:
+                self._tokens[client_id] = (token, time.monotonic() + expires_in)
+            return token
+
+    def invalidate(self, client_id, token):
+        """Drop a token the API rejected (unless another worker already replaced it)."""
+        with self._lock:
+            if self._tokens.get(client_id, (None, 0))[0] == token:
+                del self._tokens[client_id]
+
+
+mappls_tokens = MapplsTokenCache()
+
+def _report_address_match(match):
+    if match.reason:
+        print(f"   {match.reason}")
+    elif match.total:
+        print(f"   🔍 Match Confidence: {match.confidence:.1f}% ({match.matched}/{match.total} keywords found)")
+
+
+def strict_verify_address(user_input, result_name, result_address, matcher=None):
+    """
+    Check a candidate against the input address; returns (is_match, confidence percentage).
+    
+    Pass an AddressMatcher built once for the input when scoring many candidates.
+    """
+    match = (matcher or AddressMatcher(user_input)).match(result_name, result_address)
+    _report_address_match(match)
+    return match.is_match, match.confidence
+
+def evaluate_mappls_response(address, data, status_code=200):
+    """Strictly match a Mappls text search response against the queried address."""
+    # Keep the provider response with definitive answers so they can be cached
+    raw = {"raw_response": data} if status_code == 200 else {}
     
-    matched_count = 0
-    total_tokens = len(user_tokens)
+    locations = data.get("suggestedLocations", [])
+    if not locations:
+        return {"verified": False, "source": "Mappls", "details": "No results found", "address_confidence_score": 0.0, **raw}
+
+    medical_keywords = ["Hospital", "Clinic", "Medical", "Doctor", "Dr.", "Nursing", "Scan", "Lab", "Pharmacy"]
+    best_match = None
+    confidence_score = 0.0
+    matcher = AddressMatcher(address)
     
-    if total_tokens == 0:
-        return True, 100.0 
+    print(f"   found {len(locations)} potential matches. Filtering for exact healthcare match...")
+
+    for loc in locations:
+        name = loc.get("placeName", "")
+        addr = loc.get("placeAddress", "")
+        category_codes = loc.get("keywords", []) 
         
-    for token in user_tokens:
-        if token in result_full:
-            matched_count += 1
+        is_health_code = any(code.startswith("HLT") or code in ["LABRAD", "HSPGEN"] for code in category_codes)
+        name_is_medical = any(term.lower() in name.lower() for term in medical_keywords)
+
+        if is_health_code or name_is_medical:
+            is_match, conf_score = strict_verify_address(address, name, addr, matcher=matcher)
             
-    match_percentage = (matched_count / total_tokens) * 100
-    print(f"   🔍 Match Confidence: {match_percentage:.1f}% ({matched_count}/{total_tokens} keywords found)")
+            if is_match:
+                best_match = loc
+                confidence_score = conf_score
+                print(f"   Match Found & Verified: {name}")
+                break 
+            else:
+                print(f"   Rejecting nearby candidate: {name} (Address mismatch)")
+    
+    if not best_match:
+        return {"verified": False, "source": "Mappls", "details": "Hospital not found at this exact location (Nearby results rejected)", "address_confidence_score": 0.0, **raw}
 
-    if match_percentage < 40: 
-        return False, match_percentage
+    name = best_match.get("placeName", "")
+    loc_address = best_match.get("placeAddress", "")
+    full_result = f"{name}, {loc_address}"
+    website = normalize_website(best_match.get("website"))
+    
+    return {
+        "verified": True, 
+        "source": "Mappls (Strict)", 
+        "name": full_result,
+        "type": "Healthcare",
+        "raw_data": best_match,
+        "address_confidence_score": confidence_score,
+        **({"website": website} if website else {}),
+        **raw
+    }
+
+
+def evaluate_google_response(data):
+    """Pick the best healthcare match from a Google Places text search response."""
+    # Quota/auth errors are not definitive answers, so only these responses are kept for caching
+    raw = {"raw_response": data} if data.get("status") in ("OK", "ZERO_RESULTS") else {}
+    
+    if data.get("status") != "OK" or not data.get("results"):
+        return {"verified": False, "source": "GoogleAPI", "details": data.get("error_message", "No results"), **raw}
+    
+    results = data["results"]
+    medical_types = ["hospital", "doctor", "health", "pharmacy", "physiotherapist", "dentist"]
+    best_match = None
+    
+    for place in results:
+        place_types = place.get("types", [])
+        place_name = place.get("name", "")
         
-    return True, match_percentage
+        if any(t in place_types for t in medical_types) or "hospital" in place_name.lower() or "clinic" in place_name.lower():
+            best_match = place
+            print(f" Match Found: {place_name} (Type: {place_types})")
+            break
+    
+    if not best_match:
+        print("  No strict medical match found. Using top result.")
+        best_match = results[0]
+
+    return {
+        "verified": True,
+        "source": "GoogleAPI",
+        "name": best_match.get("name"),
+        "full_address": best_match.get("formatted_address"),
+        "place_id": best_match.get("place_id"),
+        **raw
+    }
+
 
 def strict_verify_location_with_mappls(address, client_id, client_secret):
     print(f"\n STAGE 1: Checking Mappls (MapmyIndia) API...")
     
-    token = get_mappls_token(client_id, client_secret)
+    token = mappls_tokens.get(client_id, client_secret)
     if not token:
         return {"verified": False, "source": "Mappls", "details": "Auth Failed", "address_confidence_score": 0.0}
 
-    url = "https://atlas.mappls.com/api/places/textsearch/json"
     params = { "query": address }
     headers = { "Authorization": f"Bearer {token}", "User-Agent": "ValidationAgent/1.0" }
 
     try:
-        response = requests.get(url, params=params, headers=headers)
-        data = response.json()
-        
-        locations = data.get("suggestedLocations", [])
-        if not locations:
-            return {"verified": False, "source": "Mappls", "details": "No results found", "address_confidence_score": 0.0}
-
-        medical_keywords = ["Hospital", "Clinic", "Medical", "Doctor", "Dr.", "Nursing", "Scan", "Lab", "Pharmacy"]
-        best_match = None
-        confidence_score = 0.0
-        
-        print(f"   found {len(locations)} potential matches. Filtering for exact healthcare match...")
-
-        for loc in locations:
-            name = loc.get("placeName", "")
-            addr = loc.get("placeAddress", "")
-            category_codes = loc.get("keywords", []) 
-            
-            is_health_code = any(code.startswith("HLT") or code in ["LABRAD", "HSPGEN"] for code in category_codes)
-            name_is_medical = any(term.lower() in name.lower() for term in medical_keywords)
-
-            if is_health_code or name_is_medical:
-                is_match, conf_score = strict_verify_address(address, name, addr)
-                
-                if is_match:
-                    best_match = loc
-                    confidence_score = conf_score
-                    print(f"   Match Found & Verified: {name}")
-                    break 
-                else:
-                    print(f"   Rejecting nearby candidate: {name} (Address mismatch)")
-        
-        if not best_match:
-            return {"verified": False, "source": "Mappls", "details": "Hospital not found at this exact location (Nearby results rejected)", "address_confidence_score": 0.0}
-
-        name = best_match.get("placeName", "")
-        loc_address = best_match.get("placeAddress", "")
-        full_result = f"{name}, {loc_address}"
-        
-        return {
-            "verified": True, 
-            "source": "Mappls (Strict)", 
-            "name": full_result,
-            "type": "Healthcare",
-            "raw_data": best_match,
-            "address_confidence_score": confidence_score
-        }
+        response = http_get(MAPPLS_SEARCH_URL, params=params, headers=headers)
+        if response.status_code == 401:
+            # Token revoked or expired early: refresh once and retry
+            print("   Mappls token rejected, refreshing...")
+            mappls_tokens.invalidate(client_id, token)
+            token = mappls_tokens.get(client_id, client_secret)
+            if not token:
+                return {"verified": False, "source": "Mappls", "details": "Auth Failed", "address_confidence_score": 0.0}
+            headers["Authorization"] = f"Bearer {token}"
+            response = http_get(MAPPLS_SEARCH_URL, params=params, headers=headers)
+        return evaluate_mappls_response(address, response.json(), response.status_code)
             
     except Exception as e:
         print(f"   [Mappls Search Error]: {e}")
@@ -135,47 +246,252 @@ def strict_verify_location_with_mappls(address, client_id, client_secret):
 def verify_location_with_google(address, api_key):
     print(f"\n STAGE 1: Checking Google Maps API (Global)...")
     
-    url = "https://maps.googleapis.com/maps/api/place/textsearch/json"
     params = { "query": address, "key": api_key }
     
     try:
-        response = requests.get(url, params=params)
-        data = response.json()
-        
-        if data.get("status") != "OK" or not data.get("results"):
-            return {"verified": False, "source": "GoogleAPI", "details": data.get("error_message", "No results")}
-        
-        results = data["results"]
-        medical_types = ["hospital", "doctor", "health", "pharmacy", "physiotherapist", "dentist"]
-        best_match = None
-        
-        for place in results:
-            place_types = place.get("types", [])
-            place_name = place.get("name", "")
-            
-            if any(t in place_types for t in medical_types) or "hospital" in place_name.lower() or "clinic" in place_name.lower():
-                best_match = place
-                print(f" Match Found: {place_name} (Type: {place_types})")
-                break
-        
-        if not best_match:
-            print("  No strict medical match found. Using top result.")
-            best_match = results[0]
+        response = http_get(GOOGLE_TEXTSEARCH_URL, params=params)
+        return evaluate_google_response(response.json())
+
+    except Exception as e:
+        print(f"   [Google API Error]: {e}")
+        return {"verified": False, "source": "GoogleAPI", "details": str(e)}
+
+
+async def async_verify_location_with_mappls(client, address, client_id, client_secret):
+    """Async variant of strict_verify_location_with_mappls using a pooled httpx client."""
+    token = await asyncio.to_thread(mappls_tokens.get, client_id, client_secret)
+    if not token:
+        return {"verified": False, "source": "Mappls", "details": "Auth Failed", "address_confidence_score": 0.0}
+
+    params = { "query": address }
+    headers = { "Authorization": f"Bearer {token}", "User-Agent": "ValidationAgent/1.0" }
+
+    try:
+        response = await async_request(client, "GET", MAPPLS_SEARCH_URL, params=params, headers=headers)
+        if response.status_code == 401:
+            mappls_tokens.invalidate(client_id, token)
+            token = await asyncio.to_thread(mappls_tokens.get, client_id, client_secret)
+            if not token:
+                return {"verified": False, "source": "Mappls", "details": "Auth Failed", "address_confidence_score": 0.0}
+            headers["Authorization"] = f"Bearer {token}"
+            response = await async_request(client, "GET", MAPPLS_SEARCH_URL, params=params, headers=headers)
+        return evaluate_mappls_response(address, response.json(), response.status_code)
+    except Exception as e:
+        print(f"   [Mappls Search Error]: {e}")
+
+    return {"verified": False, "source": "Mappls", "details": "Error", "address_confidence_score": 0.0}
 
-        return {
-            "verified": True,
-            "source": "GoogleAPI",
-            "name": best_match.get("name"),
-            "full_address": best_match.get("formatted_address"),
-            "place_id": best_match.get("place_id"),
-            "website": None 
-        }
 
+async def async_verify_location_with_google(client, address, api_key):
+    """Async variant of verify_location_with_google using a pooled httpx client."""
+    try:
+        response = await async_request(client, "GET", GOOGLE_TEXTSEARCH_URL, params={ "query": address, "key": api_key })
+        return evaluate_google_response(response.json())
     except Exception as e:
         print(f"   [Google API Error]: {e}")
         return {"verified": False, "source": "GoogleAPI", "details": str(e)}
 
 
+def normalize_website(url):
+    """Absolute http(s) URL for a website field ("www.x.in" gets https://), or None."""
+    url = str(url or "").strip()
+    if not url:
+        return None
+    if not re.match(r"^https?://", url, re.I):
+        url = f"https://{url.lstrip('/')}"
+    return url if "." in url.split("://", 1)[1] else None
+
+
+def website_from_place_details(data):
+    """Official website in a Google Place Details or Mappls place detail response, or None."""
+    for record in (data.get("result"), data, data.get("richInfo"), data.get("contact")):
+        if isinstance(record, dict):
+            website = normalize_website(record.get("website") or record.get("websiteUrl"))
+            if website:
+                return website
+    return None
+
+
+def place_details_request(provider, credentials, location_data):
+    """
+    Place-details call for a verified location: (url, params, headers), or None
+    when the result has no place id (or Mappls auth fails). May fetch a Mappls token.
+    """
+    if provider == "google":
+        place_id = location_data.get("place_id")
+        if not place_id:
+            return None
+        return GOOGLE_PLACE_DETAILS_URL, {"place_id": place_id, "fields": "website", "key": credentials[0]}, {}
+
+    eloc = (location_data.get("raw_data") or {}).get("eLoc")
+    token = mappls_tokens.get(*credentials) if eloc else None
+    if not token:
+        return None
+    return MAPPLS_PLACE_DETAILS_URL, {"eloc": eloc}, {"Authorization": f"Bearer {token}", "User-Agent": "ValidationAgent/1.0"}
+
+
+def needs_place_details(location_data):
+    """True for verified locations whose website has not been looked up yet ("website" absent)."""
+    return GEOCODE_PLACE_DETAILS and location_data.get("verified") and "website" not in location_data
+
+
+def add_place_website(provider, credentials, location_data):
+    """
+    Look up the official website of a verified location and store it as location_data["website"].
+    
+    A definitive answer (including "no website", stored as None) is kept so it
+    is cached with the geocode result; on errors the key stays absent and the
+    lookup is retried next time.
+    """
+    request = place_details_request(provider, credentials, location_data)
+    if request is None:
+        return location_data
+    url, params, headers = request
+    try:
+        response = http_get(url, params=params, headers=headers)
+        if response.status_code == 200:
+            location_data["website"] = website_from_place_details(response.json())
+            print(f"   Official website from {provider} place details: {location_data['website'] or 'none listed'}")
+    except Exception as e:
+        print(f"   [{provider} Place Details Error]: {e}")
+    return location_data
+
+
+async def async_add_place_website(client, provider, credentials, location_data):
+    """Async add_place_website using a pooled httpx client."""
+    request = await asyncio.to_thread(place_details_request, provider, credentials, location_data)
+    if request is None:
+        return location_data
+    url, params, headers = request
+    try:
+        response = await async_request(client, "GET", url, params=params, headers=headers)
+        if response.status_code == 200:
+            location_data["website"] = website_from_place_details(response.json())
+    except Exception as e:
+        print(f"   [{provider} Place Details Error]: {e}")
+    return location_data
+
+
+def geocode_provider(full_address):
+    """
+    Provider used to verify a query: ("mappls", (client_id, client_secret)),
+    ("google", (api_key,)) or (None, reason) when no usable keys are configured.
+    """
+    google_key = os.getenv("google_maps_api_key")
+    mappls_client_id = os.getenv("mappls_client_id")
+    mappls_client_secret = os.getenv("mappls_client_secret")
+    
+    if is_address_in_india(full_address):
+        if mappls_client_id and mappls_client_secret:
+            return "mappls", (mappls_client_id, mappls_client_secret)
+        if google_key:
+            print(" Address is in India, but MAPPLS keys are missing. Trying Google...")
+            return "google", (google_key,)
+        return None, "No API keys available for India."
+    if google_key:
+        return "google", (google_key,)
+    return None, "Address is outside India, but GOOGLE_MAPS_API_KEY is missing."
+
+
+def pincode_rejection(address):
+    """Location data for an address whose PIN code rules it out locally, or None if it is plausible."""
+    check = prescreen_address(address)
+    if check["plausible"]:
+        return None
+    print(f" PIN code check failed: {check['reason']}")
+    return {
+        "verified": False,
+        "source": "PincodeIndex",
+        "details": check["reason"],
+        "error": check["reason"],
+        "address_confidence_score": 0.0
+    }
+
+
+def verify_hospital_location(full_address, address=None):
+    """
+    Verify a "hospital name, address" query with Mappls (India) or Google Places.
+    
+    Addresses whose PIN code does not exist or belongs to another state than
+    the address names are rejected locally, without an API call. Results are
+    served from the geocode cache when the same normalised query was verified
+    recently (see geocode_cache for the positive/negative TTLs).
+    
+    Args:
+        full_address: "hospital name, address" query
+        address: Address part alone, used for the PIN code check (defaults to full_address)
+    
+    Returns:
+        Location data dict with at least "verified"
+    """
+    rejection = pincode_rejection(address or full_address)
+    if rejection:
+        return rejection
+    
+    provider, credentials = geocode_provider(full_address)
+    if provider is None:
+        print(f" {credentials}")
+        return {"verified": False}
+    
+    cache = get_geocode_cache()
+    location_data = cache.get(provider, full_address)
+    if location_data is not None:
+        print(f"\n STAGE 1: Using cached {provider} verification")
+        if needs_place_details(location_data):
+            cache.put(provider, full_address, add_place_website(provider, credentials, location_data))
+        return location_data
+    
+    if provider == "mappls":
+        location_data = strict_verify_location_with_mappls(full_address, *credentials)
+    else:
+        location_data = verify_location_with_google(full_address, *credentials)
+    if needs_place_details(location_data):
+        add_place_website(provider, credentials, location_data)
+    cache.put(provider, full_address, location_data)
+    return location_data
+
+
+async def async_verify_hospital_location(client, full_address, limiters=None, address=None):
+    """
+    Async verify_hospital_location for concurrent pre-passes.
+    
+    Args:
+        client: httpx.AsyncClient from http_client.async_http_client(), or None to
+                run the sync verification in a worker thread
+        full_address: "hospital name, address" query
+        limiters: Optional {provider: async context manager} applied around each API call
+        address: Address part alone, used for the PIN code check (defaults to full_address)
+    """
+    rejection = pincode_rejection(address or full_address)
+    if rejection:
+        return rejection
+    
+    provider, credentials = geocode_provider(full_address)
+    if provider is None:
+        return {"verified": False}
+    
+    cache = get_geocode_cache()
+    location_data = cache.get(provider, full_address)
+    if location_data is not None and not needs_place_details(location_data):
+        return location_data
+    
+    limiter = (limiters or {}).get(provider) or contextlib.nullcontext()
+    if client is None:
+        async with limiter:
+            return await asyncio.to_thread(verify_hospital_location, full_address, address)
+    if location_data is None:
+        async with limiter:
+            if provider == "mappls":
+                location_data = await async_verify_location_with_mappls(client, full_address, *credentials)
+            else:
+                location_data = await async_verify_location_with_google(client, full_address, *credentials)
+    if needs_place_details(location_data):
+        async with limiter:
+            await async_add_place_website(client, provider, credentials, location_data)
+    cache.put(provider, full_address, location_data)
+    return location_data
+
+
 def extract_json_from_markdown(text: str) -> str:
     pattern = r'```(?:json)?\s*\n?(.*?)\n?```'
     match = re.search(pattern, text, re.DOTALL)
@@ -186,13 +502,19 @@ def extract_json_from_markdown(text: str) -> str:
     return text.strip()
 
 
-def main(hospital_name: str, hospital_address: str):
+def main(hospital_name: str, hospital_address: str, location_data: dict = None):
     """
     Main function to scrape doctor data from a hospital website.
     
+    The whole scrape runs under a per-hospital time/step budget
+    (HOSPITAL_BUDGET_SECONDS / HOSPITAL_BUDGET_STEPS). When it runs out the
+    doctors gathered so far are returned with partial=True.
+    
     Args:
         hospital_name: Name of the hospital
         hospital_address: Full address of the hospital
+        location_data: Result of verify_hospital_location from an earlier
+                       geocoding pre-pass (skips the location lookup)
         
     Returns:
         Dictionary with:
@@ -202,7 +524,13 @@ def main(hospital_name: str, hospital_address: str):
         - doctors: List of doctor dictionaries
         - address_confidence_score: Float confidence score
         - error: String (if verification failed)
+        - partial / budget_reason: set when the budget cut the scrape short
     """
+    with hospital_budget():
+        return _scrape_hospital(hospital_name, hospital_address, location_data)
+
+
+def _scrape_hospital(hospital_name: str, hospital_address: str, location_data: dict = None):
     print("="*60)
     print(" HOSPITAL & DOCTOR DATA SCRAPING SYSTEM")
     print("="*60)
@@ -210,26 +538,11 @@ def main(hospital_name: str, hospital_address: str):
     # Combine for full address search
     full_address = f"{hospital_name}, {hospital_address}"
     
-    google_key = os.getenv("google_maps_api_key")
-    mappls_client_id = os.getenv("mappls_client_id")
-    mappls_client_secret = os.getenv("mappls_client_secret")
-    location_data = {"verified": False}
-    
-    # Step 1: Verify hospital location
-    if is_address_in_india(full_address):
-        if mappls_client_id and mappls_client_secret:
-            location_data = strict_verify_location_with_mappls(full_address, mappls_client_id, mappls_client_secret)
-        else:
-            print(" Address is in India, but MAPPLS keys are missing. Trying Google...")
-            if google_key:
-                location_data = verify_location_with_google(full_address, google_key)
-            else:
-                print(" No API keys available for India.")
+    # Step 1: Verify hospital location (unless a geocoding pre-pass already did)
+    if location_data is None:
+        location_data = verify_hospital_location(full_address, hospital_address)
     else:
-        if google_key:
-            location_data = verify_location_with_google(full_address, google_key)
-        else:
-            print(" Address is outside India, but GOOGLE_MAPS_API_KEY is missing.")
+        print(f"\n STAGE 1: Using pre-verified location from geocoding pre-pass")
 
     if not location_data.get("verified"):
         print(f" FACILITY NOT FOUND. Address verification failed.")
@@ -239,7 +552,7 @@ def main(hospital_name: str, hospital_address: str):
             "hospital_address": hospital_address,
             "doctors": [],
             "address_confidence_score": 0.0,
-            "error": "Hospital address not found via Mappls/Google Maps API"
+            "error": location_data.get("error", "Hospital address not found via Mappls/Google Maps API")
         }
     
     # Step 2: Verify hospital name match
@@ -280,10 +593,93 @@ def main(hospital_name: str, hospital_address: str):
     verified_address = location_data.get("raw_data", {}).get("placeAddress", "") or location_data.get("full_address", hospital_address)
     
     # Step 3: Scrape doctors using run_agent
-    print(f"\n PHASE 2: Scraping doctors from hospital website...")
+    reason = budget_exhausted()
+    if reason:
+        print(f" Skipping website scrape: {reason}")
+        return {
+            "verified": True,
+            "hospital_name": found_hospital_name,
+            "hospital_address": verified_address,
+            "doctors": [],
+            "address_confidence_score": location_data.get("address_confidence_score", 0.0),
+            "error": f"Scraping skipped: {reason}",
+            "partial": True,
+            "budget_reason": reason
+        }
     
+    print(f"\n PHASE 2: Scraping doctors from hospital website...")
+
+    # Start from the website remembered from an earlier run, else the one listed in place details
+    site_cache = get_site_cache()
+    cached_urls = site_cache.start_urls(hospital_name, hospital_address)
+    start_urls = reachable_start_urls(cached_urls)
+    seed_source = "cached"
+    if cached_urls and not start_urls:
+        print(f"   Cached website is unreachable, dropping it")
+        site_cache.invalidate(hospital_name, hospital_address)
+    if not start_urls and location_data.get("website"):
+        start_urls = reachable_start_urls([location_data["website"]])
+        seed_source = "place details"
+    if start_urls:
+        print(f"   Starting from {seed_source} website {start_urls[0]} ({len(start_urls) - 1} listing pages)")
+        result = _run_scrape_agent(hospital_name, hospital_address, found_hospital_name, verified_address,
+                                   location_data, start_urls)
+        if result["doctors"] or budget_exhausted():
+            return _remember_site(site_cache, hospital_name, hospital_address, result)
+        print(f"   {seed_source.capitalize()} website yielded no doctors ({result.get('error', 'empty result')}), falling back to full discovery")
+        if seed_source == "cached":
+            site_cache.invalidate(hospital_name, hospital_address)
+
+    result = _run_scrape_agent(hospital_name, hospital_address, found_hospital_name, verified_address,
+                               location_data)
+    return _remember_site(site_cache, hospital_name, hospital_address, result)
+
+
+def reachable_start_urls(start_urls: list) -> list:
+    """
+    Check that a remembered website still answers before seeding the agent with it.
+
+    Only the website is probed, once and with a short timeout; listing URLs
+    that no longer work are left to the agent, whose seeded run falls back to
+    full discovery when it finds no doctors.
+
+    Args:
+        start_urls: Official website followed by listing URLs
+
+    Returns:
+        start_urls, or [] if the website is gone
+    """
+    if not start_urls:
+        return []
+    try:
+        response = http_probe(start_urls[0], timeout=budget_timeout_ms(int(SITE_PROBE_TIMEOUT * 1000)) / 1000)
+        if response.status_code not in SITE_DEAD_STATUSES:
+            return start_urls
+        print(f"   Website {start_urls[0]} answered HTTP {response.status_code}")
+    except Exception as e:
+        print(f"   Website {start_urls[0]} failed: {e}")
+    return []
+
+
+def _remember_site(site_cache, hospital_name: str, hospital_address: str, result: dict) -> dict:
+    """Cache where the agent found the doctors (only for runs that found some) and drop it from the result."""
+    site = result.pop("site", None)
+    if site and result["doctors"] and not result.get("error"):
+        site_cache.put(hospital_name, hospital_address, site)
+    return result
+
+
+def _run_scrape_agent(hospital_name: str, hospital_address: str, found_hospital_name: str, verified_address: str,
+                      location_data: dict, start_urls: list = None) -> dict:
+    """Run the browser agent (optionally seeded with known URLs) and turn its output into a scrape result."""
     try:
-        agent_result = run_agent(hospital_name, hospital_address)
+        agent_result = run_agent(hospital_name, hospital_address, start_urls=start_urls)
+        
+        # Doctors found before the budget ran out are kept, but flagged as partial
+        partial = {}
+        if isinstance(agent_result, dict) and agent_result.get("partial"):
+            partial = {"partial": True, "budget_reason": agent_result.get("budget_reason")}
+            print(f" Agent stopped early ({partial['budget_reason']}), keeping partial results")
         
         # Handle error cases
         if isinstance(agent_result, dict) and "error" in agent_result:
@@ -339,7 +735,9 @@ def main(hospital_name: str, hospital_address: str):
                 "hospital_name": found_hospital_name,
                 "hospital_address": verified_address,
                 "doctors": normalized_doctors,
-                "address_confidence_score": location_data.get("address_confidence_score", 0.0)
+                "address_confidence_score": location_data.get("address_confidence_score", 0.0),
+                "site": agent_result.get("site"),
+                **partial
             }
             
         except json.JSONDecodeError as e:
@@ -351,7 +749,8 @@ def main(hospital_name: str, hospital_address: str):
                 "hospital_address": verified_address,
                 "doctors": [],
                 "address_confidence_score": location_data.get("address_confidence_score", 0.0),
-                "error": f"Failed to parse scraped data: {str(e)}"
+                "error": f"Failed to parse scraped data: {str(e)}",
+                **partial
             }
             
     except Exception as e:
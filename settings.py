@@ -0,0 +1,15 @@
+"""
+Loads config/.env (and a .env in the project root) into the environment.
+
+Modules that read VALIDATION_* and other settings with os.getenv at import
+time import this module first, so values from the .env files apply to the
+CLI and the backend alike. Variables already set in the environment win.
+"""
+import os
+
+import dotenv
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+dotenv.load_dotenv(os.path.join(ROOT_DIR, "config", ".env"))
+dotenv.load_dotenv(os.path.join(ROOT_DIR, ".env"))
@@ -0,0 +1,74 @@
+import logging
+import os
+from typing import Dict, List, Optional
+
+import settings  # loads config/.env before the settings below are read
+from hospital_keys import canonical_hospital_key
+from ttl_cache import CACHE_DIR, SQLiteTTLCache
+
+# How long a hospital's official domain and doctor listing URLs are reused to seed the agent (0 disables seeding)
+SITE_CACHE_TTL_HOURS = float(os.getenv("SITE_CACHE_TTL_HOURS", "2160"))
+SITE_CACHE_PATH = os.getenv("SITE_CACHE_PATH", os.path.join(CACHE_DIR, "site_cache.sqlite3"))
+
+
+class SiteCache:
+    """
+    Disk-backed record of where each hospital's doctors were found, keyed by canonical hospital name + address.
+
+    Entries are the agent's site summary: {"domain", "website", "listing_urls"}.
+    They outlive scraped rosters (SCRAPE_CACHE_TTL_HOURS) because websites
+    move far less often than doctors do; a URL that stops working is dropped
+    with invalidate() and the hospital goes back to full discovery.
+    """
+
+    def __init__(self, path: str = SITE_CACHE_PATH, ttl_hours: float = SITE_CACHE_TTL_HOURS):
+        self.ttl_seconds = ttl_hours * 3600
+        self.store = SQLiteTTLCache(path, table="hospital_sites") if self.enabled else None
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def get(self, hospital_name: str, address: str) -> Optional[Dict]:
+        if not self.enabled:
+            return None
+        try:
+            return self.store.get(canonical_hospital_key(hospital_name, address), max_age=self.ttl_seconds)
+        except Exception as e:
+            logging.warning(f"Site cache read failed: {e}")
+            return None
+
+    def start_urls(self, hospital_name: str, address: str) -> List[str]:
+        """Cached official website followed by its listing URLs ([] when nothing is cached)."""
+        site = self.get(hospital_name, address)
+        if not site or not site.get("website"):
+            return []
+        return [site["website"]] + [url for url in site.get("listing_urls", []) if url != site["website"]]
+
+    def put(self, hospital_name: str, address: str, site: Dict):
+        """Remember a hospital's site; summaries without a domain are ignored."""
+        if not self.enabled or not site or not site.get("domain") or not site.get("website"):
+            return
+        try:
+            self.store.set(canonical_hospital_key(hospital_name, address), site, ttl=self.ttl_seconds)
+        except Exception as e:
+            logging.warning(f"Site cache write failed: {e}")
+
+    def invalidate(self, hospital_name: str, address: str):
+        if not self.enabled:
+            return
+        try:
+            self.store.delete(canonical_hospital_key(hospital_name, address))
+        except Exception as e:
+            logging.warning(f"Site cache delete failed: {e}")
+
+
+_site_cache = None
+
+
+def get_site_cache() -> SiteCache:
+    """Process-wide SiteCache (created on first use)."""
+    global _site_cache
+    if _site_cache is None:
+        _site_cache = SiteCache()
+    return _site_cache
@@ -0,0 +1,140 @@
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Iterable, List, Optional
+
+_STOP = object()
+# How often blocked producers re-check whether the pipeline was aborted
+_PUT_POLL_SECONDS = 0.1
+
+
+class Stage:
+    """
+    One step of a Pipeline: `fn(item) -> item` run by `workers` threads.
+
+    At most `queue_size` items wait in front of the stage (defaults to twice
+    its workers); upstream stages block when the queue is full, which keeps
+    fast stages from racing ahead of slow ones. Returning None drops the item.
+    """
+
+    def __init__(self, name: str, fn: Callable[[Any], Any], workers: int = 1, queue_size: int = None):
+        self.name = name
+        self.fn = fn
+        self.workers = max(1, workers or 1)
+        self.queue_size = max(1, queue_size or 2 * self.workers)
+        self.processed = 0
+        self.busy_seconds = 0.0
+
+
+class Pipeline:
+    """
+    Runs items through a chain of Stages connected by bounded queues.
+
+    Every stage works on a different item at the same time, so a slow stage
+    (the browser scrape) overlaps with the ones before and after it.
+
+    Args:
+        stages: Stages in order; the last one is the sink and its return value is ignored
+        on_error: Optional callback(item, stage_name, exc) for a failing stage; its return
+                  value is sent straight to the last stage. Without it, any stage error aborts
+                  the run. Errors in the last stage always abort the run.
+        is_done: Optional predicate; items for which it is true skip the remaining
+                 stages and go straight to the last one
+    """
+
+    def __init__(self, stages: List[Stage], on_error: Callable = None, is_done: Callable[[Any], bool] = None):
+        if not stages:
+            raise ValueError("A pipeline needs at least one stage")
+        self.stages = stages
+        self.on_error = on_error
+        self.is_done = is_done
+        self._queues = [queue.Queue(maxsize=stage.queue_size) for stage in stages]
+        self._abort = threading.Event()
+        self._error: Optional[BaseException] = None
+        self._error_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+
+    def _fail(self, exc: BaseException):
+        with self._error_lock:
+            if self._error is None:
+                self._error = exc
+        self._abort.set()
+
+    def _put(self, index: int, item):
+        """Queue an item for a stage, blocking while it is full (unless the run was aborted)."""
+        q = self._queues[index]
+        while True:
+            try:
+                q.put(item, timeout=_PUT_POLL_SECONDS)
+                return
+            except queue.Full:
+                if self._abort.is_set() and item is not _STOP:
+                    return
+
+    def _work(self, index: int):
+        stage = self.stages[index]
+        last = len(self.stages) - 1
+        while True:
+            item = self._queues[index].get()
+            if item is _STOP:
+                return
+            if self._abort.is_set():
+                continue  # drain so upstream producers are not left blocked
+
+            started = time.monotonic()
+            target = index + 1
+            try:
+                item = stage.fn(item)
+            except Exception as e:
+                if index == last or self.on_error is None:
+                    self._fail(e)
+                    continue
+                logging.error(f"{stage.name} stage failed: {e}")
+                item, target = self.on_error(item, stage.name, e), last
+            except BaseException as e:
+                self._fail(e)
+                continue
+            finally:
+                with self._stats_lock:
+                    stage.processed += 1
+                    stage.busy_seconds += time.monotonic() - started
+
+            if item is None or index == last:
+                continue
+            if self.is_done is not None and self.is_done(item):
+                target = last
+            self._put(target, item)
+
+    def run(self, items: Iterable):
+        """Feed items through every stage and wait until the last one has handled them all."""
+        threads = []
+        for index, stage in enumerate(self.stages):
+            for n in range(stage.workers):
+                thread = threading.Thread(target=self._work, args=(index,), name=f"{stage.name}-{n}", daemon=True)
+                thread.start()
+                threads.append((index, thread))
+
+        started = time.monotonic()
+        try:
+            for item in items:
+                if self._abort.is_set():
+                    break
+                self._put(0, item)
+        except BaseException as e:
+            self._fail(e)
+        finally:
+            # Stop the stages in order so everything upstream has drained into a stage before it stops
+            for index, stage in enumerate(self.stages):
+                for _ in range(stage.workers):
+                    self._put(index, _STOP)
+                for thread_index, thread in threads:
+                    if thread_index == index:
+                        thread.join()
+
+        elapsed = time.monotonic() - started
+        for stage in self.stages:
+            utilisation = stage.busy_seconds / (elapsed * stage.workers) * 100 if elapsed else 0.0
+            logging.info(f"Stage {stage.name}: {stage.processed} items, {stage.workers} workers, {utilisation:.0f}% busy")
+        if self._error is not None:
+            raise self._error
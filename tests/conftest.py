@@ -0,0 +1,8 @@
+import os
+import sys
+
+ROOT_DIR = os.path.join(os.path.dirname(__file__), '..')
+
+# The validator modules live in the project root and the synthetic data generators in benchmarks/
+sys.path.insert(0, os.path.join(ROOT_DIR, 'benchmarks'))
+sys.path.insert(0, ROOT_DIR)
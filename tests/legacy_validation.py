@@ -0,0 +1,158 @@
+"""
+The original, linear-scan doctor comparison, kept verbatim as the reference
+for the equivalence tests of RosterIndex/compare_doctor_data.
+"""
+import re
+from typing import Dict, List, Union
+
+import pandas as pd
+
+
+def _normalize_text(s: Union[str, None]) -> str:
+    """Normalize text for comparison."""
+    if s is None or pd.isna(s):
+        return ""
+    s = str(s).strip().lower()
+    s = re.sub(r"[^\w\s]", " ", s)
+    s = re.sub(r"\s+", " ", s).strip()
+    return s
+
+
+def _normalize_phone(s: Union[str, None]) -> str:
+    """Normalize phone number to last 10 digits."""
+    if s is None or pd.isna(s):
+        return ""
+    digits = re.sub(r"[^\d]", "", str(s))
+    if len(digits) > 10:
+        digits = digits[-10:]
+    return digits
+
+
+def _fuzzy_name_match(n1: str, n2: str) -> bool:
+    """
+    Fuzzy match for doctor names with support for:
+    - Token matching (order independent)
+    - Initial matching (e.g., "S" matches "Sharma")
+    - "Dr." prefix handling
+    """
+    if not n1 and not n2:
+        return True
+    if not n1 or not n2:
+        return False
+
+    def clean_tokens(text):
+        t = str(text).lower().strip()
+        # Remove "Dr." prefix
+        if t.startswith("dr."):
+            t = t[3:]
+        elif t.startswith("dr "):
+            t = t[3:]
+        t = re.sub(r"[^\w\s]", " ", t)
+        return [w for w in t.split() if w]
+
+    tokens1 = clean_tokens(n1)
+    tokens2 = clean_tokens(n2)
+
+    if not tokens1 or not tokens2:
+        return False
+
+    # Use the longer list as reference
+    if len(tokens1) <= len(tokens2):
+        reference = tokens2
+        candidate = tokens1
+    else:
+        reference = tokens1
+        candidate = tokens2
+
+    used_indices = set()
+
+    for c_tok in candidate:
+        found_match = False
+        for i, r_tok in enumerate(reference):
+            if i in used_indices:
+                continue
+
+            # Exact match or initial match
+            is_same = (c_tok == r_tok)
+            is_initial = (len(c_tok) == 1 and r_tok.startswith(c_tok)) or \
+                         (len(r_tok) == 1 and c_tok.startswith(r_tok))
+
+            if is_same or is_initial:
+                used_indices.add(i)
+                found_match = True
+                break
+
+        if not found_match:
+            return False
+
+    return True
+
+
+def compare_doctor_data(csv_doctor: Dict, scraped_doctors: List[Dict]) -> Dict:
+    """
+    Compare a single CSV doctor record against scraped doctors list.
+
+    Returns:
+        Dictionary with status, reason, and updated data fields
+    """
+    csv_name = csv_doctor.get("doctor_name", "")
+    csv_phone = _normalize_phone(csv_doctor.get("phone_number", ""))
+    csv_spec = _normalize_text(csv_doctor.get("specialization", ""))
+    csv_qual = _normalize_text(csv_doctor.get("qualification", ""))
+
+    # Try to find doctor in scraped list using fuzzy matching
+    found_doctor = None
+    for scraped in scraped_doctors:
+        scraped_name = scraped.get("full_name", "")
+        if _fuzzy_name_match(csv_name, scraped_name):
+            found_doctor = scraped
+            break
+
+    # Rule 2: Doctor not found in scraped list
+    if not found_doctor:
+        return {
+            **csv_doctor,  # Keep all original data
+            "status": "human verification needed",
+            "reason": f"Doctor '{csv_name}' not found on hospital website"
+        }
+
+    # Doctor found - compare details
+    scraped_phone = _normalize_phone(found_doctor.get("phone_number", ""))
+    scraped_spec = _normalize_text(found_doctor.get("specialization", ""))
+    scraped_qual = _normalize_text(found_doctor.get("qualification", ""))
+
+    phone_match = (csv_phone == scraped_phone) if (csv_phone and scraped_phone) else True
+    spec_match = (csv_spec == scraped_spec) if (csv_spec and scraped_spec) else True
+    qual_match = (csv_qual == scraped_qual) if (csv_qual and scraped_qual) else True
+
+    # Rule 4: All details match
+    if phone_match and spec_match and qual_match:
+        return {
+            **csv_doctor,
+            "status": "verified",
+            "reason": "All details match website data"
+        }
+
+    # Rule 3: Some details don't match - update with scraped data
+    updates = []
+    result = csv_doctor.copy()
+
+    if not phone_match and scraped_phone:
+        updates.append(f"phone [{csv_doctor.get('phone_number', 'N/A')} → {found_doctor.get('phone_number', 'N/A')}]")
+        result["phone_number"] = found_doctor.get("phone_number", csv_doctor.get("phone_number"))
+
+    if not spec_match and scraped_spec:
+        updates.append(f"specialization [{csv_doctor.get('specialization', 'N/A')} → {found_doctor.get('specialization', 'N/A')}]")
+        result["specialization"] = found_doctor.get("specialization", csv_doctor.get("specialization"))
+
+    if not qual_match and scraped_qual:
+        updates.append(f"qualification [{csv_doctor.get('qualification', 'N/A')} → {found_doctor.get('qualification', 'N/A')}]")
+        result["qualification"] = found_doctor.get("qualification", csv_doctor.get("qualification"))
+
+    reason = "Updated: " + ", ".join(updates) if updates else "Data verified and updated"
+
+    return {
+        **result,
+        "status": "updated details",
+        "reason": reason
+    }
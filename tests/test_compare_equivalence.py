@@ -0,0 +1,69 @@
+"""
+RosterIndex/compare_doctor_data must give exactly the results of the original
+linear scan (tests/legacy_validation.py) on realistic synthetic rosters.
+"""
+import pytest
+
+import legacy_validation as legacy
+from synthetic import make_directory, make_roster
+from vallidation_agent import DoctorRecord, RosterIndex, compare_doctor_data, group_doctors_by_hospital
+
+
+def hospital_groups(rows: int, hospitals: int, seed: int = 42):
+    df = make_directory(rows, hospitals, seed=seed)
+    return [[dict(doctor) for doctor in doctors] for doctors in group_doctors_by_hospital(df).values()]
+
+
+def doctor(**fields):
+    """A CSV doctor as group_doctors_by_hospital produces it (every field present)."""
+    return {field: fields.get(field, "") for field in DoctorRecord.FIELDS}
+
+
+def assert_equivalent(csv_doctors, roster):
+    index = RosterIndex(roster)
+    for csv_doctor in csv_doctors:
+        expected = legacy.compare_doctor_data(csv_doctor, roster)
+        assert dict(compare_doctor_data(csv_doctor, roster, roster_index=index)) == expected
+        # Without a prebuilt index, and with a DoctorRecord instead of a dict
+        assert dict(compare_doctor_data(DoctorRecord.coerce(csv_doctor), roster)) == expected
+
+
+@pytest.mark.parametrize("extra, overlap", [(0, 0.7), (5, 0.3), (100, 0.9), (500, 0.7)])
+def test_matches_linear_scan_on_synthetic_rosters(extra, overlap):
+    for seed, csv_doctors in enumerate(hospital_groups(1000, 10)):
+        roster = make_roster(csv_doctors, len(csv_doctors) + extra, seed=seed, overlap=overlap)
+        assert_equivalent(csv_doctors, roster)
+
+
+def test_matches_linear_scan_against_other_hospitals_rosters():
+    # Rosters of unrelated doctors: almost every lookup is a miss or a loose initials match
+    groups = hospital_groups(1000, 10, seed=7)
+    for seed, csv_doctors in enumerate(groups):
+        other = groups[(seed + 1) % len(groups)]
+        assert_equivalent(csv_doctors, make_roster(other, len(other), seed=seed, overlap=1.0))
+
+
+def test_first_matching_roster_entry_wins():
+    csv_doctors = [doctor(doctor_name="Dr. S. Sharma", specialization="Cardiology", qualification="MBBS",
+                          phone_number="9876543210", hospital_name="Care Hospital", address="Hyderabad")]
+    roster = [
+        {"full_name": "Sunita Sharma", "specialization": "Neurology", "qualification": "MBBS, MD", "phone_number": ""},
+        {"full_name": "Dr Suresh Sharma", "specialization": "Cardiology", "qualification": "MBBS", "phone_number": "+91 98765 43210"},
+        {"full_name": "S Sharma", "specialization": "Cardiology", "qualification": "MBBS", "phone_number": "9876543210"},
+    ]
+    assert_equivalent(csv_doctors, roster)
+
+
+def test_blank_names_and_empty_roster():
+    csv_doctors = [
+        doctor(),
+        doctor(doctor_name="Dr.", specialization="ENT", phone_number="040-12345678"),
+        doctor(doctor_name="Dr. Anil Rao", specialization="ENT", qualification="MBBS", phone_number="nan"),
+    ]
+    roster = [
+        {"full_name": "", "specialization": "ENT", "qualification": "", "phone_number": ""},
+        {"full_name": "Dr.", "specialization": "", "qualification": "MBBS", "phone_number": ""},
+        {"full_name": "RAO A", "specialization": "E.N.T.", "qualification": "M.B.B.S.", "phone_number": None},
+    ]
+    assert_equivalent(csv_doctors, roster)
+    assert_equivalent(csv_doctors, [])
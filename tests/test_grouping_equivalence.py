@@ -0,0 +1,77 @@
+"""
+group_doctors_by_hospital must produce the records of the original row-wise
+implementation (benchmarks/bench_grouping.py), grouped so that every original
+name/address group lands whole, in input order, in one canonical group.
+"""
+import random
+
+import pandas as pd
+
+from bench_grouping import legacy_group_doctors_by_hospital, make_frame
+from synthetic import make_directory
+from vallidation_agent import group_doctors_by_hospital
+
+
+def flatten(groups):
+    return sorted((dict(r) for records in groups.values() for r in records), key=lambda r: r["license_number"])
+
+
+def assert_equivalent(df: pd.DataFrame):
+    legacy = legacy_group_doctors_by_hospital(df)
+    grouped = group_doctors_by_hospital(df)
+    assert flatten(grouped) == flatten(legacy)
+
+    # Each original group belongs to exactly one canonical group
+    canonical_of = {}
+    for key, records in grouped.items():
+        for r in records:
+            raw = f"{r['hospital_name']}||{r['address']}"
+            assert canonical_of.setdefault(raw, key) == key
+    assert set(canonical_of) == set(legacy)
+
+    # ...and its doctors keep their input order
+    for raw, records in legacy.items():
+        in_group = [dict(r) for r in grouped[canonical_of[raw]] if f"{r['hospital_name']}||{r['address']}" == raw]
+        assert in_group == records
+    return legacy, grouped
+
+
+def misspell(df: pd.DataFrame, seed: int = 42) -> pd.DataFrame:
+    """Rewrite some hospital names the way other uploads spell them (case, plurals, spacing)."""
+    rng = random.Random(seed)
+    variants = [str.upper, str.lower, lambda s: s.replace("Hospitals", "Hospital"), lambda s: f"  {s}  ",
+                lambda s: s.replace("Hospital ", "Hospitals ")]
+    df = df.copy()
+    df["hospital_name"] = [rng.choice(variants)(name) if rng.random() < 0.3 else name for name in df["hospital_name"]]
+    return df
+
+
+def test_matches_rowwise_grouping_on_synthetic_directory():
+    legacy, grouped = assert_equivalent(make_directory(5000, 50))
+    assert len(grouped) == len(legacy)
+
+
+def test_matches_rowwise_grouping_with_column_aliases():
+    # specialty/phone instead of specialization/phone_number, padded names
+    assert_equivalent(make_frame(5000, 50))
+
+
+def test_spelling_variants_are_merged():
+    legacy, grouped = assert_equivalent(misspell(make_directory(5000, 50)))
+    assert len(grouped) == 50 < len(legacy)
+
+
+def test_same_pincode_different_locality_is_not_merged():
+    df = pd.DataFrame({
+        "hospital_name": ["Apollo Hospital", "apollo hospitals", "Apollo Hospital"],
+        "address": ["Road No 72, Jubilee Hills, Hyderabad, Telangana 500033", "Jubilee Hills, Hyderabad - 500 033",
+                    "Film Nagar, Hyderabad 500033"],
+        "doctor_name": ["Dr. A", "Dr. B", "Dr. C"],
+        "license_number": ["L1", "L2", "L3"],
+    })
+    _, grouped = assert_equivalent(df)
+    assert [[r["license_number"] for r in records] for records in grouped.values()] == [["L1", "L2"], ["L3"]]
+
+
+def test_empty_input():
+    assert group_doctors_by_hospital(pd.DataFrame(columns=["hospital_name", "address", "doctor_name"])) == {}
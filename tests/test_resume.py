@@ -0,0 +1,104 @@
+"""
+A run that crashes after some hospitals and is resumed from its checkpoint
+journal must end with the same CSV, Parquet results and statistics as a run
+that was never interrupted.
+"""
+import time
+
+import pandas as pd
+import pytest
+
+import vallidation_agent as va
+from checkpoint import CheckpointJournal
+from hospital_schedule import HospitalScheduler, HospitalTimings
+from result_sinks import pq, read_parquet_results
+from scrape_cache import ScrapeCache
+from synthetic import make_directory, make_roster
+
+HOSPITALS = 12
+CRASH_AFTER = 5
+
+
+class SimulatedCrash(BaseException):
+    """Stands in for the process dying: not an Exception, so no stage handles it."""
+
+
+@pytest.fixture
+def directory(tmp_path, monkeypatch):
+    """Synthetic input CSV plus a fake scraper/geocoder whose results depend only on the hospital."""
+    df = make_directory(600, HOSPITALS)
+    input_csv = tmp_path / "providers.csv"
+    df.to_csv(input_csv, index=False)
+
+    rosters = {}
+    for seed, doctors in enumerate(va.group_doctors_by_hospital(pd.read_csv(input_csv)).values()):
+        rosters[va.scrape_target(doctors)] = make_roster([dict(d) for d in doctors], len(doctors) + 3, seed=seed)
+
+    scraped = []
+
+    def fake_scrape(hospital_name, address, location_data=None):
+        scraped.append(hospital_name)
+        return {"verified": True, "doctors": rosters[(hospital_name, address)]}
+
+    # Nothing may touch the network or the shared cache directory
+    monkeypatch.setattr(va, "scrape_hospital", fake_scrape)
+    monkeypatch.setattr(va, "locate_hospital", lambda name, address: {"verified": True})
+    monkeypatch.setattr(va, "get_scrape_cache", lambda: ScrapeCache(str(tmp_path / "scrape.sqlite3"), ttl_hours=0))
+    monkeypatch.setattr(va, "HospitalScheduler",
+                        lambda policy=None: HospitalScheduler(policy, timings=HospitalTimings(str(tmp_path / "timings.sqlite3"))))
+    monkeypatch.setattr(va, "COMPARE_PROCESSES", 0)
+    return input_csv, scraped
+
+
+def run(input_csv, out_dir, **kwargs):
+    out_dir.mkdir(exist_ok=True)
+    return va.validate_and_write_incremental(
+        str(input_csv), str(out_dir / "results.csv"), max_workers=1, streaming=False, geocode_prepass=False,
+        parquet_dir=str(out_dir / "parquet") if pq is not None else None, flush_every=1, **kwargs)
+
+
+def read_outputs(out_dir):
+    csv_rows = (out_dir / "results.csv").read_text(encoding="utf-8")
+    parquet = read_parquet_results(str(out_dir / "parquet"), "results") if pq is not None else None
+    return csv_rows, parquet
+
+
+def test_resumed_run_matches_uninterrupted_run(directory, tmp_path, monkeypatch):
+    input_csv, scraped = directory
+
+    expected_stats = run(input_csv, tmp_path / "full")
+    expected_csv, expected_parquet = read_outputs(tmp_path / "full")
+    assert expected_stats["hospitals_completed"] == HOSPITALS
+    scraped.clear()
+
+    # Crash while scraping hospital CRASH_AFTER + 1, once the hospitals before it are journaled
+    scrape = va.scrape_hospital
+    journal = tmp_path / "resumed" / "results.csv.journal.jsonl"
+
+    def crashing_scrape(hospital_name, address, location_data=None):
+        if len(scraped) == CRASH_AFTER:
+            deadline = time.monotonic() + 10
+            while len(CheckpointJournal(str(journal)).load()) < CRASH_AFTER and time.monotonic() < deadline:
+                time.sleep(0.01)
+            raise SimulatedCrash()
+        return scrape(hospital_name, address, location_data=location_data)
+
+    monkeypatch.setattr(va, "scrape_hospital", crashing_scrape)
+    with pytest.raises(SimulatedCrash):
+        run(input_csv, tmp_path / "resumed")
+    done = CheckpointJournal(str(journal)).load()
+    assert len(done) == CRASH_AFTER
+
+    monkeypatch.setattr(va, "scrape_hospital", scrape)
+    scraped.clear()
+    stats = run(input_csv, tmp_path / "resumed", resume=True)
+    # Only the hospitals missing from the journal are scraped again
+    assert len(scraped) == len(set(scraped)) == HOSPITALS - len(done)
+
+    resumed_csv, resumed_parquet = read_outputs(tmp_path / "resumed")
+    assert stats == expected_stats
+    assert resumed_csv == expected_csv
+    if pq is not None:
+        pd.testing.assert_frame_equal(resumed_parquet, expected_parquet)
+    # A finished run removes its journal
+    assert not journal.exists()
@@ -0,0 +1,71 @@
+import json
+import os
+import sqlite3
+import time
+from typing import Any, Optional
+
+import settings  # loads config/.env before the settings below are read
+
+# Directory for on-disk caches shared across validation runs
+CACHE_DIR = os.getenv("VALIDATION_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache"))
+
+
+class SQLiteTTLCache:
+    """
+    Small JSON key/value store in SQLite with a per-entry expiry.
+
+    A new connection is opened per call, so one instance can be shared by
+    concurrent hospital workers; WAL mode lets readers and a writer overlap.
+    """
+
+    def __init__(self, path: str, table: str = "cache"):
+        self.path = path
+        self.table = table
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL, expires_at REAL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get(self, key: str, max_age: float = None) -> Optional[Any]:
+        """Return the cached value, or None if missing, expired or older than max_age seconds."""
+        with self._connect() as conn:
+            row = conn.execute(
+                f"SELECT value, stored_at, expires_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+        if not row:
+            return None
+        value, stored_at, expires_at = row
+        now = time.time()
+        if expires_at is not None and expires_at <= now:
+            return None
+        if max_age is not None and now - stored_at > max_age:
+            return None
+        return json.loads(value)
+
+    def set(self, key: str, value: Any, ttl: float = None):
+        """Store a JSON-serialisable value; ttl in seconds (None = no expiry)."""
+        now = time.time()
+        expires_at = now + ttl if ttl is not None else None
+        with self._connect() as conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, stored_at, expires_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False, default=str), now, expires_at)
+            )
+
+    def delete(self, key: str):
+        with self._connect() as conn:
+            conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    def purge_expired(self) -> int:
+        """Remove expired entries; returns how many were deleted."""
+        with self._connect() as conn:
+            cur = conn.execute(
+                f"DELETE FROM {self.table} WHERE expires_at IS NOT NULL AND expires_at <= ?", (time.time(),)
+            )
+            return cur.rowcount
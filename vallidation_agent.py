@@ -1,13 +1,29 @@
-from scraping import main as scrape_hospital
 import csv
 import json
 import re
 import sys
 import asyncio
+import os
+import threading
+import atexit
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Union, Any
+from typing import Dict, List, Tuple, Union, Any
 import logging
+from collections.abc import Mapping
 import pandas as pd
+import settings  # loads config/.env before the settings below are read
+from hospital_spool import HospitalSpool
+from checkpoint import CheckpointJournal
+from scrape_cache import get_scrape_cache
+from hospital_keys import canonical_hospital_key
+from hospital_schedule import HospitalScheduler, SCHEDULE_POLICIES
+from scrape_replay import get_scraper, ReplayScraper
+from stage_pipeline import Pipeline, Stage
+from geocode_prepass import GEOCODE_PREPASS, run_geocode_prepass
+from result_sinks import CSVResultSink, ParquetResultSink, MultiSink
 
 # Fix for Windows asyncio SSL error - needed for browser automation
 #if sys.platform == 'win32':
@@ -15,6 +31,36 @@ import pandas as pd
 
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 
+# Number of hospitals validated at the same time in incremental mode
+DEFAULT_MAX_WORKERS = int(os.getenv("VALIDATION_MAX_WORKERS", "1"))
+
+# Inputs larger than this are read in chunks through an on-disk spool
+STREAMING_THRESHOLD_BYTES = int(os.getenv("VALIDATION_STREAMING_THRESHOLD_MB", "200")) * 1024 * 1024
+DEFAULT_CHUNKSIZE = int(os.getenv("VALIDATION_CHUNKSIZE", "50000"))
+# When set, results are also written as Parquet under <dir>/session=<id>/
+DEFAULT_PARQUET_DIR = os.getenv("VALIDATION_PARQUET_DIR") or None
+
+# Pipeline stages besides scraping (whose concurrency is max_workers): threads verifying
+# hospital locations ahead of the scrape (0 = max_workers, so geocoding is no more
+# concurrent than scraping), and threads comparing scraped rosters
+LOCATE_WORKERS = int(os.getenv("VALIDATION_LOCATE_WORKERS", "0"))
+COMPARE_WORKERS = int(os.getenv("VALIDATION_COMPARE_WORKERS", "1"))
+# Hospitals allowed to wait in front of each stage before upstream stages block (0 = twice its workers)
+STAGE_QUEUE_SIZES = {
+    stage: int(os.getenv(f"VALIDATION_{stage.upper()}_QUEUE", "0"))
+    for stage in ("locate", "scrape", "compare", "persist")
+}
+
+# Worker processes for comparing very large rosters (0 = compare in-thread)
+COMPARE_PROCESSES = int(os.getenv("VALIDATION_COMPARE_PROCESSES", "0"))
+# Only hospitals with at least this many CSV x scraped doctor pairs use the process pool
+COMPARE_PROCESS_MIN_PAIRS = int(os.getenv("VALIDATION_COMPARE_MIN_PAIRS", "1000000"))
+
+OUTPUT_COLUMNS = [
+    "hospital_name", "address", "doctor_name", "specialization",
+    "qualification", "phone_number", "license_number", "status", "reason"
+]
+
 
 def _normalize_text(s: Union[str, None]) -> str:
     """Normalize text for comparison."""
@@ -36,31 +82,20 @@ def _normalize_phone(s: Union[str, None]) -> str:
     return digits
 
 
-def _fuzzy_name_match(n1: str, n2: str) -> bool:
-    """
-    Fuzzy match for doctor names with support for:
-    - Token matching (order independent)
-    - Initial matching (e.g., "S" matches "Sharma")
-    - "Dr." prefix handling
-    """
-    if not n1 and not n2:
-        return True
-    if not n1 or not n2:
-        return False
-        
-    def clean_tokens(text):
-        t = str(text).lower().strip()
-        # Remove "Dr." prefix
-        if t.startswith("dr."):
-            t = t[3:]
-        elif t.startswith("dr "):
-            t = t[3:]
-        t = re.sub(r"[^\w\s]", " ", t)
-        return [w for w in t.split() if w]
-
-    tokens1 = clean_tokens(n1)
-    tokens2 = clean_tokens(n2)
-    
+def _clean_name_tokens(text) -> List[str]:
+    """Lowercase a doctor name, drop the "Dr." prefix and split it into tokens."""
+    t = str(text).lower().strip()
+    # Remove "Dr." prefix
+    if t.startswith("dr."):
+        t = t[3:]
+    elif t.startswith("dr "):
+        t = t[3:]
+    t = re.sub(r"[^\w\s]", " ", t)
+    return [w for w in t.split() if w]
+
+
+def _name_tokens_match(tokens1: List[str], tokens2: List[str]) -> bool:
+    """Token/initial matching used by _fuzzy_name_match, on already cleaned tokens."""
     if not tokens1 or not tokens2:
         return False
         
@@ -96,73 +131,317 @@ def _fuzzy_name_match(n1: str, n2: str) -> bool:
     return True
 
 
-def group_doctors_by_hospital(df: pd.DataFrame) -> Dict[str, List[Dict]]:
+def _fuzzy_name_match(n1: str, n2: str) -> bool:
     """
-    Group doctors by hospital name and address combination.
+    Fuzzy match for doctor names with support for:
+    - Token matching (order independent)
+    - Initial matching (e.g., "S" matches "Sharma")
+    - "Dr." prefix handling
+    """
+    if not n1 and not n2:
+        return True
+    if not n1 or not n2:
+        return False
     
-    Returns:
-        Dictionary with keys as "hospital_name||address" and values as list of doctor records
+    return _name_tokens_match(_clean_name_tokens(n1), _clean_name_tokens(n2))
+
+
+class DoctorRecord(Mapping):
     """
-    hospitals = {}
+    Compact doctor row used for CSV input records and validation results.
+    
+    Behaves like a read-only dict (get, keys, items, {**record}), so callbacks and
+    writers keep working, but stores fields in __slots__ and caches the normalized
+    phone/specialization/qualification and name tokens the first time they are used.
+    status/reason are only present on results.
+    """
+    
+    FIELDS = ("hospital_name", "address", "doctor_name", "specialization",
+              "qualification", "phone_number", "license_number")
+    __slots__ = FIELDS + ("status", "reason", "_norm_phone", "_norm_spec", "_norm_qual", "_name_tokens")
+    
+    def __init__(self, hospital_name="", address="", doctor_name="", specialization="",
+                 qualification="", phone_number="", license_number="", status=None, reason=None):
+        self.hospital_name = hospital_name
+        self.address = address
+        self.doctor_name = doctor_name
+        self.specialization = specialization
+        self.qualification = qualification
+        self.phone_number = phone_number
+        self.license_number = license_number
+        self.status = status
+        self.reason = reason
+        self._norm_phone = None
+        self._norm_spec = None
+        self._norm_qual = None
+        self._name_tokens = None
+    
+    @classmethod
+    def coerce(cls, doctor) -> "DoctorRecord":
+        """Return `doctor` as a DoctorRecord (plain dicts are converted, unknown keys dropped)."""
+        if isinstance(doctor, cls):
+            return doctor
+        return cls(**{k: doctor.get(k, "") for k in cls.FIELDS},
+                   status=doctor.get("status"), reason=doctor.get("reason"))
+    
+    def to_row(self) -> list:
+        """Field values in FIELDS order (compact form used by the on-disk spool)."""
+        return [getattr(self, f) for f in self.FIELDS]
+    
+    @classmethod
+    def from_row(cls, row: list) -> "DoctorRecord":
+        return cls(*row)
+    
+    def to_dict(self) -> Dict:
+        return dict(self.items())
+    
+    def copy(self) -> "DoctorRecord":
+        return self.with_result(self.status, self.reason)
+    
+    def with_result(self, status: str, reason: str, **updates) -> "DoctorRecord":
+        """New record carrying a validation status/reason and optionally updated fields."""
+        record = DoctorRecord(*(updates.get(f, getattr(self, f)) for f in self.FIELDS), status=status, reason=reason)
+        # Carry over cached normalizations of fields that did not change
+        if "phone_number" not in updates:
+            record._norm_phone = self._norm_phone
+        if "specialization" not in updates:
+            record._norm_spec = self._norm_spec
+        if "qualification" not in updates:
+            record._norm_qual = self._norm_qual
+        if "doctor_name" not in updates:
+            record._name_tokens = self._name_tokens
+        return record
+    
+    @property
+    def norm_phone(self) -> str:
+        if self._norm_phone is None:
+            self._norm_phone = _normalize_phone(self.phone_number)
+        return self._norm_phone
+    
+    @property
+    def norm_spec(self) -> str:
+        if self._norm_spec is None:
+            self._norm_spec = _normalize_text(self.specialization)
+        return self._norm_spec
+    
+    @property
+    def norm_qual(self) -> str:
+        if self._norm_qual is None:
+            self._norm_qual = _normalize_text(self.qualification)
+        return self._norm_qual
     
-    for idx, row in df.iterrows():
-        hospital_name = str(row.get("hospital_name", "")).strip()
-        address = str(row.get("address", "")).strip()
+    @property
+    def name_tokens(self) -> List[str]:
+        if self._name_tokens is None:
+            self._name_tokens = _clean_name_tokens(self.doctor_name) if self.doctor_name else []
+        return self._name_tokens
+    
+    def _keys(self):
+        if self.status is None and self.reason is None:
+            return self.FIELDS
+        return self.FIELDS + ("status", "reason")
+    
+    def __getitem__(self, key):
+        if key in self._keys():
+            return getattr(self, key)
+        raise KeyError(key)
+    
+    def __iter__(self):
+        return iter(self._keys())
+    
+    def __len__(self):
+        return len(self._keys())
+    
+    def __repr__(self):
+        return f"DoctorRecord({self.to_dict()!r})"
+
+
+class RosterIndex:
+    """
+    Inverted index over the doctors scraped for one hospital.
+    
+    Maps cleaned name tokens, single-letter initials and first letters to roster
+    positions so a CSV doctor is only fuzzy-matched against the few scraped doctors
+    that can possibly match. Lookups return the same doctor as a linear
+    _fuzzy_name_match scan over the roster (the first match in roster order).
+    """
+
+    def __init__(self, scraped_doctors: List[Dict]):
+        self.doctors = scraped_doctors
+        self.tokens: List[List[str]] = []
+        self.empty_names: List[int] = []
+        self.by_token: Dict[str, set] = {}
+        self.by_initial: Dict[str, set] = {}
+        self.by_first_letter: Dict[str, set] = {}
+        self._norms: Dict[int, tuple] = {}
         
-        # Create unique key for hospital
-        hospital_key = f"{hospital_name}||{address}"
+        for pos, doctor in enumerate(scraped_doctors):
+            name = doctor.get("full_name", "")
+            tokens = _clean_name_tokens(name) if name else []
+            self.tokens.append(tokens)
+            if not name:
+                self.empty_names.append(pos)
+            for tok in tokens:
+                self.by_token.setdefault(tok, set()).add(pos)
+                self.by_first_letter.setdefault(tok[0], set()).add(pos)
+                if len(tok) == 1:
+                    self.by_initial.setdefault(tok, set()).add(pos)
+
+    def _token_candidates(self, tok: str) -> set:
+        """Roster positions holding a token that can match `tok` exactly or as an initial."""
+        if len(tok) == 1:
+            return self.by_first_letter.get(tok, set())
+        return self.by_token.get(tok, set()) | self.by_initial.get(tok[0], set())
+
+    def match(self, name: str, tokens: List[str] = None) -> Union[int, None]:
+        """Roster position of the first scraped doctor whose name fuzzy-matches `name`, or None."""
+        if not name:
+            return self.empty_names[0] if self.empty_names else None
         
-        if hospital_key not in hospitals:
-            hospitals[hospital_key] = []
+        csv_tokens = _clean_name_tokens(name) if tokens is None else tokens
+        if not csv_tokens:
+            return None
         
-        # Convert row to dict
-        doctor_record = {
-            "hospital_name": hospital_name,
-            "address": address,
-            "doctor_name": str(row.get("doctor_name", "")).strip(),
-            "specialization": str(row.get("specialization", "") or row.get("specialty", "") or row.get("speciality", "")).strip(),
-            "qualification": str(row.get("qualification", "")).strip(),
-            "phone_number": str(row.get("phone_number", "") or row.get("phone", "")).strip(),
-            "license_number": str(row.get("license_number", "") or row.get("license", "")).strip()
-        }
+        per_token = [self._token_candidates(tok) for tok in csv_tokens]
+        candidates = set().union(*per_token)
         
-        hospitals[hospital_key].append(doctor_record)
+        for pos in sorted(candidates):
+            doc_tokens = self.tokens[pos]
+            # When the CSV name is the shorter side every CSV token must match,
+            # so the doctor has to appear in every token's candidate set
+            if len(csv_tokens) <= len(doc_tokens) and not all(pos in c for c in per_token):
+                continue
+            if _name_tokens_match(csv_tokens, doc_tokens):
+                return pos
+        return None
+
+    def find(self, name: str) -> Union[Dict, None]:
+        """Return the first scraped doctor whose name fuzzy-matches `name`, or None."""
+        pos = self.match(name)
+        return None if pos is None else self.doctors[pos]
+
+    def normalized(self, pos: int) -> tuple:
+        """(phone, specialization, qualification) of a scraped doctor, normalized once."""
+        if pos not in self._norms:
+            doctor = self.doctors[pos]
+            self._norms[pos] = (
+                _normalize_phone(doctor.get("phone_number", "")),
+                _normalize_text(doctor.get("specialization", "")),
+                _normalize_text(doctor.get("qualification", ""))
+            )
+        return self._norms[pos]
+
+
+# Output field -> input column aliases, tried in order (first non-empty value wins)
+COLUMN_ALIASES = {
+    "hospital_name": ["hospital_name"],
+    "address": ["address"],
+    "doctor_name": ["doctor_name"],
+    "specialization": ["specialization", "specialty", "speciality"],
+    "qualification": ["qualification"],
+    "phone_number": ["phone_number", "phone"],
+    "license_number": ["license_number", "license"],
+}
+
+
+def _resolve_column(df: pd.DataFrame, aliases: List[str]) -> pd.Series:
+    """
+    Column-wise equivalent of str(row.get(a1, "") or row.get(a2, "") ...).strip().
+    Missing columns count as "", and a falsy cell ("" or 0) falls through to the next alias.
+    """
+    resolved = None
+    for name in reversed(aliases):
+        if name not in df.columns:
+            continue
+        column = df[name].astype(object)
+        if resolved is None:
+            resolved = column
+        else:
+            resolved = column.where(~column.isin(["", 0]), resolved)
+    
+    if resolved is None:
+        return pd.Series("", index=df.index, dtype=object)
+    
+    # Missing cells render as "nan", exactly like str(NaN) did in the row-wise version
+    resolved = resolved.where(resolved.notna(), "nan").astype(str)
+    return resolved.str.strip()
+
+
+def group_doctors_by_hospital(df: pd.DataFrame) -> Dict[str, List[DoctorRecord]]:
+    """
+    Group doctors by hospital name and address combination.
+    
+    Aliases are resolved and stripped once per column and rows are grouped with
+    groupby, so this stays fast on very large provider directories. Spelling
+    variants of the same hospital (case, punctuation, plural/corporate suffixes,
+    same PIN code and locality) share one canonical key and are scraped once; every record
+    keeps its original hospital name and address for the output.
+    
+    Returns:
+        Dictionary with canonical "hospital_name||address" keys (see hospital_keys)
+        and values as list of DoctorRecord
+    """
+    if len(df) == 0:
+        return {}
+    
+    frame = pd.DataFrame({
+        field: _resolve_column(df, aliases) for field, aliases in COLUMN_ALIASES.items()
+    })
+    records = [DoctorRecord(*values) for values in zip(*(frame[f].tolist() for f in DoctorRecord.FIELDS))]
+    
+    # Canonicalise each distinct raw name/address pair once, then group rows by canonical key
+    raw_keys = frame["hospital_name"] + "||" + frame["address"]
+    canonical = {raw: canonical_hospital_key(*raw.split("||", 1)) for raw in pd.unique(raw_keys)}
+    hospital_keys = raw_keys.map(canonical)
+    positions = hospital_keys.groupby(hospital_keys, sort=False).indices
+    
+    hospitals = {}
+    for hospital_key in pd.unique(hospital_keys):
+        hospitals[hospital_key] = [records[i] for i in positions[hospital_key]]
+    
+    if len(hospitals) < len(canonical):
+        logging.info(f"Collapsed {len(canonical)} hospital name/address variants into {len(hospitals)} scrape targets")
     
     return hospitals
 
 
-def compare_doctor_data(csv_doctor: Dict, scraped_doctors: List[Dict]) -> Dict:
+def scrape_target(csv_doctors: List[DoctorRecord]) -> Tuple[str, str]:
+    """Hospital name and address to scrape for a group (the first-seen spelling)."""
+    first = DoctorRecord.coerce(csv_doctors[0])
+    return first.hospital_name, first.address
+
+
+def compare_doctor_data(csv_doctor: Dict, scraped_doctors: List[Dict], roster_index: RosterIndex = None) -> DoctorRecord:
     """
     Compare a single CSV doctor record against scraped doctors list.
     
+    Args:
+        csv_doctor: Doctor record from the input CSV (DoctorRecord or dict)
+        scraped_doctors: Doctors scraped from the hospital website
+        roster_index: Optional RosterIndex built once from scraped_doctors (avoids a full scan per doctor)
+    
     Returns:
-        Dictionary with status, reason, and updated data fields
+        DoctorRecord with status, reason, and updated data fields
     """
-    csv_name = csv_doctor.get("doctor_name", "")
-    csv_phone = _normalize_phone(csv_doctor.get("phone_number", ""))
-    csv_spec = _normalize_text(csv_doctor.get("specialization", ""))
-    csv_qual = _normalize_text(csv_doctor.get("qualification", ""))
+    record = DoctorRecord.coerce(csv_doctor)
+    csv_name = record.doctor_name
     
     # Try to find doctor in scraped list using fuzzy matching
-    found_doctor = None
-    for scraped in scraped_doctors:
-        scraped_name = scraped.get("full_name", "")
-        if _fuzzy_name_match(csv_name, scraped_name):
-            found_doctor = scraped
-            break
+    if roster_index is None:
+        roster_index = RosterIndex(scraped_doctors)
+    pos = roster_index.match(csv_name, record.name_tokens)
     
     # Rule 2: Doctor not found in scraped list
-    if not found_doctor:
-        return {
-            **csv_doctor,  # Keep all original data
-            "status": "human verification needed",
-            "reason": f"Doctor '{csv_name}' not found on hospital website"
-        }
+    if pos is None:
+        return record.with_result(
+            "human verification needed",
+            f"Doctor '{csv_name}' not found on hospital website"
+        )
     
     # Doctor found - compare details
-    scraped_phone = _normalize_phone(found_doctor.get("phone_number", ""))
-    scraped_spec = _normalize_text(found_doctor.get("specialization", ""))
-    scraped_qual = _normalize_text(found_doctor.get("qualification", ""))
+    found_doctor = roster_index.doctors[pos]
+    scraped_phone, scraped_spec, scraped_qual = roster_index.normalized(pos)
+    csv_phone, csv_spec, csv_qual = record.norm_phone, record.norm_spec, record.norm_qual
     
     phone_match = (csv_phone == scraped_phone) if (csv_phone and scraped_phone) else True
     spec_match = (csv_spec == scraped_spec) if (csv_spec and scraped_spec) else True
@@ -170,79 +449,151 @@ def compare_doctor_data(csv_doctor: Dict, scraped_doctors: List[Dict]) -> Dict:
     
     # Rule 4: All details match
     if phone_match and spec_match and qual_match:
-        return {
-            **csv_doctor,
-            "status": "verified",
-            "reason": "All details match website data"
-        }
+        return record.with_result("verified", "All details match website data")
     
     # Rule 3: Some details don't match - update with scraped data
     updates = []
-    result = csv_doctor.copy()
+    changes = {}
     
     if not phone_match and scraped_phone:
-        updates.append(f"phone [{csv_doctor.get('phone_number', 'N/A')} → {found_doctor.get('phone_number', 'N/A')}]")
-        result["phone_number"] = found_doctor.get("phone_number", csv_doctor.get("phone_number"))
+        updates.append(f"phone [{record.phone_number} → {found_doctor.get('phone_number', 'N/A')}]")
+        changes["phone_number"] = found_doctor.get("phone_number", record.phone_number)
     
     if not spec_match and scraped_spec:
-        updates.append(f"specialization [{csv_doctor.get('specialization', 'N/A')} → {found_doctor.get('specialization', 'N/A')}]")
-        result["specialization"] = found_doctor.get("specialization", csv_doctor.get("specialization"))
+        updates.append(f"specialization [{record.specialization} → {found_doctor.get('specialization', 'N/A')}]")
+        changes["specialization"] = found_doctor.get("specialization", record.specialization)
     
     if not qual_match and scraped_qual:
-        updates.append(f"qualification [{csv_doctor.get('qualification', 'N/A')} → {found_doctor.get('qualification', 'N/A')}]")
-        result["qualification"] = found_doctor.get("qualification", csv_doctor.get("qualification"))
+        updates.append(f"qualification [{record.qualification} → {found_doctor.get('qualification', 'N/A')}]")
+        changes["qualification"] = found_doctor.get("qualification", record.qualification)
     
     reason = "Updated: " + ", ".join(updates) if updates else "Data verified and updated"
     
-    return {
-        **result,
-        "status": "updated details",
-        "reason": reason
-    }
+    return record.with_result("updated details", reason, **changes)
+
+
+def scrape_hospital(hospital_name: str, address: str, location_data: Dict = None) -> Dict:
+    """Live scrape via scraping.main (imported on first use, so replay runs need no browser/LLM stack)."""
+    from scraping import main as live_scrape
+    return live_scrape(hospital_name, address, location_data=location_data)
+
+
+def locate_hospital(hospital_name: str, address: str) -> Dict:
+    """Live location check via scraping.verify_hospital_location (imported on first use)."""
+    from scraping import verify_hospital_location
+    return verify_hospital_location(f"{hospital_name}, {address}", address)
 
 
-def validate_hospital_doctors(hospital_name: str, address: str, csv_doctors: List[Dict], status_callback=None) -> List[Dict]:
+def unverified_hospital_results(csv_doctors: List[DoctorRecord], error_msg: str) -> List[DoctorRecord]:
+    """Rule 1: every doctor of a hospital whose address could not be verified needs human review."""
+    return [
+        DoctorRecord.coerce(doctor).with_result(
+            "human verification needed",
+            f"Hospital address not found via Mappls/Google API - {error_msg}"
+        )
+        for doctor in csv_doctors
+    ]
+
+
+_compare_pool = None
+_compare_pool_lock = threading.Lock()
+
+
+def _get_compare_pool(processes: int) -> ProcessPoolExecutor:
     """
-    Validate all doctors for a single hospital.
+    Return the process pool shared by all hospitals, creating it on first use.
+    
+    Workers are started through a forkserver (spawn where that is unavailable):
+    forking this process while browser, pipeline and HTTP threads hold locks
+    can deadlock the child.
+    """
+    global _compare_pool
+    with _compare_pool_lock:
+        if _compare_pool is None:
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            _compare_pool = ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context(method))
+            atexit.register(_compare_pool.shutdown, wait=False, cancel_futures=True)
+        return _compare_pool
+
+
+def _compare_shard(csv_doctors: List[DoctorRecord], scraped_doctors: List[Dict]) -> List[DoctorRecord]:
+    """Compare one shard of CSV doctors (runs inside a worker process)."""
+    roster_index = RosterIndex(scraped_doctors)
+    return [compare_doctor_data(d, scraped_doctors, roster_index=roster_index) for d in csv_doctors]
+
+
+def compare_doctors(csv_doctors: List[DoctorRecord], scraped_doctors: List[Dict], processes: int = None) -> List[DoctorRecord]:
+    """
+    Compare every CSV doctor of a hospital against its scraped roster.
+    
+    Large hospitals (at least COMPARE_PROCESS_MIN_PAIRS CSV x scraped pairs) are
+    split into shards of CSV doctors and compared in a shared process pool so the
+    CPU-bound matching does not block the thread driving the browser. Results
+    are returned in the same order as csv_doctors either way.
     
     Args:
-        hospital_name: Name of the hospital
-        address: Full address of the hospital
-        csv_doctors: List of doctor records from CSV for this hospital
-        status_callback: Optional callback(message) for status updates
+        csv_doctors: Doctor records from the input CSV for one hospital
+        scraped_doctors: Doctors scraped from the hospital website
+        processes: Worker processes to use (defaults to COMPARE_PROCESSES; 0 disables the pool)
         
     Returns:
-        List of validation results with status and reason
+        List of DoctorRecord results, one per CSV doctor
     """
-    print(f"\n{'='*80}")
-    print(f"Processing Hospital: {hospital_name}")
-    print(f"Address: {address}")
-    print(f"CSV Doctors Count: {len(csv_doctors)}")
-    print(f"{'='*80}")
+    processes = COMPARE_PROCESSES if processes is None else processes
+    pairs = len(csv_doctors) * len(scraped_doctors)
+    if processes <= 0 or len(csv_doctors) < 2 or pairs < COMPARE_PROCESS_MIN_PAIRS:
+        return _compare_shard(csv_doctors, scraped_doctors)
     
-    if status_callback:
-        status_callback(f"Finding address for {hospital_name}...")
+    # Two shards per process balances load without rebuilding the roster index too often
+    shard_size = -(-len(csv_doctors) // (processes * 2))
+    shards = [csv_doctors[i:i + shard_size] for i in range(0, len(csv_doctors), shard_size)]
+    logging.info(f"Comparing {len(csv_doctors)} doctors in {len(shards)} shards across {processes} processes")
+    
+    pool = _get_compare_pool(processes)
+    results = []
+    for shard_results in pool.map(_compare_shard, shards, [scraped_doctors] * len(shards)):
+        results.extend(shard_results)
+    return results
+
+
+def fetch_scrape_result(hospital_name: str, address: str, force_refresh: bool = False, scraper=None,
+                        location_data: Dict = None) -> Dict:
+    """
+    Scrape result for a hospital: a recent cached scrape, or a fresh one from the scraper.
     
-    # Call scraping agent
+    Scraper errors are returned as an unverified result instead of raised.
+    """
+    # Reuse a recent scrape of the same hospital if we have one
+    scrape_cache = get_scrape_cache() if scraper is None else None
+    scrape_result = None if force_refresh or scrape_cache is None else scrape_cache.get(hospital_name, address)
+    if scrape_result:
+        print(f"✓ Using cached scrape result for {hospital_name}")
+        return scrape_result
+    
+    # Call scraping agent (or the replay/record scraper)
     try:
-        scrape_result = scrape_hospital(hospital_name, address)
+        extra = {"location_data": location_data} if location_data is not None else {}
+        scrape_result = (scraper or scrape_hospital)(hospital_name, address, **extra)
+        if scrape_cache:
+            scrape_cache.put(hospital_name, address, scrape_result)
     except Exception as e:
         logging.error(f"Error scraping hospital {hospital_name}: {e}")
         scrape_result = {"verified": False, "error": str(e)}
+    return scrape_result
+
+
+def results_from_scrape(hospital_name: str, csv_doctors: List[DoctorRecord], scrape_result: Dict, status_callback=None) -> List[DoctorRecord]:
+    """
+    Apply the validation rules to a hospital's CSV doctors given its scrape result.
     
+    Returns:
+        List of validation results (DoctorRecord) with status and reason
+    """
     # Rule 1: Hospital address not verified
     if not scrape_result.get("verified", False):
         error_msg = scrape_result.get("error", "Address verification failed")
         print(f"⚠️  Hospital not verified: {error_msg}")
-        
-        results = []
-        for doctor in csv_doctors:
-            results.append({
-                **doctor,
-                "status": "human verification needed",
-                "reason": f"Hospital address not found via Mappls/Google API - {error_msg}"
-            })
-        return results
+        return unverified_hospital_results(csv_doctors, error_msg)
     
     # Hospital verified - compare doctors
     scraped_doctors = scrape_result.get("doctors", [])
@@ -251,11 +602,15 @@ def validate_hospital_doctors(hospital_name: str, address: str, csv_doctors: Lis
     if status_callback:
         status_callback(f"Verifying {len(csv_doctors)} doctors against {len(scraped_doctors)} found records...")
     
-    results = []
-    for csv_doctor in csv_doctors:
-        result = compare_doctor_data(csv_doctor, scraped_doctors)
-        results.append(result)
-        
+    results = compare_doctors(csv_doctors, scraped_doctors)
+    
+    # The scrape was cut short by the hospital budget: flag every row so a reviewer knows
+    if scrape_result.get("partial"):
+        note = f"partial scrape - {scrape_result.get('budget_reason') or 'budget exhausted'}"
+        print(f"⏱️  Results are partial ({note})")
+        results = [r.with_result(r.status, f"{r.reason} ({note})") for r in results]
+    
+    for result in results:
         # Log result
         status = result.get("status", "unknown")
         doctor_name = result.get("doctor_name", "Unknown")
@@ -269,6 +624,42 @@ def validate_hospital_doctors(hospital_name: str, address: str, csv_doctors: Lis
     return results
 
 
+def _print_hospital_header(hospital_name: str, address: str, csv_doctors: List[DoctorRecord]):
+    print(f"\n{'='*80}")
+    print(f"Processing Hospital: {hospital_name}")
+    print(f"Address: {address}")
+    print(f"CSV Doctors Count: {len(csv_doctors)}")
+    print(f"{'='*80}")
+
+
+def validate_hospital_doctors(hospital_name: str, address: str, csv_doctors: List[DoctorRecord], status_callback=None, force_refresh: bool = False, scraper=None,
+                              location_data: Dict = None) -> List[DoctorRecord]:
+    """
+    Validate all doctors for a single hospital.
+    
+    Args:
+        hospital_name: Name of the hospital
+        address: Full address of the hospital
+        csv_doctors: List of doctor records from CSV for this hospital
+        status_callback: Optional callback(message) for status updates
+        force_refresh: Ignore the scrape cache and scrape the website again
+        scraper: Optional callable(hospital_name, address) used instead of the live scraper
+                 (e.g. a ReplayScraper); the scrape cache is bypassed when given
+        location_data: Location verified by the geocoding pre-pass, passed on to the scraper
+        
+    Returns:
+        List of validation results (DoctorRecord) with status and reason
+    """
+    _print_hospital_header(hospital_name, address, csv_doctors)
+    
+    if status_callback:
+        status_callback(f"Finding address for {hospital_name}...")
+    
+    scrape_result = fetch_scrape_result(hospital_name, address, force_refresh=force_refresh, scraper=scraper,
+                                        location_data=location_data)
+    return results_from_scrape(hospital_name, csv_doctors, scrape_result, status_callback=status_callback)
+
+
 def write_validation_results(results: List[Dict], output_file: str):
     """
     Write validation results to CSV file.
@@ -282,17 +673,7 @@ def write_validation_results(results: List[Dict], output_file: str):
         return
     
     # Define output columns
-    columns = [
-        "hospital_name",
-        "address", 
-        "doctor_name",
-        "specialization",
-        "qualification",
-        "phone_number",
-        "license_number",
-        "status",
-        "reason"
-    ]
+    columns = OUTPUT_COLUMNS
     
     # Create DataFrame
     df = pd.DataFrame(results)
@@ -317,11 +698,89 @@ def write_validation_results(results: List[Dict], output_file: str):
         print(f"  {status}: {count}")
 
 
+class HospitalJob:
+    """One hospital moving through the validation pipeline."""
+    
+    __slots__ = ("idx", "key", "csv_doctors", "hospital_name", "address", "location_data",
+                 "scrape_result", "results", "status", "elapsed")
+    
+    def __init__(self, key: str, csv_doctors: List[DoctorRecord], location_data: Dict = None):
+        self.idx = 0
+        self.key = key
+        self.csv_doctors = csv_doctors
+        self.hospital_name, self.address = scrape_target(csv_doctors)
+        self.location_data = location_data
+        self.scrape_result = None
+        self.results = None
+        self.status = None
+        # Seconds spent scraping and comparing (what the historical schedule learns from)
+        self.elapsed = 0.0
+
+
+def _tally_results(stats: Dict, results: List[Dict]):
+    """Add one hospital's results to the running statistics."""
+    stats["total_processed"] += len(results)
+    stats["verified"] += sum(1 for r in results if r.get("status") == "verified")
+    stats["updated"] += sum(1 for r in results if r.get("status") == "updated details")
+    stats["needs_review"] += sum(1 for r in results if r.get("status") == "human verification needed")
+
+
+def _should_stream(input_csv: str) -> bool:
+    """Stream inputs larger than VALIDATION_STREAMING_THRESHOLD_MB."""
+    try:
+        return os.path.getsize(input_csv) > STREAMING_THRESHOLD_BYTES
+    except OSError:
+        return False
+
+
+def spool_hospitals_from_csv(input_csv: str, chunksize: int = None, spool_dir: str = None) -> HospitalSpool:
+    """
+    Read a CSV in chunks and spill the rows, grouped by hospital key, to an on-disk HospitalSpool.
+    
+    Cells are read as strings so every chunk is parsed the same way (no per-chunk dtype drift
+    turning phone numbers into floats). The caller owns the spool and must close() it.
+    """
+    spool = HospitalSpool.for_file(input_csv, spool_dir=spool_dir,
+                                   encode=DoctorRecord.to_row, decode=DoctorRecord.from_row)
+    try:
+        reader = pd.read_csv(input_csv, on_bad_lines='skip', dtype=str, chunksize=chunksize or DEFAULT_CHUNKSIZE)
+        for chunk in reader:
+            spool.add(group_doctors_by_hospital(chunk))
+    except Exception:
+        spool.close()
+        raise
+    return spool
+
+
+def count_hospitals(input_csv: str, chunksize: int = None) -> int:
+    """Count unique hospital keys in a CSV without loading it all into memory."""
+    keys = set()
+    reader = pd.read_csv(input_csv, on_bad_lines='skip', dtype=str, chunksize=chunksize or DEFAULT_CHUNKSIZE)
+    for chunk in reader:
+        keys.update(group_doctors_by_hospital(chunk).keys())
+    return len(keys)
+
+
 def validate_and_write_incremental(
     input_csv: str,
     output_csv: str,
     progress_callback=None,
-    db_callback=None
+    db_callback=None,
+    max_workers: int = None,
+    streaming: bool = None,
+    chunksize: int = None,
+    resume: bool = False,
+    checkpoint_path: str = None,
+    force_refresh: bool = False,
+    flush_every: int = None,
+    parquet_dir: str = None,
+    session_id: str = None,
+    schedule: str = None,
+    replay_dir: str = None,
+    record_dir: str = None,
+    geocode_prepass: bool = None,
+    stage_workers: Dict[str, int] = None,
+    stage_queues: Dict[str, int] = None
 ):
     """
     Validate hospitals incrementally with immediate writes.
@@ -331,39 +790,82 @@ def validate_and_write_incremental(
         output_csv: Path to output CSV file
         progress_callback: Optional callback(hospital_idx, total, hospital_name, status, results)
         db_callback: Optional callback(results) to update database
+        max_workers: Number of hospitals scraped concurrently (defaults to VALIDATION_MAX_WORKERS)
+        streaming: Read the input in chunks through an on-disk spool (None = auto, based on file size)
+        chunksize: Rows per chunk in streaming mode (defaults to VALIDATION_CHUNKSIZE)
+        resume: Continue an interrupted run from its checkpoint journal instead of starting over
+        checkpoint_path: Journal of completed hospitals (defaults to "<output_csv>.journal.jsonl")
+        force_refresh: Ignore cached scrape results and scrape every hospital again
+        flush_every: Flush the output CSV after this many hospitals (defaults to VALIDATION_FLUSH_EVERY)
+        parquet_dir: Also write results as Parquet under <parquet_dir>/session=<session_id>/
+                     (defaults to VALIDATION_PARQUET_DIR; needs pyarrow)
+        session_id: Parquet partition name (defaults to the output file name)
+        schedule: Hospital processing order, one of SCHEDULE_POLICIES (defaults to VALIDATION_SCHEDULE).
+                  In streaming mode hospitals are ordered within each spool bucket.
+        replay_dir: Use recorded scraping.main results from this directory instead of scraping live
+                    (defaults to VALIDATION_REPLAY_DIR; see scrape_replay)
+        record_dir: Save every live scrape result here for later replay (defaults to VALIDATION_RECORD_DIR)
+        geocode_prepass: Verify hospital locations concurrently before scraping (defaults to
+                         VALIDATION_GEOCODE_PREPASS). Hospitals that fail verification are resolved
+                         right away; in streaming mode the pre-pass runs once per spool bucket.
+        stage_workers: Threads per pipeline stage ("locate", "scrape", "compare"), overriding
+                       VALIDATION_LOCATE_WORKERS, max_workers and VALIDATION_COMPARE_WORKERS
+        stage_queues: Queue size in front of each stage ("locate", "scrape", "compare", "persist"),
+                      overriding VALIDATION_<STAGE>_QUEUE
         
     Returns:
         Dictionary with summary statistics
+    
+    Hospitals flow through a pipeline of stages joined by bounded queues -
+    locate -> scrape -> compare -> persist - so the location check of later
+    hospitals and the writes of earlier ones overlap with the current scrape.
+    Hospitals whose address cannot be verified skip straight to persist.
     """
     print("="*80)
     print(" DOCTOR VALIDATION AGENT (INCREMENTAL MODE)")
     print("="*80)
     
+    scheduler = HospitalScheduler(schedule)
+    scraper = get_scraper(scrape_hospital, replay_dir=replay_dir, record_dir=record_dir)
+    replaying = isinstance(scraper, ReplayScraper)
+    geocode_prepass = GEOCODE_PREPASS if geocode_prepass is None else geocode_prepass
+    # Replayed scrapes never geocode, so there is nothing to verify up front
+    geocode_prepass = geocode_prepass and not replaying
+    # Locations are checked ahead of the scrape unless scrapes are replayed
+    live_geocoding = not replaying
+    scrape_cache = get_scrape_cache()
+    
+    if streaming is None:
+        streaming = _should_stream(input_csv)
+    
     # Load CSV
     try:
-        df = pd.read_csv(input_csv, on_bad_lines='skip')
-        print(f"\n✓ Loaded {len(df)} records from {input_csv}")
+        if streaming:
+            # Group by hospital on disk, chunk by chunk
+            hospitals = spool_hospitals_from_csv(input_csv, chunksize=chunksize)
+            print(f"\n✓ Spooled {hospitals.record_count} records from {input_csv} into {hospitals.num_buckets} buckets")
+        else:
+            df = pd.read_csv(input_csv, on_bad_lines='skip')
+            print(f"\n✓ Loaded {len(df)} records from {input_csv}")
+            # Group by hospital
+            hospitals = group_doctors_by_hospital(df)
+            del df
     except Exception as e:
         logging.error(f"Error loading CSV: {e}")
         return {"error": str(e)}
     
-    # Group by hospital
-    hospitals = group_doctors_by_hospital(df)
     total_hospitals = len(hospitals)
     print(f"✓ Grouped into {total_hospitals} unique hospitals")
     
-    # Initialize output file with headers
-    output_path = Path(output_csv)
-    if output_path.exists():
-        output_path.unlink()  # Remove old file
-    
-    columns = [
-        "hospital_name", "address", "doctor_name", "specialization",
-        "qualification", "phone_number", "license_number", "status", "reason"
-    ]
-    
-    # Create empty CSV with headers
-    pd.DataFrame(columns=columns).to_csv(output_csv, index=False, encoding='utf-8')
+    max_workers = max(1, max_workers or DEFAULT_MAX_WORKERS)
+    if max_workers > 1:
+        print(f"✓ Scraping up to {max_workers} hospitals concurrently")
+    if scraper is not None:
+        print(f"✓ {type(scraper).__name__} using fixtures in {scraper.fixtures.dir}")
+    if scheduler.policy != "insertion":
+        print(f"✓ Scheduling hospitals {scheduler.policy.replace('_', ' ')}")
+    if geocode_prepass:
+        print(f"✓ Verifying hospital locations in a concurrent pre-pass")
     
     # Track statistics
     all_stats = {
@@ -374,115 +876,219 @@ def validate_and_write_incremental(
         "hospitals_completed": 0
     }
     
-    # Validate each hospital incrementally
-    for idx, (hospital_key, csv_doctors) in enumerate(hospitals.items(), 1):
-        hospital_name, address = hospital_key.split("||")
-        
-        print(f"\n[{idx}/{total_hospitals}] Processing: {hospital_name}")
-        
+    # Open the checkpoint journal; on resume it decides which hospitals are already done
+    journal = CheckpointJournal(checkpoint_path or CheckpointJournal.default_path(output_csv))
+    # Run settings are kept with the session so a resume continues the same way
+    session_meta = {"input_csv": str(input_csv), "output_csv": str(output_csv),
+                    "settings": {"streaming": streaming, "force_refresh": force_refresh, "schedule": schedule,
+                                 "geocode_prepass": geocode_prepass}}
+    completed = journal.load() if resume else set()
+    if completed and journal.meta.get("input_csv") not in (None, str(input_csv)):
+        logging.warning(f"Checkpoint {journal.path} belongs to {journal.meta['input_csv']}, starting over")
+        completed = set()
+    resuming = bool(completed)
+    journal.start(session_meta, resume=resuming)
+    
+    # Initialize output file with headers (rebuilt from the journal when resuming,
+    # which also drops rows of a hospital that was cut off mid-write).
+    # The sink keeps the file open for the whole run.
+    sink = CSVResultSink(output_csv, OUTPUT_COLUMNS, flush_every=flush_every)
+    parquet_dir = parquet_dir or DEFAULT_PARQUET_DIR
+    if parquet_dir:
         try:
-            # Pass a status callback that updates the progress
-            def status_cb(msg):
-                if progress_callback:
-                     progress_callback(
-                        hospital_idx=idx,
-                        total_hospitals=total_hospitals,
-                        hospital_name=hospital_name,
-                        status="in_progress",
-                        results=[],
-                        stats=all_stats.copy(),
-                        status_message=msg
-                    )
-
-            # Scrape and validate
-            results = validate_hospital_doctors(hospital_name, address, csv_doctors, status_callback=status_cb)
-            
+            session_id = session_id or Path(output_csv).stem
+            sink = MultiSink([sink, ParquetResultSink(parquet_dir, session_id, OUTPUT_COLUMNS)])
+            print(f"✓ Writing Parquet results to {parquet_dir} (session={session_id})")
+        except ImportError as e:
+            logging.warning(f"Parquet output disabled: {e}")
+    
+    if resuming:
+        for results in journal.iter_results():
+            sink.write_rows(results)
+            _tally_results(all_stats, results)
+        sink.flush(force_sync=True)
+        all_stats["hospitals_completed"] = len(completed)
+        print(f"✓ Resuming: {len(completed)}/{total_hospitals} hospitals already completed")
+    
+    # Serializes stats updates, CSV appends and callbacks across stages
+    record_lock = threading.RLock()
+    
+    def status_callback_for(hospital_name):
+        def status_cb(msg):
+            if progress_callback:
+                with record_lock:
+                    try:
+                        progress_callback(
+                            hospital_idx=min(all_stats["hospitals_completed"] + 1, total_hospitals),
+                            total_hospitals=total_hospitals,
+                            hospital_name=hospital_name,
+                            status="in_progress",
+                            results=[],
+                            stats=all_stats.copy(),
+                            status_message=msg
+                        )
+                    except Exception as e:
+                        logging.error(f"Progress callback error: {e}")
+        return status_cb
+    
+    def resolve_unverified(job, location_data):
+        """Finish a hospital whose address could not be verified without scraping it."""
+        print(f"\n[{job.idx}/{total_hospitals}] ⚠️  {job.hospital_name}: address not verified, skipping scrape")
+        job.results = unverified_hospital_results(
+            job.csv_doctors, location_data.get("error", "Hospital address not found via Mappls/Google Maps API"))
+        job.status = "completed"
+        return job
+    
+    def record_hospital(hospital_key, hospital_name, status, results):
+        with record_lock:
             # Update statistics
-            all_stats["total_processed"] += len(results)
-            all_stats["verified"] += sum(1 for r in results if r.get("status") == "verified")
-            all_stats["updated"] += sum(1 for r in results if r.get("status") == "updated details")
-            all_stats["needs_review"] += sum(1 for r in results if r.get("status") == "human verification needed")
-            all_stats["hospitals_completed"] = idx
+            _tally_results(all_stats, results)
+            all_stats["hospitals_completed"] += 1
             
             # Immediately append to CSV
-            df_results = pd.DataFrame(results)
-            for col in columns:
-                if col not in df_results.columns:
-                    df_results[col] = ""
-            df_results = df_results[columns]
-            
-            # Append to existing CSV
-            df_results.to_csv(output_csv, mode='a', header=False, index=False, encoding='utf-8')
-            
-            print(f"  ✓ Written {len(results)} results to CSV")
+            try:
+                sink.write_rows(results)
+                print(f"  ✓ Written {len(results)} results to CSV")
+            except Exception as e:
+                logging.error(f"Error writing results for {hospital_name}: {e}")
             
             # Call database callback if provided
             if db_callback:
                 try:
                     db_callback(results)
-                    print(f"  ✓ Updated database")
+                    if status == "completed":
+                        print(f"  ✓ Updated database")
                 except Exception as e:
                     logging.error(f"Database callback error: {e}")
             
-            # Call progress callback if provided
+            # Mark the hospital as done only once its results are written everywhere
+            try:
+                journal.record(hospital_key, status, results)
+            except Exception as e:
+                logging.error(f"Checkpoint write error: {e}")
+            
+            # Call progress callback if provided (even on error)
             if progress_callback:
                 try:
+                    extra = {"status_message": f"Completed validation for {hospital_name}"} if status == "completed" else {}
                     progress_callback(
-                        hospital_idx=idx,
+                        hospital_idx=all_stats["hospitals_completed"],
                         total_hospitals=total_hospitals,
                         hospital_name=hospital_name,
-                        status="completed",
+                        status=status,
                         results=results,
                         stats=all_stats.copy(),
-                        status_message=f"Completed validation for {hospital_name}"
-                    )
-                except Exception as e:
-                    logging.error(f"Progress callback error: {e}")
-                    
-        except Exception as e:
-            logging.error(f"Error validating hospital {hospital_name}: {e}")
-            
-            # Add error records
-            error_results = []
-            for doctor in csv_doctors:
-                error_results.append({
-                    **doctor,
-                    "status": "human verification needed",
-                    "reason": f"Validation error: {str(e)}"
-                })
-            
-            # Write error records
-            df_error = pd.DataFrame(error_results)
-            for col in columns:
-                if col not in df_error.columns:
-                    df_error[col] = ""
-            df_error = df_error[columns]
-            df_error.to_csv(output_csv, mode='a', header=False, index=False, encoding='utf-8')
-            
-            all_stats["total_processed"] += len(error_results)
-            all_stats["needs_review"] += len(error_results)
-            all_stats["hospitals_completed"] = idx
-            
-            # Call callbacks even on error
-            if db_callback:
-                try:
-                    db_callback(error_results)
-                except Exception as e:
-                    logging.error(f"Database callback error: {e}")
-            
-            if progress_callback:
-                try:
-                    progress_callback(
-                        hospital_idx=idx,
-                        total_hospitals=total_hospitals,
-                        hospital_name=hospital_name,
-                        status="error",
-                        results=error_results,
-                        stats=all_stats.copy()
+                        **extra
                     )
                 except Exception as e:
                     logging.error(f"Progress callback error: {e}")
     
+    def prepass_locations(pending):
+        """Geocode pending hospitals that have no usable cached scrape."""
+        targets = {}
+        for hospital_key, csv_doctors in pending:
+            hospital_name, address = scrape_target(csv_doctors)
+            if force_refresh or scraper is not None or not scrape_cache.get(hospital_name, address):
+                targets[hospital_key] = (hospital_name, address)
+        return run_geocode_prepass(targets)
+    
+    # Hospitals still to validate in scheduling order (finished ones are skipped on resume).
+    # A spool is ordered one bucket at a time so only one bucket is held in memory.
+    def remaining_hospitals():
+        idx = len(completed)
+        for batch in (hospitals.iter_buckets() if streaming else [hospitals]):
+            pending = [(key, docs) for key, docs in batch.items() if key not in completed]
+            locations = prepass_locations(pending) if geocode_prepass and pending else {}
+            jobs = [HospitalJob(hospital_key, csv_doctors, location_data=locations.get(hospital_key))
+                    for hospital_key, csv_doctors in scheduler.order(pending)]
+            # Hospitals the pre-pass could not find go first: they are resolved without a scrape
+            jobs.sort(key=lambda job: job.location_data is None or bool(job.location_data.get("verified")))
+            for job in jobs:
+                idx += 1
+                job.idx = idx
+                if job.location_data is not None and not job.location_data.get("verified"):
+                    yield resolve_unverified(job, job.location_data)
+                else:
+                    yield job
+    
+    # Stage 1: verify the location (unless the pre-pass did, or a cached scrape will be used)
+    def locate_stage(job):
+        print(f"\n[{job.idx}/{total_hospitals}] Processing: {job.hospital_name}")
+        if not live_geocoding or job.location_data is not None:
+            return job
+        if not force_refresh and scraper is None:
+            job.scrape_result = scrape_cache.get(job.hospital_name, job.address)
+            if job.scrape_result:
+                return job
+        status_callback_for(job.hospital_name)(f"Finding address for {job.hospital_name}...")
+        location_data = locate_hospital(job.hospital_name, job.address)
+        if not location_data.get("verified"):
+            return resolve_unverified(job, location_data)
+        job.location_data = location_data
+        return job
+    
+    # Stage 2: scrape the hospital website (the slow, browser-bound stage)
+    def scrape_stage(job):
+        _print_hospital_header(job.hospital_name, job.address, job.csv_doctors)
+        if job.scrape_result is None:
+            started = time.monotonic()
+            job.scrape_result = fetch_scrape_result(job.hospital_name, job.address, force_refresh=force_refresh,
+                                                    scraper=scraper, location_data=job.location_data)
+            job.elapsed += time.monotonic() - started
+        else:
+            print(f"✓ Using cached scrape result for {job.hospital_name}")
+        return job
+    
+    # Stage 3: compare the CSV doctors against the scraped roster (CPU-bound)
+    def compare_stage(job):
+        started = time.monotonic()
+        job.results = results_from_scrape(job.hospital_name, job.csv_doctors, job.scrape_result,
+                                          status_callback=status_callback_for(job.hospital_name))
+        job.status = "completed"
+        job.elapsed += time.monotonic() - started
+        # Replayed scrapes take no time and would skew the historical order of live runs
+        if not replaying:
+            scheduler.record(job.key, job.elapsed)
+        return job
+    
+    # Stage 4: write results to the sinks, database, journal and progress (one thread, in completion order)
+    def persist_stage(job):
+        record_hospital(job.key, job.hospital_name, job.status, job.results)
+    
+    def stage_failed(job, stage_name, e):
+        logging.error(f"Error validating hospital {job.hospital_name}: {e}")
+        job.results = [DoctorRecord.coerce(doctor).with_result("human verification needed", f"Validation error: {str(e)}")
+                       for doctor in job.csv_doctors]
+        job.status = "error"
+        return job
+    
+    workers = {"locate": LOCATE_WORKERS or max_workers, "scrape": max_workers, "compare": COMPARE_WORKERS, "persist": 1}
+    workers.update({name: n for name, n in (stage_workers or {}).items() if name != "persist"})
+    queues = dict(STAGE_QUEUE_SIZES, **(stage_queues or {}))
+    pipeline = Pipeline(
+        [Stage(name, fn, workers=workers[name], queue_size=queues.get(name))
+         for name, fn in (("locate", locate_stage), ("scrape", scrape_stage),
+                          ("compare", compare_stage), ("persist", persist_stage))],
+        on_error=stage_failed,
+        is_done=lambda job: job.results is not None
+    )
+    
+    # Start the compare pool before the pipeline threads exist
+    if COMPARE_PROCESSES > 0:
+        _get_compare_pool(COMPARE_PROCESSES)
+    
+    # Validate each hospital incrementally
+    finished = False
+    try:
+        pipeline.run(remaining_hospitals())
+        finished = True
+    finally:
+        sink.close()
+        # The journal is only needed to recover an interrupted run
+        journal.close(remove=finished)
+        if streaming:
+            hospitals.close()
+    
     print(f"\n{'='*80}")
     print(" INCREMENTAL VALIDATION COMPLETE")
     print(f"{'='*80}")
@@ -495,14 +1101,36 @@ def validate_and_write_incremental(
     return all_stats
 
 
-def main(input_csv: str = "testing_data.csv", output_csv: str = "out.csv"):
+def main(input_csv: str = "testing_data.csv", output_csv: str = "out.csv", streaming: bool = None, max_workers: int = None, resume: bool = False, force_refresh: bool = False, schedule: str = None,
+         replay_dir: str = None, record_dir: str = None, geocode_prepass: bool = None):
     """
     Main validation workflow (batch mode - processes all at once).
     
     Args:
         input_csv: Path to input CSV file
         output_csv: Path to output CSV file
+        streaming: Stream the input through an on-disk spool and write results per hospital
+                   instead of holding everything in memory (None = auto, based on file size)
+        max_workers: Validate this many hospitals concurrently (uses the incremental writer)
+        resume: Continue an interrupted run from its checkpoint journal (uses the incremental writer)
+        force_refresh: Ignore cached scrape results
+        schedule: Hospital processing order (uses the incremental writer)
+        replay_dir: Replay recorded scrape results from this directory instead of scraping live
+        record_dir: Record live scrape results into this directory
+        geocode_prepass: Verify hospital locations concurrently before scraping (uses the incremental writer)
     """
+    if geocode_prepass is None:
+        geocode_prepass = GEOCODE_PREPASS
+    if streaming is None:
+        streaming = _should_stream(input_csv)
+    if streaming or resume or schedule or geocode_prepass or (max_workers or 1) > 1:
+        return validate_and_write_incremental(input_csv, output_csv, max_workers=max_workers, streaming=streaming,
+                                              resume=resume, force_refresh=force_refresh, schedule=schedule,
+                                              replay_dir=replay_dir, record_dir=record_dir,
+                                              geocode_prepass=geocode_prepass)
+    
+    scraper = get_scraper(scrape_hospital, replay_dir=replay_dir, record_dir=record_dir)
+    
     print("="*80)
     print(" DOCTOR VALIDATION AGENT")
     print("="*80)
@@ -522,22 +1150,21 @@ def main(input_csv: str = "testing_data.csv", output_csv: str = "out.csv"):
     # Validate each hospital
     all_results = []
     for idx, (hospital_key, csv_doctors) in enumerate(hospitals.items(), 1):
-        hospital_name, address = hospital_key.split("||")
+        hospital_name, address = scrape_target(csv_doctors)
         
         print(f"\n[{idx}/{len(hospitals)}] Processing: {hospital_name}")
         
         try:
-            results = validate_hospital_doctors(hospital_name, address, csv_doctors)
+            results = validate_hospital_doctors(hospital_name, address, csv_doctors, force_refresh=force_refresh, scraper=scraper)
             all_results.extend(results)
         except Exception as e:
             logging.error(f"Error validating hospital {hospital_name}: {e}")
             # Add error records
             for doctor in csv_doctors:
-                all_results.append({
-                    **doctor,
-                    "status": "human verification needed",
-                    "reason": f"Validation error: {str(e)}"
-                })
+                all_results.append(DoctorRecord.coerce(doctor).with_result(
+                    "human verification needed",
+                    f"Validation error: {str(e)}"
+                ))
     
     # Write results
     write_validation_results(all_results, output_csv)
@@ -548,4 +1175,31 @@ def main(input_csv: str = "testing_data.csv", output_csv: str = "out.csv"):
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Validate doctor records against hospital websites")
+    parser.add_argument("input_csv", nargs="?", default="testing_data.csv", help="Input CSV file")
+    parser.add_argument("output_csv", nargs="?", default="out.csv", help="Output CSV file")
+    parser.add_argument("--stream", action=argparse.BooleanOptionalAction, default=None,
+                        help="Read the input in chunks (default: auto, for inputs over VALIDATION_STREAMING_THRESHOLD_MB)")
+    parser.add_argument("--workers", type=int, default=None, help="Hospitals scraped concurrently")
+    parser.add_argument("--resume", action="store_true", help="Skip hospitals finished by an interrupted run")
+    parser.add_argument("--refresh", action="store_true", help="Ignore cached scrape results")
+    parser.add_argument("--schedule", choices=SCHEDULE_POLICIES, default=None,
+                        help="Hospital processing order in incremental mode")
+    parser.add_argument("--replay", metavar="DIR", default=None,
+                        help="Replay recorded scrape results from DIR instead of scraping live")
+    parser.add_argument("--record", metavar="DIR", default=None,
+                        help="Record live scrape results into DIR for later replay")
+    parser.add_argument("--geocode-prepass", action="store_true", default=None,
+                        help="Verify all hospital locations concurrently before scraping")
+    parser.add_argument("--compare-processes", type=int, default=None,
+                        help="Worker processes for comparing very large rosters (0 = off)")
+    args = parser.parse_args()
+    
+    if args.compare_processes is not None:
+        COMPARE_PROCESSES = args.compare_processes
+    
+    main(args.input_csv, args.output_csv, streaming=args.stream, max_workers=args.workers, resume=args.resume,
+         force_refresh=args.refresh, schedule=args.schedule, replay_dir=args.replay, record_dir=args.record,
+         geocode_prepass=args.geocode_prepass)
\ No newline at end of file